@@ -4,21 +4,90 @@ Template adapter for skill trigger evaluation.
 
 Reads exported cases JSONL from `trigger_examples_tool.py export`
 and writes predictions JSONL consumable by `trigger_examples_tool.py score`.
+Each row carries `latency_ms`, the time spent predicting that case.
 
 Usage:
   python3 scripts/predictor_adapter_template.py \
     --input /tmp/cases.jsonl \
     --output /tmp/predictions.jsonl
 
+In-process use (no export / predictions files):
+  python3 scripts/trigger_examples_tool.py score \
+    --predictor predictor_adapter_template:predict_batch
+
+Concurrent batches (order of the output still matches the input):
+  python3 scripts/predictor_adapter_template.py \
+    --input /tmp/cases.jsonl --output /tmp/predictions.jsonl \
+    --workers 8 --batch-size 32 --executor thread --batch-stats
+
+Persistent prediction cache (only new or edited prompts reach the engine;
+cached rows carry no latency_ms):
+  python3 scripts/predictor_adapter_template.py \
+    --input /tmp/cases.jsonl --output /tmp/predictions.jsonl \
+    --cache .cache/predictions.sqlite
+
+Long-lived worker (loads the engine once; see predictor_worker.py for the
+protocol). Over stdin/stdout, spawned by the scorer for one run or watch session:
+  python3 scripts/trigger_examples_tool.py score \
+    --predictor-worker 'python3 scripts/predictor_adapter_template.py --serve --mode keywords'
+
+Over a Unix socket, reused by every run until stopped:
+  python3 scripts/predictor_adapter_template.py --serve --socket /tmp/predictor.sock --mode keywords &
+  python3 scripts/trigger_examples_tool.py score --predictor-socket /tmp/predictor.sock
+
 Integration point:
-  Replace `predict_case()` with a call into your real trigger engine.
+  Replace `predict_case()` with a call into your real trigger engine, or
+  override `predict_batch()` when the engine accepts batched requests. Make
+  `predictor_version()` cover whatever the engine loads besides this file
+  (model weights, rule tables), so cached predictions are invalidated with it.
 """
 
 from __future__ import annotations
 
 import argparse
+import gzip
 import json
+import lzma
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+from predictor_worker import serve_socket, serve_stdio
+from trigger_prediction_cache import DEFAULT_MAX_ENTRIES, MISS, PredictionCache, files_version
+
+
+def open_text(path: Path, mode: str = "r") -> IO[str]:
+    # Same suffix rules as trigger_examples_tool.open_text, without importing the scorer.
+    suffix = path.suffix.lower()
+    if suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=1)
+    if suffix == ".xz":
+        return lzma.open(path, mode + "t", encoding="utf-8", preset=1 if "w" in mode else None)
+    return path.open(mode, encoding="utf-8")
+
+
+def _case_field(case, name: str) -> object:
+    # Exported rows are dicts; the in-process scorer passes `Case` objects.
+    if isinstance(case, dict):
+        return case.get(name)
+    return getattr(case, name, None)
+
+
+_AUTOMATON = None
+
+
+def _keyword_automaton():
+    # Built (or loaded from the on-disk cache) once per process.
+    global _AUTOMATON
+    if _AUTOMATON is None:
+        from trigger_keyword_engine import load_automaton
+
+        _AUTOMATON = load_automaton()
+    return _AUTOMATON
 
 
 def predict_case(case: dict, mode: str = "keyword-demo") -> list[str]:
@@ -27,11 +96,14 @@ def predict_case(case: dict, mode: str = "keyword-demo") -> list[str]:
 
     Replace this function with your actual trigger logic.
     """
-    prompt = str(case.get("prompt", ""))
+    prompt = str(_case_field(case, "prompt") or "")
 
     if mode == "none":
         return []
 
+    if mode == "keywords":
+        return _keyword_automaton().match(prompt)
+
     if mode != "keyword-demo":
         raise ValueError(f"Unsupported mode: {mode}")
 
@@ -74,24 +146,47 @@ def predict_case(case: dict, mode: str = "keyword-demo") -> list[str]:
     return deduped
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Template adapter for skill trigger evaluation.")
-    parser.add_argument("--input", required=True, help="Input cases JSONL path")
-    parser.add_argument("--output", required=True, help="Output predictions JSONL path")
-    parser.add_argument(
-        "--mode",
-        default="keyword-demo",
-        choices=["keyword-demo", "none"],
-        help="Demo prediction mode (default: keyword-demo)",
-    )
-    args = parser.parse_args()
+def predict_batch(cases: list, mode: str = "keyword-demo") -> list[list[str]]:
+    """
+    Return one prediction list per case, in input order.
 
-    in_path = Path(args.input)
-    out_path = Path(args.output)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    This is the plugin entry point for `trigger_examples_tool.py score --predictor`.
+    Engines that can batch (model inference, HTTP) should override this directly.
+    """
+    return [predict_case(case, mode=mode) for case in cases]
 
-    count = 0
-    with in_path.open("r", encoding="utf-8") as src, out_path.open("w", encoding="utf-8") as dst:
+
+def predict_batch_keywords(cases: list) -> list[list[str]]:
+    """Plugin entry point for the compiled skill.yaml keyword engine."""
+    return predict_batch(cases, mode="keywords")
+
+
+def predictor_version(mode: str) -> str:
+    """Prediction cache version: this file's source, plus every skill's trigger keywords in keywords mode."""
+    extra = [mode]
+    if mode == "keywords":
+        from trigger_keyword_engine import SKILLS_DIR, collect_skill_keywords
+
+        extra.append(json.dumps(collect_skill_keywords(SKILLS_DIR), sort_keys=True))
+    return files_version([Path(__file__).resolve()], *extra)
+
+
+# `trigger_examples_tool.py --prediction-cache` folds `cache_key()` into the predictor version.
+predict_batch_keywords.cache_key = lambda: predictor_version("keywords")
+
+
+def timed_predict_batch(cases: list, mode: str) -> tuple[list[list[str]], float]:
+    """Run `predict_batch` and return its results with the wall time spent (seconds)."""
+    if not cases:
+        return [], 0.0
+    start = time.perf_counter()
+    predicted = predict_batch(cases, mode=mode)
+    return predicted, time.perf_counter() - start
+
+
+def iter_case_batches(in_path: Path, batch_size: int) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    with open_text(in_path) as src:
         for lineno, raw in enumerate(src, start=1):
             line = raw.strip()
             if not line:
@@ -105,14 +200,250 @@ def main() -> int:
             case_id = case.get("id")
             if not isinstance(case_id, str) or not case_id.strip():
                 raise ValueError(f"{in_path}:{lineno}: missing string field 'id'")
+            batch.append(case)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def run_batches(
+    batches: Iterable[list[dict]], mode: str, workers: int, executor_kind: str
+) -> Iterator[tuple[list[dict], list[list[str]], float]]:
+    """
+    Yield `(batch, predictions, seconds)` in input order.
+
+    With more than one worker, batches run on a thread or process pool while at
+    most `2 * workers` are in flight, so input is still read incrementally.
+    """
+    if workers <= 1:
+        for batch in batches:
+            predicted, elapsed = timed_predict_batch(batch, mode)
+            yield batch, predicted, elapsed
+        return
 
-            predicted = predict_case(case, mode=args.mode)
-            dst.write(
-                json.dumps({"id": case_id, "predicted": predicted}, ensure_ascii=False) + "\n"
-            )
-            count += 1
+    pool_cls = ThreadPoolExecutor if executor_kind == "thread" else ProcessPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        in_flight: deque = deque()
+        for batch in batches:
+            in_flight.append((batch, pool.submit(timed_predict_batch, batch, mode)))
+            if len(in_flight) >= 2 * workers:
+                done_batch, future = in_flight.popleft()
+                yield (done_batch, *future.result())
+        while in_flight:
+            done_batch, future = in_flight.popleft()
+            yield (done_batch, *future.result())
+
+
+class ServeHandler:
+    """
+    Worker-side `hello` / `predict` for `--serve`. The engine is loaded before
+    the first request; with a cache, lookups and stores are serialized and
+    flushed after every request, since a worker may run indefinitely.
+    """
+
+    def __init__(self, mode: str, version: str, cache: PredictionCache | None, pool=None) -> None:
+        self.mode = mode
+        self.version = version
+        self.cache = cache
+        self.pool = pool
+        self.lock = threading.Lock()
+        if mode == "keywords":
+            _keyword_automaton()
+
+    def hello(self) -> dict:
+        return {"predictor": f"predictor_adapter_template:{self.mode}", "version": self.version}
+
+    def _predict(self, cases: list[dict]) -> list[list[str]]:
+        if self.pool is not None:
+            return self.pool.submit(predict_batch, cases, self.mode).result()
+        return predict_batch(cases, mode=self.mode)
+
+    def predict(self, cases: list[dict]) -> list[list[str]]:
+        if self.cache is None:
+            return self._predict(cases)
+        prompts = [str(_case_field(case, "prompt") or "") for case in cases]
+        with self.lock:
+            cached = self.cache.get_many(prompts)
+        todo = [i for i, value in enumerate(cached) if value is MISS]
+        predicted = self._predict([cases[i] for i in todo]) if todo else []
+        with self.lock:
+            self.cache.put_many([prompts[i] for i in todo], predicted)
+            self.cache.flush()
+        for i, value in zip(todo, predicted):
+            cached[i] = value
+        return cached
+
+
+def serve(args: argparse.Namespace) -> int:
+    version = args.predictor_version or predictor_version(args.mode)
+    cache = None
+    if args.cache:
+        cache = PredictionCache(
+            Path(args.cache),
+            f"predictor_adapter_template:{args.mode}",
+            version,
+            max(1, args.cache_max_entries),
+            shared=True,
+        )
+    pool = None
+    if args.executor == "process" and args.workers > 1:
+        pool = ProcessPoolExecutor(max_workers=args.workers)
+    handler = ServeHandler(args.mode, version, cache, pool)
+    try:
+        if args.socket:
+            serve_socket(Path(args.socket), handler, args.workers)
+        else:
+            serve_stdio(handler, args.workers)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if cache is not None:
+            cache.close()
+            print(cache.summary(), file=sys.stderr)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Template adapter for skill trigger evaluation.")
+    parser.add_argument("--input", help="Input cases JSONL path (.gz / .xz read compressed)")
+    parser.add_argument("--output", help="Output predictions JSONL path (.gz / .xz written compressed)")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help=(
+            "Run as a long-lived predictor worker (predictor_worker.py protocol) on stdin/stdout, "
+            "or on --socket; --workers requests run concurrently"
+        ),
+    )
+    parser.add_argument("--socket", help="Unix socket path for --serve (default: stdin/stdout)")
+    parser.add_argument(
+        "--mode",
+        default="keyword-demo",
+        choices=["keyword-demo", "keywords", "none"],
+        help=(
+            "Prediction mode: keyword-demo (hand-written rules), keywords (skill.yaml "
+            "triggers.keywords via a compiled automaton) or none (default: keyword-demo)"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent predict_batch calls (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=64,
+        help="Cases per predict_batch call (default: 64)",
+    )
+    parser.add_argument(
+        "--executor",
+        default="thread",
+        choices=["thread", "process"],
+        help="Pool type for --workers > 1: thread for I/O-bound engines, process for CPU-bound",
+    )
+    parser.add_argument(
+        "--batch-stats",
+        action="store_true",
+        help="Print per-batch size, latency and throughput to stderr",
+    )
+    parser.add_argument(
+        "--cache",
+        help="Persistent SQLite prediction cache; only prompts not cached for this mode and version are predicted",
+    )
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=f"Evict least recently used predictions beyond this many (default: {DEFAULT_MAX_ENTRIES})",
+    )
+    parser.add_argument(
+        "--predictor-version",
+        help="Cache version; entries of other versions are invalidated (default: predictor_version(mode))",
+    )
+    args = parser.parse_args()
+
+    if args.serve:
+        if args.input or args.output:
+            parser.error("--serve reads requests instead of --input / --output")
+        return serve(args)
+    if not args.input or not args.output:
+        parser.error("--input and --output are required (or --serve)")
+    if args.socket:
+        parser.error("--socket requires --serve")
+
+    in_path = Path(args.input)
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    cache = None
+    if args.cache:
+        cache = PredictionCache(
+            Path(args.cache),
+            f"predictor_adapter_template:{args.mode}",
+            args.predictor_version or predictor_version(args.mode),
+            max(1, args.cache_max_entries),
+        )
+    # Cached lookups happen as batches are read; `pending` lines results back up with their batch.
+    pending: deque = deque()
+
+    def uncached(batches: Iterable[list[dict]]) -> Iterator[list[dict]]:
+        for batch in batches:
+            cached = cache.get_many([str(case.get("prompt") or "") for case in batch])
+            pending.append((batch, cached))
+            yield [case for case, value in zip(batch, cached) if value is MISS]
+
+    count = 0
+    busy = 0.0
+    start = time.perf_counter()
+    batches = iter_case_batches(in_path, max(1, args.batch_size))
+    if cache is not None:
+        batches = uncached(batches)
+    with open_text(out_path, "w") as dst:
+        for n, (todo, predicted, elapsed) in enumerate(
+            run_batches(batches, args.mode, args.workers, args.executor), start=1
+        ):
+            if len(predicted) != len(todo):
+                raise ValueError(
+                    f"predict_batch returned {len(predicted)} predictions for {len(todo)} cases"
+                )
+            batch, cached = pending.popleft() if cache is not None else (todo, [MISS] * len(todo))
+            if cache is not None:
+                cache.put_many([str(case.get("prompt") or "") for case in todo], predicted)
+            # Batch wall time split evenly; --batch-size 1 gives exact per-prompt latency.
+            latency_ms = round(elapsed * 1000 / len(todo), 3) if todo else 0.0
+            fresh = iter(predicted)
+            for case, value in zip(batch, cached):
+                if value is MISS:
+                    row = {"id": case["id"], "predicted": next(fresh), "latency_ms": latency_ms}
+                else:
+                    row = {"id": case["id"], "predicted": value}
+                dst.write(json.dumps(row, ensure_ascii=False) + "\n")
+            count += len(batch)
+            busy += elapsed
+            if args.batch_stats:
+                rate = len(todo) / elapsed if elapsed else 0.0
+                print(
+                    f"batch {n}: {len(todo)} cases in {elapsed * 1000:.1f} ms ({rate:.0f} cases/s)"
+                    + (f", {len(batch) - len(todo)} cached" if cache is not None else ""),
+                    file=sys.stderr,
+                )
 
+    wall = time.perf_counter() - start
     print(f"Wrote {count} predictions to {out_path}")
+    if args.batch_stats or args.workers > 1:
+        pool_desc = f"{args.workers} {args.executor} workers" if args.workers > 1 else "serial"
+        print(
+            f"Throughput: {count / wall if wall else 0:.0f} cases/s over {wall:.2f}s wall "
+            f"({busy:.2f}s inside predict_batch, {pool_desc})",
+            file=sys.stderr,
+        )
+    if cache is not None:
+        cache.close()
+        print(cache.summary(), file=sys.stderr)
     return 0
 
 
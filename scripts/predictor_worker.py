@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Long-lived predictor worker protocol.
+
+A worker loads its engine (model, rule tables, keyword automaton) once and
+then answers prediction requests, so successive eval runs and `watch` cycles
+skip the cold start. It speaks JSON Lines, one object per line, either over
+its stdin/stdout (spawned per session by the scorer) or over a Unix socket
+(started once, shared by every run that connects).
+
+Requests carry a client-chosen `id` and an `op` (default `predict`):
+  {"id": 1, "op": "hello"}
+  {"id": 2, "op": "predict", "cases": [{"id": ..., "prompt": ..., ...}, ...]}
+  {"id": 3, "op": "shutdown"}
+
+Responses echo the `id`:
+  {"id": 1, "predictor": "name", "version": "...", "pid": 123, "protocol": 1}
+  {"id": 2, "predictions": [...], "elapsed_ms": 1.25}
+  {"id": 3, "ok": true}
+  {"id": 2, "error": "ValueError: ..."}
+
+Clients may pipeline: send further requests before earlier ones are answered.
+The worker keeps reading while requests run on its pool, and responses can
+arrive out of order when it has more than one worker thread. `predictions`
+holds one entry per case, in order, in any form a predictions file accepts.
+`shutdown` stops the worker after the requests before it are answered; a
+stdin/stdout worker also stops at end of input.
+
+`predictor_adapter_template.py --serve` implements the server side;
+`trigger_examples_tool.py score/watch --predictor-worker/--predictor-socket`
+is the client.
+
+Usage:
+  python3 scripts/predictor_worker.py --socket /tmp/predictor.sock ping
+  python3 scripts/predictor_worker.py --socket /tmp/predictor.sock stop
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import queue
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Protocol
+
+
+PROTOCOL_VERSION = 1
+DEFAULT_WINDOW = 8  # requests a client keeps in flight
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class WorkerError(RuntimeError):
+    """A worker's `error` response, a lost connection or a line outside the protocol."""
+
+
+class WorkerHandler(Protocol):
+    def hello(self) -> dict: ...
+
+    def predict(self, cases: list[dict]) -> list: ...
+
+
+def answer(handler: WorkerHandler, request: dict) -> dict:
+    """Response to one `hello` or `predict` request; handler failures become `error` responses."""
+    request_id = request.get("id")
+    op = request.get("op", "predict")
+    try:
+        if op == "hello":
+            return {"id": request_id, **handler.hello(), "pid": os.getpid(), "protocol": PROTOCOL_VERSION}
+        if op != "predict":
+            raise ValueError(f"unknown op {op!r}")
+        cases = request.get("cases")
+        if not isinstance(cases, list):
+            raise ValueError("'cases' must be a list")
+        start = time.perf_counter()
+        predictions = list(handler.predict(cases)) if cases else []
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if len(predictions) != len(cases):
+            raise ValueError(f"predictor returned {len(predictions)} predictions for {len(cases)} cases")
+        return {"id": request_id, "predictions": predictions, "elapsed_ms": round(elapsed_ms, 3)}
+    except Exception as exc:
+        return {"id": request_id, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def serve_lines(
+    lines: Iterable[bytes], write: Callable[[bytes], None], handler: WorkerHandler, workers: int = 1
+) -> bool:
+    """
+    Answer the requests in `lines` through `write` until they run out or a
+    `shutdown` arrives (returns True for the latter). Requests run on
+    `workers` threads, so reading never waits on a prediction.
+    """
+    lock = threading.Lock()
+
+    def send(message: dict) -> None:
+        data = (_encode(message) + "\n").encode("utf-8")
+        with lock:
+            write(data)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+                send({"id": None, "error": f"invalid JSON request: {exc}"})
+                continue
+            if not isinstance(request, dict):
+                send({"id": None, "error": "request must be a JSON object"})
+                continue
+            if request.get("op") == "shutdown":
+                pool.shutdown(wait=True)
+                send({"id": request.get("id"), "ok": True})
+                return True
+            pool.submit(lambda r: send(answer(handler, r)), request)
+    return False
+
+
+def serve_stdio(handler: WorkerHandler, workers: int = 1) -> None:
+    """
+    Serve requests from stdin on stdout. File descriptor 1 is pointed at
+    stderr first, so stray prints from engine code cannot corrupt responses.
+    """
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def write(data: bytes) -> None:
+        out.write(data)
+        out.flush()
+
+    try:
+        serve_lines(sys.stdin.buffer, write, handler, workers)
+    except BrokenPipeError:
+        pass  # the client went away
+    finally:
+        try:
+            out.close()
+        except BrokenPipeError:
+            pass
+
+
+def serve_socket(path: Path, handler: WorkerHandler, workers: int = 1) -> None:
+    """Serve each connection to the Unix socket `path` on its own thread until `shutdown` or Ctrl-C."""
+
+    class Connection(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            try:
+                stop = serve_lines(self.rfile, self.wfile.write, handler, workers)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            if stop:
+                self.server.shutdown()  # returns once serve_forever() (on the main thread) stops
+
+    if path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()  # left behind by a worker that was killed
+        else:
+            raise SystemExit(f"A predictor worker is already listening on {path}")
+        finally:
+            probe.close()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with socketserver.ThreadingUnixStreamServer(str(path), Connection) as server:
+        server.daemon_threads = True
+        print(f"Predictor worker listening on {path} (pid {os.getpid()})", file=sys.stderr, flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def case_row(case) -> dict:
+    # Exported rows are dicts already; the scorer passes `Case` objects.
+    if isinstance(case, dict):
+        return case
+    return {
+        "id": case.id,
+        "skill": case.skill,
+        "prompt": case.prompt,
+        "polarity": case.polarity,
+        "language": case.language,
+        "source": case.source,
+    }
+
+
+class WorkerClient:
+    """
+    Client side of the protocol. `command` is started through the shell and
+    spoken to over its stdin/stdout for this session; `socket_path` connects
+    to a running worker. Calling the client predicts one batch;
+    `map_batches` pipelines up to `window` requests. Failures raise `WorkerError`.
+    """
+
+    def __init__(
+        self, command: str | None = None, socket_path: Path | None = None, window: int = DEFAULT_WINDOW
+    ) -> None:
+        self.window = max(1, window)
+        self.proc: subprocess.Popen | None = None
+        self.sock: socket.socket | None = None
+        if command:
+            self.target = command
+            self.proc = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            self._rfile, self._wfile = self.proc.stdout, self.proc.stdin
+        else:
+            self.target = str(socket_path)
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                self.sock.connect(str(socket_path))
+            except OSError as exc:
+                self.sock.close()
+                raise SystemExit(f"No predictor worker listening on {socket_path}: {exc}") from None
+            self._rfile, self._wfile = self.sock.makefile("rb"), self.sock.makefile("wb")
+        self._ids = itertools.count(1)
+        self._arrived: dict[object, dict] = {}
+        # Requests are written on their own thread: a client that blocked on a
+        # full pipe while the worker blocked writing responses would deadlock.
+        self._outbox: queue.Queue[bytes | None] = queue.Queue()
+        self._sender = threading.Thread(target=self._send_loop, daemon=True)
+        self._sender.start()
+        self.info: dict = {}
+        try:
+            self.hello()
+        except WorkerError as exc:
+            self.close()
+            raise SystemExit(f"{exc} (before answering hello)") from None
+
+    def hello(self) -> dict:
+        """Ask the worker who it is (name, version, pid); `name` and `version` follow the answer."""
+        self.info = self.request("hello")
+        return self.info
+
+    @property
+    def name(self) -> str:
+        return f"worker:{self.info.get('predictor', 'unknown')}"
+
+    @property
+    def version(self) -> str:
+        return str(self.info.get("version", ""))
+
+    def describe(self) -> str:
+        return f"{self.name} (pid {self.info.get('pid', '?')}, {self.target})"
+
+    def _send_loop(self) -> None:
+        while (data := self._outbox.get()) is not None:
+            try:
+                self._wfile.write(data)
+                self._wfile.flush()
+            except OSError:
+                return  # the reader reports the lost connection
+
+    def _send(self, op: str, **fields) -> int:
+        request_id = next(self._ids)
+        self._outbox.put((_encode({"id": request_id, "op": op, **fields}) + "\n").encode("utf-8"))
+        return request_id
+
+    def _wait(self, request_id: int) -> dict:
+        while request_id not in self._arrived:
+            line = self._rfile.readline()
+            if not line:
+                status = f" (exit status {self.proc.poll()})" if self.proc is not None else ""
+                raise WorkerError(f"Predictor worker {self.target} closed the connection{status}")
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                raise WorkerError(f"Predictor worker {self.target} sent a non-protocol line: {line[:200]!r}") from None
+            if message.get("id") is None:
+                raise WorkerError(f"Predictor worker {self.target}: {message.get('error', message)}")
+            self._arrived[message["id"]] = message
+        response = self._arrived.pop(request_id)
+        if "error" in response:
+            raise WorkerError(f"Predictor worker {self.target}: {response['error']}")
+        return response
+
+    def request(self, op: str, **fields) -> dict:
+        return self._wait(self._send(op, **fields))
+
+    def map_batches(self, batches: Iterable[list]) -> Iterator[tuple[list, float]]:
+        """
+        Yield `(predictions, seconds)` per batch, in input order; `seconds` is
+        the worker's own time on the request, not including queueing. Batches
+        are pulled lazily, at most `window` ahead of the one being yielded.
+        """
+        batches = iter(batches)
+        in_flight: deque[int] = deque()
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < self.window:
+                batch = next(batches, None)
+                if batch is None:
+                    exhausted = True
+                else:
+                    in_flight.append(self._send("predict", cases=[case_row(case) for case in batch]))
+            if not in_flight:
+                return
+            response = self._wait(in_flight.popleft())
+            yield response["predictions"], float(response.get("elapsed_ms") or 0.0) / 1000
+
+    def __call__(self, cases: list) -> list:
+        return next(self.map_batches([cases]))[0]
+
+    def close(self) -> None:
+        """End the session; a spawned worker sees end of input and exits, a socket worker keeps running."""
+        self._outbox.put(None)
+        self._sender.join(timeout=5)
+        try:
+            self._wfile.close()
+        except OSError:
+            pass  # the worker is already gone
+        self._rfile.close()
+        if self.proc is not None:
+            self.proc.wait()
+        else:
+            self.sock.close()
+
+    def __enter__(self) -> WorkerClient:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check on or stop a predictor worker listening on a Unix socket.")
+    parser.add_argument("--socket", required=True, help="Worker socket path")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("ping", help="Print the worker's hello response and round-trip time")
+    sub.add_parser("stop", help="Ask the worker to finish pending requests and exit")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with WorkerClient(socket_path=Path(args.socket)) as client:
+        if args.command == "ping":
+            print(json.dumps(client.info, ensure_ascii=False))
+            print(f"Round trip: {(time.perf_counter() - start) * 1000:.1f} ms (connect + hello)", file=sys.stderr)
+            return 0
+        client.request("shutdown")
+    print(f"Stopped predictor worker on {args.socket}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
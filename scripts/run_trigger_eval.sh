@@ -12,44 +12,82 @@ set -euo pipefail
 #   ./scripts/run_trigger_eval.sh \
 #     --mode custom \
 #     --predict-cmd 'python3 /path/to/predict.py --input "$CASES_FILE" --output "$PREDS_FILE"'
+#   ./scripts/run_trigger_eval.sh --mode plugin --predictor predictor_adapter_template:predict_batch
+#   ./scripts/run_trigger_eval.sh --mode worker --worker-socket /tmp/predictor.sock
+#   ./scripts/run_trigger_eval.sh --mode custom --shards 8 --predict-cmd '...'
+#   ./scripts/run_trigger_eval.sh --mode custom --predict-cmd '...' \
+#     --results-db .cache/trigger-results.db --changed-since origin/main --predictor-path rules.yaml
 #
 # Custom command placeholders (environment variables made available):
-#   CASES_FILE  : exported JSONL cases path
+#   CASES_FILE  : exported JSONL cases path (one shard's cases with --shards)
 #   PREDS_FILE  : path your predictor must write predictions JSONL to
+#   SHARD_INDEX : 1-based shard number with --shards (1 otherwise)
 #   ROOT_DIR    : repo root
 #   SKILLS_DIR  : skills directory
+#   PREDICTION_CACHE : --prediction-cache path, empty if unset (pass it to the adapter's --cache)
 
 ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 TOOL="$ROOT_DIR/scripts/trigger_examples_tool.py"
 SKILLS_DIR="$ROOT_DIR/skills"
+ID_SCHEME="ordinal"
 WORK_DIR="${TMPDIR:-/tmp}/skill-trigger-eval"
 
 MODE="custom"
 PREDICT_CMD=""
+PREDICTOR=""
+WORKER_CMD=""
+WORKER_SOCKET=""
 DETAILS=1
 CONFUSION=0
 CONFUSION_TOP=20
 CSV_OUT=""
 HTML_REPORT=""
-AUTO_CSV_OUT=0
 FAIL_ON_MISS=0
 KEEP_ARTIFACTS=0
+SHARDS=1
+COMPRESS="none"
+RESULTS_DB=""
+PREDICTION_CACHE=""
+CHANGED_SINCE=""
+PREDICTOR_PATHS=()
 
 usage() {
   cat <<'EOF'
 Usage: run_trigger_eval.sh [options]
 
 Options:
-  --mode <perfect|noop|custom>   Predictor mode (default: custom)
+  --mode <perfect|noop|custom|plugin|worker>
+                                 Predictor mode (default: custom)
   --predict-cmd <command>        Custom predictor command (required for mode=custom)
+  --predictor <module:function>  In-process batch predictor (required for mode=plugin);
+                                 skips the export and predictions files entirely
+  --worker-cmd <command>         Predictor worker started for this run, spoken to over
+                                 stdin/stdout (mode=worker; no export or predictions files)
+  --worker-socket <path>         Running predictor worker to reuse, e.g. started with
+                                 predictor_adapter_template.py --serve --socket <path>
+                                 (mode=worker; stays warm across runs)
+  --shards <n>                   Export n skill-stratified shards and run the custom
+                                 predictor on all of them concurrently (mode=custom)
+  --compress <none|gz|xz>        Write the cases/predictions artifacts compressed
+                                 (default: none; the scorer reads them by extension)
   --work-dir <dir>               Working directory for generated files
   --skills-dir <dir>             Skills directory to evaluate (default: repo ./skills)
+  --id-scheme <ordinal|content>  Case ids: per-section ordinals, or hashes of the
+                                 normalized prompt that survive edits (default: ordinal)
   --no-details                   Do not print score details
   --confusion                    Print confusion summaries from scorer
   --top <n>                      Max rows per confusion table (default: 20)
   --csv-out <dir>                Write score CSV exports to directory
-  --html-report <file>           Generate HTML report file from CSV exports
+  --html-report <file>           Write the HTML report from the scorer's results
   --fail-on-miss                 Exit non-zero if any positive miss or false trigger
+  --results-db <file>            Append the run to this SQLite results history
+  --changed-since <git-ref>      Export and score only skills changed since the ref (and
+                                 skills confused with them), merged into the last run
+                                 in --results-db (required)
+  --predictor-path <file>        Predictor file whose change forces a full evaluation
+                                 with --changed-since (repeatable)
+  --prediction-cache <file>      Persistent prediction cache: reused by mode=plugin and
+                                 mode=worker, and exported as $PREDICTION_CACHE for custom commands
   --keep-artifacts               Keep exported cases/predictions files
   -h, --help                     Show help
 
@@ -57,8 +95,19 @@ Custom predictor contract:
   The command must write JSONL predictions to $PREDS_FILE.
   Each row must include:
     - "id": case id
-    - "predicted": "skill-name" OR ["skill-name", ...]
+    - "predicted": "skill-name" OR ["skill-name", ...] OR {"skill-name": score, ...}
   (The scorer also accepts "predicted_skills".)
+  Scored maps trigger every skill scoring >= the score threshold (0.5) and add
+  a threshold sweep: PR curve and per-skill F1-optimal thresholds.
+  Optional: "latency_ms" (number) enables p50/p90/p99/max latency reporting.
+
+Plugin predictor contract:
+  The function receives a list of Case objects (id, skill, prompt, polarity,
+  language, source) and returns one prediction per case in the same order.
+
+Worker predictor contract:
+  JSONL requests and responses with ids, as described in scripts/predictor_worker.py;
+  predictor_adapter_template.py --serve implements it.
 
 Examples:
   ./scripts/run_trigger_eval.sh --mode perfect
@@ -75,10 +124,22 @@ while [[ $# -gt 0 ]]; do
       MODE="${2:-}"; shift 2 ;;
     --predict-cmd)
       PREDICT_CMD="${2:-}"; shift 2 ;;
+    --predictor)
+      PREDICTOR="${2:-}"; shift 2 ;;
+    --worker-cmd)
+      WORKER_CMD="${2:-}"; shift 2 ;;
+    --worker-socket)
+      WORKER_SOCKET="${2:-}"; shift 2 ;;
+    --shards)
+      SHARDS="${2:-}"; shift 2 ;;
+    --compress)
+      COMPRESS="${2:-}"; shift 2 ;;
     --work-dir)
       WORK_DIR="${2:-}"; shift 2 ;;
     --skills-dir)
       SKILLS_DIR="${2:-}"; shift 2 ;;
+    --id-scheme)
+      ID_SCHEME="${2:-}"; shift 2 ;;
     --no-details)
       DETAILS=0; shift ;;
     --confusion)
@@ -91,6 +152,14 @@ while [[ $# -gt 0 ]]; do
       HTML_REPORT="${2:-}"; shift 2 ;;
     --fail-on-miss)
       FAIL_ON_MISS=1; shift ;;
+    --results-db)
+      RESULTS_DB="${2:-}"; shift 2 ;;
+    --changed-since)
+      CHANGED_SINCE="${2:-}"; shift 2 ;;
+    --predictor-path)
+      PREDICTOR_PATHS+=("${2:-}"); shift 2 ;;
+    --prediction-cache)
+      PREDICTION_CACHE="${2:-}"; shift 2 ;;
     --keep-artifacts)
       KEEP_ARTIFACTS=1; shift ;;
     -h|--help)
@@ -113,7 +182,7 @@ if [[ ! -d "$SKILLS_DIR" ]]; then
 fi
 
 case "$MODE" in
-  perfect|noop|custom) ;;
+  perfect|noop|custom|plugin|worker) ;;
   *)
     echo "Invalid --mode: $MODE" >&2
     exit 1 ;;
@@ -124,34 +193,86 @@ if [[ "$MODE" == "custom" && -z "$PREDICT_CMD" ]]; then
   exit 1
 fi
 
-mkdir -p "$WORK_DIR"
-CASES_FILE="$WORK_DIR/cases.jsonl"
-PREDS_FILE="$WORK_DIR/predictions.jsonl"
-if [[ -n "$HTML_REPORT" && -z "$CSV_OUT" ]]; then
-  CSV_OUT="$WORK_DIR/score-csv"
-  AUTO_CSV_OUT=1
+if [[ "$MODE" == "plugin" && -z "$PREDICTOR" ]]; then
+  echo "--predictor is required when --mode plugin" >&2
+  exit 1
+fi
+
+if [[ "$MODE" == "worker" && -z "$WORKER_CMD" && -z "$WORKER_SOCKET" ]]; then
+  echo "--worker-cmd or --worker-socket is required when --mode worker" >&2
+  exit 1
+fi
+
+if [[ -n "$WORKER_CMD" && -n "$WORKER_SOCKET" ]]; then
+  echo "--worker-cmd and --worker-socket are mutually exclusive" >&2
+  exit 1
+fi
+
+if ! [[ "$SHARDS" =~ ^[1-9][0-9]*$ ]]; then
+  echo "Invalid --shards: $SHARDS" >&2
+  exit 1
+fi
+
+case "$COMPRESS" in
+  none) EXT="jsonl" ;;
+  gz|xz) EXT="jsonl.$COMPRESS" ;;
+  *)
+    echo "Invalid --compress: $COMPRESS" >&2
+    exit 1 ;;
+esac
+
+if [[ -n "$CHANGED_SINCE" && -z "$RESULTS_DB" ]]; then
+  echo "--changed-since requires --results-db (the run to merge into)" >&2
+  exit 1
+fi
+
+if [[ "$SHARDS" -gt 1 && "$MODE" != "custom" ]]; then
+  echo "--shards requires --mode custom" >&2
+  exit 1
 fi
 
+mkdir -p "$WORK_DIR"
+CASES_FILE="$WORK_DIR/cases.$EXT"
+PREDS_FILE="$WORK_DIR/predictions.$EXT"
 cleanup() {
   if [[ "$KEEP_ARTIFACTS" -eq 0 ]]; then
     rm -f "$CASES_FILE" "$PREDS_FILE"
-    if [[ "$AUTO_CSV_OUT" -eq 1 ]]; then
-      rm -rf "$CSV_OUT"
-    fi
+    rm -f "$WORK_DIR"/cases.shard-*-of-"$SHARDS"."$EXT" "$WORK_DIR"/predictions.shard-*-of-"$SHARDS"."$EXT"
   fi
 }
 trap cleanup EXIT
 
-echo "[1/3] Exporting trigger examples..."
-python3 "$TOOL" --skills-dir "$SKILLS_DIR" export --out "$CASES_FILE"
+TOOL_ARGS=(--skills-dir "$SKILLS_DIR" --id-scheme "$ID_SCHEME")
+CHANGE_ARGS=()
+if [[ -n "$CHANGED_SINCE" ]]; then
+  CHANGE_ARGS=(--changed-since "$CHANGED_SINCE" --results-db "$RESULTS_DB")
+  for path in ${PREDICTOR_PATHS[@]+"${PREDICTOR_PATHS[@]}"}; do
+    CHANGE_ARGS+=(--predictor-path "$path")
+  done
+fi
+
+if [[ "$MODE" == "plugin" || "$MODE" == "worker" ]]; then
+  echo "[1/3] Skipping export (mode=$MODE sends cases to the predictor directly)"
+else
+  echo "[1/3] Exporting trigger examples..."
+  if [[ "$SHARDS" -gt 1 ]]; then
+    python3 "$TOOL" "${TOOL_ARGS[@]}" export --out "$CASES_FILE" --shards "$SHARDS" \
+      ${CHANGE_ARGS[@]+"${CHANGE_ARGS[@]}"}
+  else
+    python3 "$TOOL" "${TOOL_ARGS[@]}" export --out "$CASES_FILE" ${CHANGE_ARGS[@]+"${CHANGE_ARGS[@]}"}
+  fi
+fi
 
 echo "[2/3] Running predictor (mode=$MODE)..."
 case "$MODE" in
   perfect)
-    python3 - "$CASES_FILE" "$PREDS_FILE" <<'PY'
+    python3 - "$CASES_FILE" "$PREDS_FILE" "$ROOT_DIR/scripts" <<'PY'
 import json, sys
-src, dst = sys.argv[1], sys.argv[2]
-with open(src, encoding="utf-8") as f, open(dst, "w", encoding="utf-8") as w:
+from pathlib import Path
+sys.path.insert(0, sys.argv[3])
+from trigger_examples_tool import open_text
+src, dst = Path(sys.argv[1]), Path(sys.argv[2])
+with open_text(src) as f, open_text(dst, "w") as w:
     for line in f:
         row = json.loads(line)
         predicted = [row["skill"]] if row.get("expected_trigger") else []
@@ -159,29 +280,76 @@ with open(src, encoding="utf-8") as f, open(dst, "w", encoding="utf-8") as w:
 PY
     ;;
   noop)
-    python3 - "$CASES_FILE" "$PREDS_FILE" <<'PY'
+    python3 - "$CASES_FILE" "$PREDS_FILE" "$ROOT_DIR/scripts" <<'PY'
 import json, sys
-src, dst = sys.argv[1], sys.argv[2]
-with open(src, encoding="utf-8") as f, open(dst, "w", encoding="utf-8") as w:
+from pathlib import Path
+sys.path.insert(0, sys.argv[3])
+from trigger_examples_tool import open_text
+src, dst = Path(sys.argv[1]), Path(sys.argv[2])
+with open_text(src) as f, open_text(dst, "w") as w:
     for line in f:
         row = json.loads(line)
         w.write(json.dumps({"id": row["id"], "predicted": []}, ensure_ascii=False) + "\n")
 PY
     ;;
   custom)
-    export CASES_FILE PREDS_FILE ROOT_DIR SKILLS_DIR
-    # Intentional use of eval to allow quoted placeholders in user-provided command.
-    eval "$PREDICT_CMD"
+    export CASES_FILE PREDS_FILE ROOT_DIR SKILLS_DIR PREDICTION_CACHE
+    if [[ "$SHARDS" -gt 1 ]]; then
+      # One predictor process per shard, all running at once.
+      PIDS=()
+      for ((i = 1; i <= SHARDS; i++)); do
+        (
+          SHARD_INDEX="$i"
+          CASES_FILE="$WORK_DIR/cases.shard-$i-of-$SHARDS.$EXT"
+          PREDS_FILE="$WORK_DIR/predictions.shard-$i-of-$SHARDS.$EXT"
+          export SHARD_INDEX CASES_FILE PREDS_FILE
+          [[ -f "$CASES_FILE" ]] || exit 0
+          eval "$PREDICT_CMD"
+        ) &
+        PIDS+=("$!")
+      done
+      for pid in "${PIDS[@]}"; do
+        wait "$pid" || { echo "A shard predictor failed" >&2; exit 1; }
+      done
+    else
+      export SHARD_INDEX=1
+      # Intentional use of eval to allow quoted placeholders in user-provided command.
+      eval "$PREDICT_CMD"
+    fi
+    ;;
+  plugin)
+    echo "Predictor $PREDICTOR will be imported and called in-process by the scorer."
+    ;;
+  worker)
+    echo "The scorer will send cases to the predictor worker ${WORKER_SOCKET:-$WORKER_CMD}."
     ;;
 esac
 
-if [[ ! -f "$PREDS_FILE" ]]; then
+if [[ "$MODE" != "plugin" && "$MODE" != "worker" && "$SHARDS" -eq 1 && ! -f "$PREDS_FILE" ]]; then
   echo "Predictor did not create predictions file: $PREDS_FILE" >&2
   exit 1
 fi
 
 echo "[3/3] Scoring predictions..."
-SCORE_ARGS=(--skills-dir "$SKILLS_DIR" score --predictions "$PREDS_FILE")
+if [[ "$MODE" == "plugin" ]]; then
+  SCORE_ARGS=("${TOOL_ARGS[@]}" score --predictor "$PREDICTOR")
+  if [[ -n "$PREDICTION_CACHE" ]]; then
+    SCORE_ARGS+=(--prediction-cache "$PREDICTION_CACHE")
+  fi
+elif [[ "$MODE" == "worker" ]]; then
+  if [[ -n "$WORKER_SOCKET" ]]; then
+    SCORE_ARGS=("${TOOL_ARGS[@]}" score --predictor-socket "$WORKER_SOCKET")
+  else
+    SCORE_ARGS=("${TOOL_ARGS[@]}" score --predictor-worker "$WORKER_CMD")
+  fi
+  if [[ -n "$PREDICTION_CACHE" ]]; then
+    SCORE_ARGS+=(--prediction-cache "$PREDICTION_CACHE")
+  fi
+elif [[ "$SHARDS" -gt 1 ]]; then
+  SCORE_ARGS=("${TOOL_ARGS[@]}" score --predictions-glob "$WORK_DIR/predictions.shard-*-of-$SHARDS.$EXT")
+else
+  SCORE_ARGS=("${TOOL_ARGS[@]}" score --predictions "$PREDS_FILE")
+fi
 if [[ "$DETAILS" -eq 1 ]]; then
   SCORE_ARGS+=(--details)
 fi
@@ -191,19 +359,20 @@ fi
 if [[ -n "$CSV_OUT" ]]; then
   SCORE_ARGS+=(--csv-out "$CSV_OUT")
 fi
+if [[ -n "$HTML_REPORT" ]]; then
+  SCORE_ARGS+=(--html-report "$HTML_REPORT")
+fi
 if [[ "$FAIL_ON_MISS" -eq 1 ]]; then
   SCORE_ARGS+=(--fail-on-miss)
 fi
+if [[ -n "$CHANGED_SINCE" ]]; then
+  SCORE_ARGS+=("${CHANGE_ARGS[@]}")
+elif [[ -n "$RESULTS_DB" ]]; then
+  SCORE_ARGS+=(--results-db "$RESULTS_DB")
+fi
 
 python3 "$TOOL" "${SCORE_ARGS[@]}"
 
-if [[ -n "$HTML_REPORT" ]]; then
-  echo "[4/4] Generating HTML report..."
-  python3 "$ROOT_DIR/scripts/trigger_eval_report.py" \
-    --csv-dir "$CSV_OUT" \
-    --out "$HTML_REPORT"
-fi
-
 if [[ "$KEEP_ARTIFACTS" -eq 1 ]]; then
   echo "Artifacts kept:"
   echo "- $CASES_FILE"
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Single-pass catalog of the skills tree.
+
+Walks `skills/` once with `os.scandir`, stopping at each skill root (a
+directory holding `SKILL.md`), so a skill's `references/`, `agents/` and other
+subdirectories are never descended into. Each `skill.yaml` is read once for
+its header scalars and `triggers.keywords`. An entry records:
+
+- id (directory name, as used by the scorer) and path relative to the skills dir
+- category and manual group (from the directory layout, else skill.yaml)
+- title, summary and trigger keywords
+- `[mtime_ns, size]` of skill.yaml and of every file under `references/`
+
+The catalog can be cached on disk; entries are reused while their skill.yaml
+stat is unchanged, so a warm load is the directory walk plus a stat per skill.
+`trigger_examples_tool.py`, `trigger_keyword_engine.py` and `ng` read it
+instead of rescanning the tree.
+
+Usage:
+  python3 scripts/skill_catalog.py build
+  python3 scripts/skill_catalog.py list --json --category manual
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SKILLS_DIR = ROOT / "skills"
+DEFAULT_CACHE_PATH = ROOT / ".cache" / "skill-catalog.json"
+CATALOG_VERSION = 1
+
+CATEGORIES = ("global", "cron", "auto", "manual")
+HEADER_KEYS = ("title", "summary", "category", "activation", "manual_group")
+
+
+def _walk_skill_roots(skills_dir: str) -> list[str]:
+    """Skill root paths (strings) under `skills_dir`, sorted component-wise like `Path` objects."""
+    found: list[str] = []
+    stack = [skills_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        if any(e.name == "SKILL.md" and e.is_file() for e in entries):
+            found.append(current)
+            continue
+        stack.extend(e.path for e in entries if e.is_dir())
+    found.sort(key=lambda path: path.split(os.sep))
+    return found
+
+
+def find_skill_dirs(skills_dir: Path) -> list[Path]:
+    """Skill roots under `skills_dir`, sorted; nothing below a skill root is visited."""
+    return [Path(path) for path in _walk_skill_roots(str(skills_dir))]
+
+
+def parse_skill_yaml(text: str) -> tuple[dict[str, str], list[str]]:
+    """
+    Header scalars (first `key: value` line for each of HEADER_KEYS, at any
+    indent) and the `triggers.keywords` list, in one pass and without a YAML
+    dependency.
+    """
+    scalars: dict[str, str] = {}
+    keywords: list[str] = []
+    in_triggers = False
+    in_keywords = False
+    keywords_indent = 0
+    for raw in text.splitlines():
+        stripped = raw.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        key, sep, value = stripped.partition(":")
+        if sep and key in HEADER_KEYS and key not in scalars:
+            scalars[key] = value.strip()
+        indent = len(raw) - len(raw.lstrip(" "))
+        if indent == 0:
+            in_triggers = stripped == "triggers:"
+            in_keywords = False
+            continue
+        if not in_triggers:
+            continue
+        if stripped == "keywords:":
+            in_keywords = True
+            keywords_indent = indent
+            continue
+        if in_keywords:
+            if indent <= keywords_indent and not stripped.startswith("- "):
+                in_keywords = False
+                continue
+            if stripped.startswith("- "):
+                keyword = stripped[2:].strip().strip("'\"")
+                if keyword:
+                    keywords.append(keyword)
+    return scalars, keywords
+
+
+def category_of(rel_parts: tuple[str, ...], scalars: dict[str, str]) -> str:
+    """Top-level category directory, else skill.yaml `category`, else derived from `activation`."""
+    if rel_parts and rel_parts[0] in CATEGORIES:
+        return rel_parts[0]
+    if scalars.get("category"):
+        return scalars["category"]
+    activation = scalars.get("activation")
+    if activation == "always_on":
+        return "auto"
+    if activation in {"cron", "scheduled"}:
+        return "cron"
+    if activation in {"global", "auto", "manual"}:
+        return activation
+    return "manual"
+
+
+def manual_group_of(rel_parts: tuple[str, ...], scalars: dict[str, str]) -> str:
+    if len(rel_parts) > 1 and rel_parts[0] == "manual":
+        return rel_parts[1]
+    return scalars.get("manual_group", "")
+
+
+def stat_key(path: str) -> list[int] | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def reference_stats(skill_dir: str) -> dict[str, list[int]]:
+    """`{relative path: [mtime_ns, size]}` for every file under the skill's references/."""
+    out: dict[str, list[int]] = {}
+    stack = [(os.path.join(skill_dir, "references"), "references/")]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for e in it:
+                    if e.is_dir():
+                        stack.append((e.path, f"{prefix}{e.name}/"))
+                    elif e.is_file():
+                        st = e.stat()
+                        out[prefix + e.name] = [st.st_mtime_ns, st.st_size]
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return dict(sorted(out.items()))
+
+
+def read_skill(skill_dir: Path, rel_parts: tuple[str, ...], yaml_stat: list[int] | None = None) -> dict:
+    """Catalog entry for one skill directory (reads its skill.yaml once)."""
+    yaml_path = skill_dir / "skill.yaml"
+    if yaml_stat is None:
+        yaml_stat = stat_key(str(yaml_path))
+    scalars, keywords = parse_skill_yaml(yaml_path.read_text(encoding="utf-8")) if yaml_stat else ({}, [])
+    return {
+        "id": skill_dir.name,
+        "path": "/".join(rel_parts),
+        "category": category_of(rel_parts, scalars),
+        "manual_group": manual_group_of(rel_parts, scalars),
+        "title": scalars.get("title", ""),
+        "summary": scalars.get("summary", ""),
+        "keywords": keywords,
+        "yaml": yaml_stat,
+    }
+
+
+def skill_category(skill_dir: Path, skills_dir: Path = SKILLS_DIR) -> str:
+    """Category of one skill directory, without building a catalog."""
+    try:
+        rel_parts = skill_dir.relative_to(skills_dir).parts
+    except ValueError:
+        rel_parts = ()
+    return read_skill(skill_dir, rel_parts)["category"]
+
+
+class SkillCatalog:
+    """
+    Catalog entries in skill-directory order. `load()` walks the tree and
+    re-reads only skill.yaml files whose stat changed since the cached catalog.
+    """
+
+    def __init__(self, skills_dir: Path = SKILLS_DIR, cache_path: Path | None = None) -> None:
+        self.skills_dir = skills_dir.resolve()
+        self.cache_path = cache_path
+        self.entries: list[dict] = []
+        self.stats = {"reused": 0, "parsed": 0}
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def skill_dir(self, entry: dict) -> Path:
+        return self.skills_dir.joinpath(*entry["path"].split("/")) if entry["path"] else self.skills_dir
+
+    def _cached(self) -> dict[str, dict]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != CATALOG_VERSION or data.get("skills_dir") != str(self.skills_dir):
+            return {}
+        return {entry["path"]: entry for entry in data.get("entries", [])}
+
+    def load(self) -> SkillCatalog:
+        cached = self._cached()
+        entries = []
+        root = str(self.skills_dir)
+        for path in _walk_skill_roots(root):
+            rel = path[len(root) + 1 :].replace(os.sep, "/")
+            yaml_stat = stat_key(os.path.join(path, "skill.yaml"))
+            entry = cached.get(rel)
+            if entry is not None and entry["yaml"] == yaml_stat:
+                self.stats["reused"] += 1
+            else:
+                entry = read_skill(Path(path), tuple(rel.split("/")) if rel else (), yaml_stat)
+                self.stats["parsed"] += 1
+            entry["references"] = reference_stats(path)
+            entries.append(entry)
+        self.entries = entries
+        if self.cache_path is not None and (self.stats["parsed"] or len(cached) != len(entries)):
+            self.save()
+        return self
+
+    def save(self) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        payload = {"version": CATALOG_VERSION, "skills_dir": str(self.skills_dir), "entries": self.entries}
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.cache_path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build and query the single-pass skill catalog.")
+    parser.add_argument("--skills-dir", default=str(SKILLS_DIR), help="Skills directory (default: ./skills)")
+    parser.add_argument(
+        "--cache",
+        default=str(DEFAULT_CACHE_PATH),
+        help=f"Catalog cache (default: {DEFAULT_CACHE_PATH.relative_to(ROOT)})",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="Walk the tree and write the catalog cache")
+    p_list = sub.add_parser("list", help="List skills (the `skills-linker list` layout)")
+    p_list.add_argument("--category", choices=CATEGORIES, help="Only skills in this category")
+    p_list.add_argument("--json", action="store_true", help="JSON output, as used by ng")
+    args = parser.parse_args()
+
+    catalog = SkillCatalog(Path(args.skills_dir), Path(args.cache)).load()
+    if args.command == "build":
+        print(
+            f"Cataloged {len(catalog)} skills ({catalog.stats['parsed']} skill.yaml parsed, "
+            f"{catalog.stats['reused']} reused): {args.cache}"
+        )
+        return 0
+
+    entries = [e for e in catalog if not args.category or e["category"] == args.category]
+    if args.json:
+        payload: dict = {"skills_root": str(catalog.skills_dir)}
+        if args.category:
+            payload["category_filter"] = args.category
+        fields = ("id", "path", "category", "title", "summary", "manual_group")
+        payload["skills"] = [e["id"] for e in entries]
+        payload["items"] = [{key: e[key] for key in fields} for e in entries]
+        payload["count"] = len(entries)
+        json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+    for entry in entries:
+        print(f"{entry['category']}\t{entry['manual_group']}\t{entry['id']}\t{entry['title']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
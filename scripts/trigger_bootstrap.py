@@ -0,0 +1,160 @@
+"""
+Bootstrap confidence intervals and paired tests for trigger metrics.
+
+Recall and reject rate are proportions of binary per-case outcomes, so the
+number of hits in a bootstrap resample of `n` cases with `k` hits is exactly
+Binomial(n, k/n). Drawing those counts directly is equivalent to resampling
+case indices, but costs O(resamples) instead of O(resamples x cases). For a
+paired comparison of two runs only the discordant cases move the difference:
+their count is Binomial(n, discordant/n) and, given that, the cases the second
+run fixed are Binomial(discordant, fixed/discordant).
+
+Groups with the same `(hits, total)` share one set of draws, which keeps
+per-skill intervals cheap on large skill sets (most skills have the same
+handful of example counts). NumPy's generator is used when installed;
+otherwise binomials are drawn by inverse-CDF lookup over a window of the
+distribution, using the stdlib only.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:  # optional; the stdlib sampler gives the same distribution
+    np = None
+
+
+class BinomialSampler:
+    """Draw Binomial(n, p) variates with one shared random source."""
+
+    def __init__(self, seed: int) -> None:
+        self.rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+        self._cdfs: dict[tuple[int, float], tuple[int, list[float]]] = {}
+
+    def _cdf(self, n: int, p: float) -> tuple[int, list[float]]:
+        key = (n, p)
+        cached = self._cdfs.get(key)
+        if cached is not None:
+            return cached
+        mean = n * p
+        spread = 12 * math.sqrt(n * p * (1 - p)) + 5  # mass outside is far below float precision
+        lo = max(0, int(mean - spread))
+        hi = min(n, int(mean + spread) + 1)
+        log_norm = math.lgamma(n + 1)
+        log_p, log_q = math.log(p), math.log1p(-p)
+        cdf: list[float] = []
+        total = 0.0
+        for k in range(lo, hi + 1):
+            total += math.exp(
+                log_norm - math.lgamma(k + 1) - math.lgamma(n - k + 1) + k * log_p + (n - k) * log_q
+            )
+            cdf.append(total)
+        cached = self._cdfs[key] = (lo, [c / total for c in cdf])
+        return cached
+
+    def draw(self, n: int, p: float, size: int) -> list[int]:
+        if np is not None:
+            return self.rng.binomial(n, p, size).tolist()
+        if n == 0 or p <= 0:
+            return [0] * size
+        if p >= 1:
+            return [n] * size
+        lo, cdf = self._cdf(n, p)
+        last = len(cdf) - 1
+        rand = self.rng.random
+        return [lo + min(bisect.bisect_left(cdf, rand()), last) for _ in range(size)]
+
+    def draw_conditional(self, totals: list[int], p: float) -> list[int]:
+        """One Binomial(t, p) draw for each `t` in `totals`."""
+        if np is not None:
+            return self.rng.binomial(np.asarray(totals), p).tolist()
+        return [self.draw(t, p, 1)[0] for t in totals]
+
+
+def _quantile(sorted_values: list[float], q: float) -> float:
+    """Inverted-CDF (nearest-rank) quantile of pre-sorted values."""
+    index = max(0, min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def proportion_intervals(
+    groups: list[tuple[int, int]], resamples: int, confidence: float, sampler: BinomialSampler
+) -> list[tuple[float, float] | None]:
+    """
+    Percentile bootstrap interval for each `(hits, total)` proportion.
+
+    With NumPy the distinct groups are drawn as one `(groups, resamples)` array
+    per block of groups. `None` marks empty groups.
+    """
+    alpha = (1 - confidence) / 2
+    distinct = sorted({g for g in groups if g[1] > 0})
+    bounds: dict[tuple[int, int], tuple[float, float]] = {}
+    if np is not None:
+        block = max(1, 4_000_000 // max(1, resamples))  # bound the draw array to ~32 MB
+        for start in range(0, len(distinct), block):
+            chunk = distinct[start : start + block]
+            totals = np.array([total for _, total in chunk])
+            rates = np.array([hits for hits, _ in chunk]) / totals
+            draws = sampler.rng.binomial(totals[:, None], rates[:, None], size=(len(chunk), resamples))
+            qs = np.quantile(draws, [alpha, 1 - alpha], axis=1, method="inverted_cdf") / totals
+            for j, group in enumerate(chunk):
+                bounds[group] = (float(qs[0, j]), float(qs[1, j]))
+    else:
+        for hits, total in distinct:
+            rates = sorted(k / total for k in sampler.draw(total, hits / total, resamples))
+            bounds[(hits, total)] = (_quantile(rates, alpha), _quantile(rates, 1 - alpha))
+    return [bounds.get(g) for g in groups]
+
+
+def paired_difference(
+    fixed: int, broken: int, total: int, resamples: int, confidence: float, sampler: BinomialSampler
+) -> dict[str, float]:
+    """
+    Bootstrap the rate difference (B - A) over `total` paired cases.
+
+    `fixed` cases succeed only in run B and `broken` only in run A. Returns the
+    observed difference, its percentile interval and a two-sided bootstrap
+    p-value (share of resampled differences on the far side of zero).
+    """
+    diff = (fixed - broken) / total if total else 0.0
+    discordant = fixed + broken
+    if not total or not discordant:
+        return {"diff": diff, "lo": 0.0, "hi": 0.0, "p_bootstrap": 1.0}
+    d_draws = sampler.draw(total, discordant / total, resamples)
+    fixed_draws = sampler.draw_conditional(d_draws, fixed / discordant)
+    diffs = sorted((2 * f - d) / total for f, d in zip(fixed_draws, d_draws))
+    alpha = (1 - confidence) / 2
+    below = bisect.bisect_right(diffs, 0.0)
+    above = resamples - bisect.bisect_left(diffs, 0.0)
+    return {
+        "diff": diff,
+        "lo": _quantile(diffs, alpha),
+        "hi": _quantile(diffs, 1 - alpha),
+        "p_bootstrap": min(1.0, 2 * min(below, above) / resamples),
+    }
+
+
+def mcnemar_exact(fixed: int, broken: int) -> float:
+    """
+    Exact two-sided McNemar p-value: a binomial test on the discordant pairs.
+
+    The lower tail is summed in floats from its largest term down, relative to
+    that term (taken in log space), and stops once the terms no longer count;
+    big-integer binomials took minutes at tens of thousands of pairs.
+    """
+    n = fixed + broken
+    if n == 0:
+        return 1.0
+    k = min(fixed, broken)
+    log_top = math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1) - n * math.log(2)
+    term = tail = 1.0
+    for i in range(k, 0, -1):
+        term *= i / (n - i + 1)  # C(n, i - 1) / C(n, i)
+        tail += term
+        if term < tail * 1e-17:
+            break
+    return min(1.0, 2 * math.exp(log_top + math.log(tail)))
@@ -0,0 +1,157 @@
+"""
+Skill-by-skill confusion counts for the trigger scorer.
+
+Skills are mapped to integer ids on first sight, and each confusion event is
+appended to a flat `array` as one integer code (`row << ID_BITS | col`).
+Events are folded into per-pair counts in bulk — `numpy.unique` when NumPy is
+installed, `collections.Counter` otherwise — so the per-case cost is an array
+append. Dense matrices are only materialized on request (CSV export, heatmap)
+and only over the skills that actually appear in a confusion.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections import Counter
+from typing import Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # optional; the Counter fold gives the same results
+    np = None
+
+
+ID_BITS = 24
+COL_MASK = (1 << ID_BITS) - 1
+
+
+class SkillIds:
+    """Stable skill name <-> integer id mapping shared by related matrices."""
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def id(self, name: str) -> int:
+        skill_id = self.ids.get(name)
+        if skill_id is None:
+            skill_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return skill_id
+
+
+def _fold_codes(codes: array) -> Iterator[tuple[int, int]]:
+    """Yield `(code, occurrences)` for an array of pair codes."""
+    if np is not None:
+        unique, counts = np.unique(np.frombuffer(codes, dtype=np.int64), return_counts=True)
+        yield from zip(unique.tolist(), counts.tolist())
+    else:
+        yield from Counter(codes).items()
+
+
+class ConfusionMatrix:
+    """
+    Sparse `expected x predicted` count matrix over a `SkillIds` mapping.
+
+    Rows are the case's skill (expected / near-miss source), columns the skill
+    that was wrongly (or additionally) predicted.
+    """
+
+    def __init__(self, skills: SkillIds) -> None:
+        self.skills = skills
+        self._counts: dict[int, int] = {}
+        self._added = array("q")
+        self._retracted = array("q")
+
+    def add(self, expected: str, predicted: str, count: int = 1) -> None:
+        """Add `count` (negative to retract) to the `(expected, predicted)` cell."""
+        self.add_row(expected, (predicted,), count)
+
+    def add_row(self, expected: str, predicted: Iterable[str], count: int = 1) -> None:
+        """Add `count` to `(expected, p)` for every `p` in `predicted` (one case's confusions)."""
+        skills = self.skills
+        ids = skills.ids
+        row = ids.get(expected)
+        if row is None:
+            row = skills.id(expected)
+        row <<= ID_BITS
+        if count == 1 or count == -1:
+            append = (self._added if count == 1 else self._retracted).append
+            for name in predicted:
+                col = ids.get(name)
+                append(row | (skills.id(name) if col is None else col))
+            return
+        counts = self._counts
+        for name in predicted:
+            code = row | skills.id(name)
+            counts[code] = counts.get(code, 0) + count
+
+    def _fold(self) -> dict[int, int]:
+        counts = self._counts
+        for events, sign in ((self._added, 1), (self._retracted, -1)):
+            if events:
+                for code, n in _fold_codes(events):
+                    counts[code] = counts.get(code, 0) + sign * n
+                del events[:]
+        return counts
+
+    def items(self) -> Iterator[tuple[tuple[str, str], int]]:
+        names = self.skills.names
+        for code, count in self._fold().items():
+            if count:
+                yield (names[code >> ID_BITS], names[code & COL_MASK]), count
+
+    def __bool__(self) -> bool:
+        return any(self._fold().values())
+
+    def top(self, k: int | None = None) -> list[tuple[tuple[str, str], int]]:
+        """Non-zero pairs by count (desc), then names; the first `k` only when given."""
+        ranked = ((-count, pair) for pair, count in self.items())
+        chosen = heapq.nsmallest(k, ranked) if k is not None else sorted(ranked)
+        return [(pair, -neg) for neg, pair in chosen]
+
+    def totals(self) -> tuple[dict[str, int], dict[str, int]]:
+        """Row sums (per expected skill) and column sums (per predicted skill)."""
+        row_sums: dict[str, int] = {}
+        col_sums: dict[str, int] = {}
+        for (expected, predicted), count in self.items():
+            row_sums[expected] = row_sums.get(expected, 0) + count
+            col_sums[predicted] = col_sums.get(predicted, 0) + count
+        return row_sums, col_sums
+
+    def rate_rows(self, left: str, right: str, k: int | None = None) -> list[dict[str, str | int]]:
+        """
+        Pair rows with `row_rate` (share of the expected skill's confusions going
+        to this skill) and `col_rate` (share of this skill's wrong triggers that
+        came from the expected skill).
+        """
+        row_sums, col_sums = self.totals()
+        return [
+            {
+                left: a,
+                right: b,
+                "count": count,
+                "row_rate": f"{count / row_sums[a]:.6f}",
+                "col_rate": f"{count / col_sums[b]:.6f}",
+            }
+            for (a, b), count in self.top(k)
+        ]
+
+    def dense(self) -> tuple[list[str], list[list[int]]]:
+        """Dense counts over the skills in any non-zero cell, rows and columns sorted by name."""
+        cells = list(self.items())
+        names = sorted({a for (a, _), _ in cells} | {b for (_, b), _ in cells})
+        index = {name: i for i, name in enumerate(names)}
+        rows = [[0] * len(names) for _ in names]
+        for (a, b), count in cells:
+            rows[index[a]][index[b]] = count
+        return names, rows
+
+    def load(self, triples: Iterable[Iterable]) -> None:
+        """Add `(expected, predicted, count)` triples, as produced from `items()`."""
+        for expected, predicted, count in triples:
+            self.add(expected, predicted, count)
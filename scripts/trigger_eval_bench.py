@@ -0,0 +1,909 @@
+#!/usr/bin/env python3
+"""
+Synthetic datasets and benchmarks for the trigger evaluation tooling.
+
+Builds synthetic skills trees (optionally with matching predictions at a chosen
+error rate) and times `trigger_examples_tool.py` / `trigger_eval_report.py`
+stages against them.
+
+Usage:
+  python3 scripts/trigger_eval_bench.py generate --out /tmp/synth --skills 5000 \
+    --predictions /tmp/synth/preds.jsonl --error-rate 0.1
+  python3 scripts/trigger_eval_bench.py suite --skills 5000 --json-out bench.json \
+    --baseline bench-baseline.json
+  python3 scripts/trigger_eval_bench.py parse --skills 2000 --jobs 1,2,4,8
+  python3 scripts/trigger_eval_bench.py catalog --skills 5000
+  python3 scripts/trigger_eval_bench.py keywords --skills 10000 --prompts 2000
+  python3 scripts/trigger_eval_bench.py cases --cases 1000000
+  python3 scripts/trigger_eval_bench.py codecs --cases 500000
+  python3 scripts/trigger_eval_bench.py confusion --events 2000000 --skills 5000
+  python3 scripts/trigger_eval_bench.py mcnemar --discordant 2000,10000,50000
+  python3 scripts/trigger_eval_bench.py results --runs 2000 --cases 5000
+  python3 scripts/trigger_eval_bench.py prediction-cache --prompts 100000 --edit-rate 0.02
+  python3 scripts/trigger_eval_bench.py worker --runs 5 --cases 2000 --mode keywords
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import json
+import math
+import os
+import platform
+import random
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import predictor_adapter_template as adapter
+import skill_catalog
+import trigger_confusion
+import trigger_examples_tool as tool
+from predictor_worker import WorkerClient
+from trigger_bootstrap import mcnemar_exact
+from trigger_keyword_engine import KeywordAutomaton
+from trigger_prediction_cache import MISS, PredictionCache
+from trigger_results_store import SKILL_METRICS, ResultsStore
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+GROUPS = ("plan", "review", "research", "growth", "tooling", "meta")
+EN_WORDS = (
+    "refactor", "latency", "review", "profile", "regression", "schema", "api",
+    "flaky", "retro", "contract", "diff", "cache", "deploy", "incident", "trace",
+)
+ZH_WORDS = ("重构", "性能", "复盘", "接口", "测试", "排查", "读代码", "画像", "边界", "幂等")
+
+
+def synthetic_keywords(n: int, rng: random.Random) -> list[str]:
+    """Per-skill trigger keywords: a unique English tag, a unique CJK tag and shared words."""
+    return [
+        f"{EN_WORDS[n % len(EN_WORDS)]} {n:05d}",
+        f"{ZH_WORDS[n % len(ZH_WORDS)]}{n:05d}号",
+        *rng.sample(EN_WORDS, 2),
+    ]
+
+
+NON_MANUAL_CATEGORIES = ("cron", "auto", "global")
+EN_TEMPLATES = (
+    "Can you help with {kw} for {a} and {b}?",
+    "I need a {kw} pass on the {a} change before {b}.",
+    "Please run {kw} on this {a}; it keeps hitting {b}.",
+)
+ZH_TEMPLATES = ("帮我做一下{kw}，重点看{a}和{b}。", "这个{a}需要{kw}，顺便检查{b}。", "请针对{a}做{kw}。")
+NEAR_MISS_TEMPLATES = (
+    "What does {a} mean? (Definition question, not {kw})",
+    "解释一下{a}和{b}的区别。(Concept question, not a task)",
+    "Tell me a joke about {a}. (Generic chat)",
+)
+
+
+def synthetic_skill_path(skills_dir: Path, n: int, non_manual_every: int) -> tuple[Path, str]:
+    """Return `(skill_dir, category)`; every `non_manual_every`-th skill is cron/auto/global."""
+    skill_id = f"synthetic-{n:05d}"
+    if non_manual_every and n % non_manual_every == non_manual_every - 1:
+        category = NON_MANUAL_CATEGORIES[n % len(NON_MANUAL_CATEGORIES)]
+        return skills_dir / category / skill_id, category
+    return skills_dir / "manual" / GROUPS[n % len(GROUPS)] / skill_id, "manual"
+
+
+def make_synthetic_tree(
+    dest: Path,
+    skills: int,
+    examples_per_section: int,
+    seed: int = 0,
+    non_manual_every: int = 0,
+) -> Path:
+    """
+    Write a synthetic skills tree under `dest/skills` and return that directory.
+
+    Layout mirrors the real repo: `SKILL.md` front matter, a `skill.yaml` with
+    `triggers.keywords`, and `references/trigger-examples.md` with Chinese,
+    English and near-miss sections whose prompts mix both languages.
+    """
+    rng = random.Random(seed)
+    skills_dir = dest / "skills"
+    for n in range(skills):
+        skill_id = f"synthetic-{n:05d}"
+        keywords = synthetic_keywords(n, rng)
+        skill_dir, category = synthetic_skill_path(skills_dir, n, non_manual_every)
+        (skill_dir / "references").mkdir(parents=True, exist_ok=True)
+        (skill_dir / "SKILL.md").write_text(
+            f"---\nname: {skill_id}\ndescription: Use when working on {keywords[0]}\n---\n\n"
+            f"# {skill_id}\n\n## When to Use\n- {keywords[0]}\n- {keywords[1]}\n",
+            encoding="utf-8",
+        )
+        category_line = "" if category == "manual" else f"category: {category}\n"
+        (skill_dir / "skill.yaml").write_text(
+            f"id: {skill_id}\nversion: 1.0.0\ntitle: Synthetic {n}\n"
+            f"summary: Use when working on {keywords[0]}\nkind: prompt_only\n{category_line}"
+            "tags:\n  - synthetic\n"
+            "triggers:\n  keywords:\n" + "".join(f"    - {k}\n" for k in keywords),
+            encoding="utf-8",
+        )
+        lines = [f"# Trigger Examples\n\nUse these examples to test whether the `{skill_id}` skill triggers correctly.\n"]
+        for title, templates, kw in (
+            ("Positive (Chinese)", ZH_TEMPLATES, keywords[1]),
+            ("Positive (English)", EN_TEMPLATES, keywords[0]),
+            ("Negative / Near Miss", NEAR_MISS_TEMPLATES, keywords[2]),
+        ):
+            lines.append(f"\n## {title}\n\n")
+            for _ in range(examples_per_section):
+                a, b = rng.sample(EN_WORDS + ZH_WORDS, 2)
+                lines.append("- " + rng.choice(templates).format(kw=kw, a=a, b=b) + "\n")
+        (skill_dir / "references" / "trigger-examples.md").write_text("".join(lines), encoding="utf-8")
+    return skills_dir
+
+
+def write_synthetic_predictions(
+    cases: list, out_path: Path, error_rate: float, seed: int = 0
+) -> int:
+    """
+    Write predictions for `cases` that are perfect except for `error_rate` of rows.
+
+    An erroneous positive predicts a different skill; an erroneous negative
+    falsely triggers its own skill. Returns the number of injected errors.
+    """
+    rng = random.Random(seed)
+    skills = sorted({c.skill for c in cases})
+    errors = 0
+    with out_path.open("w", encoding="utf-8") as f:
+        for c in cases:
+            wrong = rng.random() < error_rate
+            if c.polarity == "positive":
+                predicted = [rng.choice(skills)] if wrong else [c.skill]
+            else:
+                predicted = [c.skill] if wrong else []
+            errors += wrong
+            f.write(json.dumps({"id": c.id, "predicted": predicted}, ensure_ascii=False) + "\n")
+    return errors
+
+
+def parse_jobs_list(value: str) -> list[int]:
+    return [max(1, int(part)) for part in value.split(",") if part.strip()]
+
+
+def cmd_parse(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory(prefix="trigger-bench-") as tmp:
+        skills_dir = make_synthetic_tree(Path(tmp), args.skills, args.examples, args.seed)
+        print(f"cpus={os.cpu_count()} skills={args.skills} examples/section={args.examples}")
+        print("jobs\tbest_s\tcases\tspeedup")
+        baseline = None
+        for jobs in parse_jobs_list(args.jobs):
+            timings = []
+            cases = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                cases, _, _ = tool.load_all_cases(skills_dir, include_non_manual=True, jobs=jobs)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            baseline = baseline or best
+            print(f"{jobs}\t{best:.3f}\t{len(cases)}\t{baseline / best:.2f}x")
+    return 0
+
+
+def cmd_catalog(args: argparse.Namespace) -> int:
+    """Skill discovery + categories: rglob and per-key skill.yaml scans (before) vs the scandir catalog."""
+    with tempfile.TemporaryDirectory(prefix="trigger-bench-") as tmp:
+        skills_dir = make_synthetic_tree(Path(tmp), args.skills, 1, args.seed, args.non_manual_every)
+        for n, skill_dir in enumerate(skill_catalog.find_skill_dirs(skills_dir)):
+            # Real skills carry agents/ and extra reference files the old rglob walked through.
+            (skill_dir / "agents").mkdir()
+            for i in range(args.extra_files):
+                (skill_dir / "agents" / f"agent-{i}.yaml").write_text(f"name: agent-{n}-{i}\n", encoding="utf-8")
+
+        def scalar(yaml_path: Path, key: str) -> str | None:
+            for raw in yaml_path.read_text(encoding="utf-8").splitlines():
+                line = raw.strip()
+                if line.startswith(f"{key}:"):
+                    return line.split(":", 1)[1].strip()
+            return None
+
+        def before() -> int:
+            found = 0
+            for skill_file in sorted(skills_dir.rglob("SKILL.md")):
+                yaml_path = skill_file.parent.resolve() / "skill.yaml"
+                found += bool(scalar(yaml_path, "category") or scalar(yaml_path, "activation") or "manual")
+            return found
+
+        cache_path = Path(tmp) / "catalog.json"
+        runs = [
+            ("rglob + per-key reads (before)", before),
+            ("catalog (no cache)", lambda: len(skill_catalog.SkillCatalog(skills_dir).load())),
+            ("catalog (cold cache)", lambda: len(skill_catalog.SkillCatalog(skills_dir, cache_path).load())),
+            ("catalog (warm cache)", lambda: len(skill_catalog.SkillCatalog(skills_dir, cache_path).load())),
+        ]
+        print(f"skills={args.skills} extra_files/skill={args.extra_files}")
+        print("method\tbest_s\tskills")
+        for label, run in runs:
+            timings = []
+            for _ in range(args.repeat if "cold" not in label else 1):
+                if "cold" in label:
+                    cache_path.unlink(missing_ok=True)
+                start = time.perf_counter()
+                found = run()
+                timings.append(time.perf_counter() - start)
+            print(f"{label}\t{min(timings):.3f}\t{found}")
+    return 0
+
+
+def cmd_keywords(args: argparse.Namespace) -> int:
+    rng = random.Random(args.seed)
+    skill_keywords = {
+        f"synthetic-{n:05d}": synthetic_keywords(n, rng) for n in range(args.skills)
+    }
+    prompts = []
+    for _ in range(args.prompts):
+        words = rng.choices(EN_WORDS + ZH_WORDS, k=12)
+        # Mention one skill's tag in most prompts so both engines report real hits.
+        target = rng.randrange(args.skills)
+        words.insert(rng.randrange(len(words)), skill_keywords[f"synthetic-{target:05d}"][rng.randrange(2)])
+        prompts.append(" ".join(words))
+
+    def per_skill_scan(prompt: str) -> list[str]:
+        # Shape of the keyword-demo rules: one any() scan per skill over its keywords.
+        p = prompt.lower()
+        return [skill for skill, kws in skill_keywords.items() if any(k.lower() in p for k in kws)]
+
+    start = time.perf_counter()
+    automaton = KeywordAutomaton.build(skill_keywords)
+    build_s = time.perf_counter() - start
+
+    results = {}
+    for name, fn in (
+        ("per-skill scan", per_skill_scan),
+        ("automaton", automaton.match),
+        ("keyword-demo (8 fixed rules)", lambda p: adapter.predict_case({"prompt": p})),
+    ):
+        start = time.perf_counter()
+        results[name] = [fn(p) for p in prompts]
+        elapsed = time.perf_counter() - start
+        print(f"{name}\t{elapsed:.3f}s\t{len(prompts) / elapsed:.0f} prompts/s")
+
+    agree = all(
+        sorted(a) == sorted(b) for a, b in zip(results["per-skill scan"], results["automaton"])
+    )
+    print(
+        f"skills={args.skills} keywords={sum(map(len, skill_keywords.values()))} "
+        f"states={len(automaton.goto)} build={build_s:.3f}s automaton_matches_scan={agree}"
+    )
+    return 0 if agree else 1
+
+
+@dataclasses.dataclass
+class LegacyCase:
+    """The pre-slots `Case` layout, kept here only as the benchmark baseline."""
+
+    id: str
+    skill: str
+    prompt: str
+    polarity: str
+    language: str
+    source: str
+
+
+def synthetic_case_rows(count: int, skills: int, seed: int) -> list[str]:
+    """JSON-encoded case rows, so every decode yields fresh (un-shared) strings like an index load."""
+    rng = random.Random(seed)
+    rows = []
+    for n in range(count):
+        skill = f"synthetic-{n % skills:05d}"
+        polarity, language = rng.choice((("positive", "zh"), ("positive", "en"), ("negative", "mixed")))
+        rows.append(
+            json.dumps(
+                [
+                    f"{skill}:{polarity}:{language}:{n}",
+                    skill,
+                    " ".join(rng.choices(EN_WORDS + ZH_WORDS, k=10)),
+                    polarity,
+                    language,
+                    f"skills/manual/plan/{skill}/references/trigger-examples.md",
+                ],
+                ensure_ascii=False,
+            )
+        )
+    return rows
+
+
+def measure(build) -> tuple[object, float, int]:
+    """Return `(result, seconds, bytes_retained)` for a builder function."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, retained
+
+
+def cmd_cases(args: argparse.Namespace) -> int:
+    rows = synthetic_case_rows(args.cases, args.skills, args.seed)
+    print(f"cases={args.cases} skills={args.skills}")
+    print("layout\tbuild_s\tretained_MB\texport_s")
+
+    def export_legacy(cases: list) -> float:
+        start = time.perf_counter()
+        with open(os.devnull, "w", encoding="utf-8") as f:
+            for c in cases:
+                rec = dataclasses.asdict(c)
+                rec["expected_trigger"] = c.polarity == "positive"
+                rec["expected_skill"] = c.skill
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        return time.perf_counter() - start
+
+    def export_compact(cases: list) -> float:
+        start = time.perf_counter()
+        with open(os.devnull, "w", encoding="utf-8") as f:
+            f.writelines(tool.case_to_jsonl(c) + "\n" for c in cases)
+        return time.perf_counter() - start
+
+    for name, build, export in (
+        ("dataclass (before)", lambda: [LegacyCase(*json.loads(r)) for r in rows], export_legacy),
+        ("slots+interned (after)", lambda: [tool.Case.from_row(json.loads(r)) for r in rows], export_compact),
+    ):
+        cases, build_s, retained = measure(build)
+        export_s = export(cases)
+        print(f"{name}\t{build_s:.2f}\t{retained / 1e6:.1f}\t{export_s:.2f}")
+        del cases
+    return 0
+
+
+def cmd_codecs(args: argparse.Namespace) -> int:
+    """Export cases and read predictions through each codec `open_text` picks by extension."""
+    cases = [tool.Case.from_row(json.loads(r)) for r in synthetic_case_rows(args.cases, args.skills, args.seed)]
+    print(f"cases={args.cases}")
+    print("codec\tsize_MB\tratio\texport_s\texport_MB/s\tscore_read_s\tread_MB/s")
+    with tempfile.TemporaryDirectory(prefix="trigger-codecs-") as tmp:
+        work = Path(tmp)
+        plain_bytes = 0
+        for codec, suffix in (("none", ".jsonl"), ("gzip", ".jsonl.gz"), ("xz", ".jsonl.xz")):
+            cases_path = work / f"cases{suffix}"
+            start = time.perf_counter()
+            with tool.open_text(cases_path, "w") as f:
+                f.writelines(tool.case_to_jsonl(c) + "\n" for c in cases)
+            export_s = time.perf_counter() - start
+
+            preds_path = work / f"preds{suffix}"
+            with tool.open_text(preds_path, "w") as f:
+                for c in cases:
+                    f.write(json.dumps({"id": c.id, "predicted": [c.skill], "latency_ms": 1.5}) + "\n")
+            start = time.perf_counter()
+            rows = sum(1 for _ in tool.iter_predictions(preds_path))
+            read_s = time.perf_counter() - start
+            assert rows == len(cases)
+
+            size = cases_path.stat().st_size
+            if codec == "none":
+                plain_bytes = size
+                plain_preds = preds_path.stat().st_size
+            print(
+                f"{codec}\t{size / 1e6:.1f}\t{plain_bytes / size:.1f}x\t{export_s:.2f}\t"
+                f"{plain_bytes / 1e6 / export_s:.0f}\t{read_s:.2f}\t{plain_preds / 1e6 / read_s:.0f}"
+            )
+    print("(MB/s are over uncompressed bytes; score_read_s parses every predictions row)")
+    return 0
+
+
+def cmd_confusion(args: argparse.Namespace) -> int:
+    """Tuple-keyed dict counting (before) vs the integer-coded confusion engine, plus top-k."""
+    rng = random.Random(args.seed)
+    skills = [f"synthetic-{n:05d}" for n in range(args.skills)]
+    # One or two wrong skills per case, concentrated on neighbouring skills as real confusions are.
+    cases = []
+    produced = 0
+    while produced < args.events:
+        i = rng.randrange(args.skills)
+        wrong = {skills[(i + rng.randrange(1, 8)) % args.skills] for _ in range(rng.choice((1, 1, 2)))}
+        cases.append((skills[i], wrong))
+        produced += len(wrong)
+    print(f"events={produced} cases={len(cases)} skills={args.skills} numpy={'yes' if trigger_confusion.np else 'no'}")
+    print("engine\tadd_s\ttop_s\tpairs")
+
+    start = time.perf_counter()
+    pairs: dict[tuple[str, str], int] = {}
+    for expected, wrong in cases:
+        for other in sorted(wrong):
+            key = (expected, other)
+            pairs[key] = pairs.get(key, 0) + 1
+    add_s = time.perf_counter() - start
+    start = time.perf_counter()
+    sorted(pairs.items(), key=lambda kv: (-kv[1], kv[0][0], kv[0][1]))[: args.top]
+    print(f"dict (before)\t{add_s:.2f}\t{time.perf_counter() - start:.2f}\t{len(pairs)}")
+
+    for label, backend in (("coded+numpy", trigger_confusion.np), ("coded+Counter", None)):
+        if label.endswith("numpy") and backend is None:
+            continue
+        saved, trigger_confusion.np = trigger_confusion.np, backend
+        try:
+            start = time.perf_counter()
+            matrix = trigger_confusion.ConfusionMatrix(trigger_confusion.SkillIds())
+            for expected, wrong in cases:
+                matrix.add_row(expected, wrong)
+            add_s = time.perf_counter() - start
+            start = time.perf_counter()
+            matrix.top(args.top)
+            print(f"{label}\t{add_s:.2f}\t{time.perf_counter() - start:.2f}\t{sum(1 for _ in matrix.items())}")
+        finally:
+            trigger_confusion.np = saved
+    return 0
+
+
+def mcnemar_bigint(fixed: int, broken: int) -> float:
+    """The exact McNemar p-value over big-integer binomials (before)."""
+    n = fixed + broken
+    if n == 0:
+        return 1.0
+    return min(1.0, 2 * sum(math.comb(n, i) for i in range(min(fixed, broken) + 1)) / 2**n)
+
+
+def cmd_mcnemar(args: argparse.Namespace) -> int:
+    """
+    Paired-run p-values at large discordant counts: float tail sum vs big-integer
+    binomials (before, only up to --reference-max). Exits 1 when a call takes
+    longer than --max-seconds or drifts from the reference.
+    """
+    failures = 0
+    print("fixed\tbroken\tp\tfloat_s\tbigint_s\trel_err")
+    for n in (int(part) for part in args.discordant.split(",") if part.strip()):
+        for fixed, broken in ((n, n), (n, n + n // 50), (n // 100, n)):
+            start = time.perf_counter()
+            p = mcnemar_exact(fixed, broken)
+            float_s = time.perf_counter() - start
+            bigint_s = rel_err = "-"
+            if fixed + broken <= args.reference_max:
+                start = time.perf_counter()
+                reference = mcnemar_bigint(fixed, broken)
+                bigint_s = f"{time.perf_counter() - start:.4f}"
+                error = abs(p - reference) / reference if reference > 1e-300 else abs(p - reference)
+                rel_err = f"{error:.1e}"
+                failures += error > 1e-9
+            failures += float_s > args.max_seconds
+            print(f"{fixed}\t{broken}\t{p:.4g}\t{float_s:.4f}\t{bigint_s}\t{rel_err}")
+    if failures:
+        print(f"{failures} checks over --max-seconds {args.max_seconds} or off the reference", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def cmd_results(args: argparse.Namespace) -> int:
+    """Append synthetic runs to a results database, then time the trend-mode queries."""
+    rng = random.Random(args.seed)
+    per_skill = max(2, args.cases // args.skills)
+    cases = []
+    for s in range(args.skills):
+        for j in range(per_skill):
+            polarity = "positive" if j % 3 else "negative"
+            cases.append((f"synthetic-{s:05d}:{polarity}:en:{j}", f"synthetic-{s:05d}", polarity))
+    skills = sorted({skill for _, skill, _ in cases})
+    failed = {"positive": "MISS", "negative": "FALSE_TRIGGER"}
+    passed = {"positive": "HIT", "negative": "REJECT"}
+    with tempfile.TemporaryDirectory(prefix="trigger-bench-") as tmp:
+        store = ResultsStore(Path(tmp) / "results.sqlite")
+        print(f"runs={args.runs} cases={len(cases)} skills={len(skills)}")
+        record_s = 0.0
+        for run in range(args.runs):
+            outcomes = [
+                (case_id, skill, polarity, (failed if rng.random() < args.error_rate else passed)[polarity])
+                for case_id, skill, polarity in cases
+            ]
+            metrics = [{"skill": skill, **{key: 0 for key in SKILL_METRICS}} for skill in skills]
+            start = time.perf_counter()
+            store.record_run(f"run-{run}", "bench", {"positive_recall": 1 - args.error_rate}, metrics, outcomes)
+            record_s += time.perf_counter() - start
+        size_mb = (Path(tmp) / "results.sqlite").stat().st_size / 1e6
+        print(f"record_run\t{record_s / args.runs * 1000:.1f} ms/run\t{size_mb:.1f} MB")
+        latest = args.runs
+        queries = [
+            ("runs (last 100)", lambda: store.runs(100)),
+            (f"runs (all {args.runs})", lambda: store.runs()),
+            ("skill series (all runs)", lambda: store.skill_series(skills[len(skills) // 2], 1, latest)),
+            ("skill metrics (one run)", lambda: store.skill_metrics(latest)),
+            ("regressions (latest vs previous)", lambda: store.regressions(latest - 1, latest, 1000)),
+            ("regressions (latest vs first)", lambda: store.regressions(1, latest, 1000)),
+        ]
+        print("query\tms")
+        for label, query in queries:
+            start = time.perf_counter()
+            query()
+            print(f"{label}\t{(time.perf_counter() - start) * 1000:.1f}")
+        store.close()
+    return 0
+
+
+def cmd_prediction_cache(args: argparse.Namespace) -> int:
+    """Cold and warm passes through the prediction cache, a run with edited prompts, and eviction."""
+    rng = random.Random(args.seed)
+    prompts = [
+        f"{rng.choice(EN_WORDS)} {rng.choice(ZH_WORDS)} prompt {i} {rng.choice(EN_WORDS)}" for i in range(args.prompts)
+    ]
+    edited = [f"{p} (edited)" if rng.random() < args.edit_rate else p for p in prompts]
+    predictions = [[f"synthetic-{i % 5000:05d}"] for i in range(args.prompts)]
+
+    def run(path: Path, batch: list[str], max_entries: int) -> tuple[float, dict[str, int]]:
+        start = time.perf_counter()
+        with PredictionCache(path, "bench", "v1", max_entries) as cache:
+            for i in range(0, len(batch), args.batch_size):
+                chunk = batch[i : i + args.batch_size]
+                found = cache.get_many(chunk)
+                todo = [j for j, value in enumerate(found) if value is MISS]
+                cache.put_many([chunk[j] for j in todo], [predictions[(i + j) % len(predictions)] for j in todo])
+            return time.perf_counter() - start, cache.stats
+
+    with tempfile.TemporaryDirectory(prefix="trigger-bench-") as tmp:
+        path = Path(tmp) / "predictions.sqlite"
+        print(f"prompts={args.prompts} batch_size={args.batch_size}")
+        print("pass	seconds	hits	stored	evicted")
+        for label, batch, cap in [
+            ("cold", prompts, args.prompts * 2),
+            ("warm", prompts, args.prompts * 2),
+            (f"edited ({args.edit_rate:.0%})", edited, args.prompts * 2),
+            ("over cap (half)", prompts, args.prompts // 2),
+        ]:
+            seconds, stats = run(path, batch, cap)
+            print(f"{label}\t{seconds:.2f}\t{stats['hits']}\t{stats['stored']}\t{stats['evicted']}")
+        print(f"cache file\t{path.stat().st_size / 1e6:.1f} MB")
+    return 0
+
+
+def cmd_worker(args: argparse.Namespace) -> int:
+    """
+    Successive eval runs against the adapter: a fresh `--input/--output`
+    process per run, a `--serve` worker spawned per run, and one warm socket
+    worker shared by every run (pipelined, then one request at a time).
+    """
+    rows = [json.loads(line) for line in synthetic_case_rows(args.cases, args.skills, args.seed)]
+    cases = [dict(zip(("id", "skill", "prompt", "polarity", "language", "source"), row)) for row in rows]
+    batches = [cases[i : i + args.batch_size] for i in range(0, len(cases), args.batch_size)]
+    adapter_cmd = [sys.executable, str(SCRIPTS_DIR / "predictor_adapter_template.py"), "--mode", args.mode]
+
+    def files_run(tmp: Path) -> None:
+        cases_path, preds_path = tmp / "cases.jsonl", tmp / "predictions.jsonl"
+        cases_path.write_text("".join(json.dumps(c, ensure_ascii=False) + "\n" for c in cases), encoding="utf-8")
+        subprocess.run(
+            [*adapter_cmd, "--input", str(cases_path), "--output", str(preds_path)],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        with preds_path.open(encoding="utf-8") as f:
+            for _ in f:
+                pass
+
+    def client_run(connect, window: int) -> None:
+        with connect(window) as client:
+            for _ in client.map_batches(batches):
+                pass
+
+    def timed(run) -> list[float]:
+        times = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        return times
+
+    spawn = " ".join(shlex.quote(part) for part in adapter_cmd) + " --serve"
+    with tempfile.TemporaryDirectory(prefix="trigger-bench-") as tmp:
+        sock = Path(tmp) / "worker.sock"
+        server = subprocess.Popen([*adapter_cmd, "--serve", "--socket", str(sock)], stderr=subprocess.DEVNULL)
+        try:
+            while not sock.exists():
+                if server.poll() is not None:
+                    raise SystemExit("Socket worker failed to start")
+                time.sleep(0.05)
+            results = [
+                ("adapter per run (files)", timed(lambda: files_run(Path(tmp)))),
+                (
+                    "worker spawned per run",
+                    timed(lambda: client_run(lambda w: WorkerClient(command=spawn, window=w), args.window)),
+                ),
+                (
+                    f"warm socket worker (window {args.window})",
+                    timed(lambda: client_run(lambda w: WorkerClient(socket_path=sock, window=w), args.window)),
+                ),
+                (
+                    "warm socket worker (window 1)",
+                    timed(lambda: client_run(lambda w: WorkerClient(socket_path=sock, window=w), 1)),
+                ),
+            ]
+        finally:
+            with WorkerClient(socket_path=sock) as client:
+                client.request("shutdown")
+            server.wait()
+
+    print(f"runs={args.runs} cases={args.cases} batch_size={args.batch_size} mode={args.mode}")
+    print("setup\tfirst_run_s\tmean_run_s\tcases_per_s")
+    for label, times in results:
+        mean = sum(times) / len(times)
+        print(f"{label}\t{times[0]:.3f}\t{mean:.3f}\t{args.cases / mean if mean else 0:.0f}")
+    return 0
+
+
+def cmd_generate(args: argparse.Namespace) -> int:
+    dest = Path(args.out)
+    skills_dir = make_synthetic_tree(
+        dest, args.skills, args.examples, args.seed, args.non_manual_every
+    )
+    print(f"Wrote {args.skills} synthetic skills to {skills_dir}")
+    if args.predictions:
+        cases, _, _ = tool.load_all_cases(skills_dir, include_non_manual=args.include_non_manual)
+        pred_path = Path(args.predictions)
+        pred_path.parent.mkdir(parents=True, exist_ok=True)
+        errors = write_synthetic_predictions(cases, pred_path, args.error_rate, args.seed)
+        print(f"Wrote {len(cases)} predictions ({errors} injected errors) to {pred_path}")
+    return 0
+
+
+def run_stage(cmd: list[str], log_path: Path) -> dict[str, float]:
+    """Run one stage as a child process; return wall seconds and the child's peak RSS."""
+    start = time.perf_counter()
+    with log_path.open("w", encoding="utf-8") as log:
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=log)
+        _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    exit_code = os.waitstatus_to_exitcode(status)
+    if exit_code not in (0, 2):  # score exits 2 on misses with --fail-on-miss only
+        raise SystemExit(f"Stage failed ({exit_code}): {' '.join(cmd)}\n{log_path.read_text()}")
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    rss_bytes = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return {"seconds": round(elapsed, 4), "max_rss_mb": round(rss_bytes / 1e6, 1)}
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return regressions where a stage got slower or bigger than baseline * (1 + tolerance)."""
+    regressions = []
+    if baseline.get("config") != results["config"]:
+        print("Warning: baseline was recorded with a different config", file=sys.stderr)
+    print("\nstage\tmetric\tbaseline\tcurrent\tratio")
+    for stage, metrics in results["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base:
+            continue
+        for metric, value in metrics.items():
+            ref = base.get(metric)
+            if not ref:
+                continue
+            ratio = value / ref
+            flag = "  REGRESSION" if ratio > 1 + tolerance else ""
+            print(f"{stage}\t{metric}\t{ref}\t{value}\t{ratio:.2f}x{flag}")
+            if flag:
+                regressions.append(f"{stage}.{metric}: {ref} -> {value} ({ratio:.2f}x)")
+    return regressions
+
+
+def cmd_suite(args: argparse.Namespace) -> int:
+    tool_py = [sys.executable, str(SCRIPTS_DIR / "trigger_examples_tool.py")]
+    report_py = [sys.executable, str(SCRIPTS_DIR / "trigger_eval_report.py")]
+    config = {
+        "skills": args.skills,
+        "examples": args.examples,
+        "error_rate": args.error_rate,
+        "seed": args.seed,
+    }
+    with tempfile.TemporaryDirectory(prefix="trigger-suite-") as tmp:
+        work = Path(tmp)
+        skills_dir = work / "skills"
+        preds = work / "preds.jsonl"
+        # Generate in a child process: Linux carries the parent's peak RSS into
+        # forked children, so the bench process itself must stay small.
+        subprocess.run(
+            [
+                sys.executable, str(Path(__file__).resolve()), "generate",
+                "--out", str(work), "--skills", str(args.skills), "--examples", str(args.examples),
+                "--predictions", str(preds), "--error-rate", str(args.error_rate),
+                "--seed", str(args.seed),
+            ],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        with preds.open("rb") as f:
+            config["cases"] = sum(1 for _ in f)
+
+        base = [*tool_py, "--skills-dir", str(skills_dir)]
+        stages = {
+            "python_startup": [sys.executable, "-c", "pass"],
+            "load_all_cases": [*base, "summary"],
+            "export": [*base, "export", "--out", str(work / "cases.jsonl")],
+            "score": [
+                *base, "score", "--predictions", str(preds), "--confusion", "--csv-out", str(work / "csv"),
+            ],
+            "score_stream": [
+                *base, "score", "--predictions", str(preds), "--stream", "--csv-out", str(work / "csv-stream"),
+            ],
+            "html_report": [
+                *report_py, "--csv-dir", str(work / "csv"), "--out", str(work / "report.html"),
+            ],
+        }
+        results = {
+            "config": config,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "stages": {},
+        }
+        print(f"skills={args.skills} cases={config['cases']} error_rate={args.error_rate}")
+        print("stage\tseconds\tmax_rss_mb")
+        for name, cmd in stages.items():
+            runs = [run_stage(cmd, work / f"{name}.log") for _ in range(args.repeat)]
+            best = {
+                "seconds": min(r["seconds"] for r in runs),
+                "max_rss_mb": min(r["max_rss_mb"] for r in runs),
+            }
+            results["stages"][name] = best
+            print(f"{name}\t{best['seconds']:.3f}\t{best['max_rss_mb']:.1f}")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote results to {args.json_out}")
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline to {args.save_baseline}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:\n- " + "\n- ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark trigger evaluation tooling.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_generate = sub.add_parser("generate", help="Write a synthetic skills tree (and predictions)")
+    p_generate.add_argument("--out", required=True, help="Destination directory (skills/ is created inside)")
+    p_generate.add_argument("--skills", type=int, default=1000, help="Synthetic skill count (default: 1000)")
+    p_generate.add_argument(
+        "--examples", type=int, default=8, help="Examples per section per skill (default: 8)"
+    )
+    p_generate.add_argument(
+        "--non-manual-every",
+        type=int,
+        default=25,
+        help="Make every Nth skill cron/auto/global (default: 25; 0 disables)",
+    )
+    p_generate.add_argument("--predictions", help="Also write predictions JSONL for the generated cases")
+    p_generate.add_argument(
+        "--error-rate", type=float, default=0.1, help="Fraction of wrong predictions (default: 0.1)"
+    )
+    p_generate.add_argument(
+        "--include-non-manual", action="store_true", help="Predict non-manual skill cases too"
+    )
+    p_generate.add_argument("--seed", type=int, default=0, help="Random seed for synthetic content")
+    p_generate.set_defaults(func=cmd_generate)
+
+    p_suite = sub.add_parser(
+        "suite", help="Time and memory-profile load/export/score/report on a synthetic tree"
+    )
+    p_suite.add_argument("--skills", type=int, default=2000, help="Synthetic skill count (default: 2000)")
+    p_suite.add_argument(
+        "--examples", type=int, default=8, help="Examples per section per skill (default: 8)"
+    )
+    p_suite.add_argument(
+        "--error-rate", type=float, default=0.1, help="Fraction of wrong predictions (default: 0.1)"
+    )
+    p_suite.add_argument("--repeat", type=int, default=1, help="Runs per stage; best is kept")
+    p_suite.add_argument("--seed", type=int, default=0, help="Random seed for synthetic content")
+    p_suite.add_argument("--json-out", help="Write machine-readable results to this path")
+    p_suite.add_argument("--baseline", help="Compare against a stored results JSON; exit 1 on regression")
+    p_suite.add_argument("--save-baseline", help="Store these results as a baseline JSON")
+    p_suite.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown/growth ratio over baseline before failing (default: 0.25)",
+    )
+    p_suite.set_defaults(func=cmd_suite)
+
+    p_parse = sub.add_parser("parse", help="Time load_all_cases across --jobs values")
+    p_parse.add_argument("--skills", type=int, default=2000, help="Synthetic skill count (default: 2000)")
+    p_parse.add_argument(
+        "--examples", type=int, default=8, help="Examples per section per skill (default: 8)"
+    )
+    p_parse.add_argument("--jobs", default="1,2,4,8", help="Comma-separated job counts (default: 1,2,4,8)")
+    p_parse.add_argument("--repeat", type=int, default=3, help="Runs per job count; best is kept")
+    p_parse.add_argument("--seed", type=int, default=0, help="Random seed for synthetic content")
+    p_parse.set_defaults(func=cmd_parse)
+
+    p_catalog = sub.add_parser("catalog", help="Skill discovery and categories: rglob walk vs the scandir catalog")
+    p_catalog.add_argument("--skills", type=int, default=5000, help="Synthetic skill count (default: 5000)")
+    p_catalog.add_argument("--extra-files", type=int, default=3, help="agents/ files per skill (default: 3)")
+    p_catalog.add_argument("--non-manual-every", type=int, default=10, help="Every Nth skill is non-manual (default: 10)")
+    p_catalog.add_argument("--repeat", type=int, default=3, help="Timed repetitions; the best is reported (default: 3)")
+    p_catalog.add_argument("--seed", type=int, default=0, help="Random seed for synthetic content")
+    p_catalog.set_defaults(func=cmd_catalog)
+
+    p_keywords = sub.add_parser(
+        "keywords", help="Compare per-skill keyword scans with the compiled automaton"
+    )
+    p_keywords.add_argument("--skills", type=int, default=10000, help="Synthetic skill count (default: 10000)")
+    p_keywords.add_argument("--prompts", type=int, default=2000, help="Prompts to match (default: 2000)")
+    p_keywords.add_argument("--seed", type=int, default=0, help="Random seed for synthetic content")
+    p_keywords.set_defaults(func=cmd_keywords)
+
+    p_cases = sub.add_parser("cases", help="Memory/time of Case storage and export serialization")
+    p_cases.add_argument("--cases", type=int, default=1_000_000, help="Case count (default: 1000000)")
+    p_cases.add_argument("--skills", type=int, default=5000, help="Distinct skills (default: 5000)")
+    p_cases.add_argument("--seed", type=int, default=0, help="Random seed for synthetic content")
+    p_cases.set_defaults(func=cmd_cases)
+
+    p_confusion = sub.add_parser("confusion", help="Confusion counting and top-k: dict vs integer-coded engine")
+    p_confusion.add_argument("--events", type=int, default=1_000_000, help="Confusion events (default: 1000000)")
+    p_confusion.add_argument("--skills", type=int, default=5000, help="Distinct skills (default: 5000)")
+    p_confusion.add_argument("--top", type=int, default=20, help="Pairs to rank (default: 20)")
+    p_confusion.add_argument("--seed", type=int, default=0, help="Random seed for synthetic content")
+    p_confusion.set_defaults(func=cmd_confusion)
+
+    p_mcnemar = sub.add_parser("mcnemar", help="Paired-run McNemar p-values at large discordant counts")
+    p_mcnemar.add_argument(
+        "--discordant", default="2000,10000,50000", help="Comma-separated discordant pair counts per side"
+    )
+    p_mcnemar.add_argument(
+        "--reference-max",
+        type=int,
+        default=5000,
+        help="Largest discordant total also run through big-integer binomials (default: 5000)",
+    )
+    p_mcnemar.add_argument(
+        "--max-seconds", type=float, default=0.5, help="Fail when one p-value takes longer (default: 0.5)"
+    )
+    p_mcnemar.set_defaults(func=cmd_mcnemar)
+
+    p_codecs = sub.add_parser("codecs", help="Throughput and size of plain / gzip / xz JSONL artifacts")
+    p_codecs.add_argument("--cases", type=int, default=200_000, help="Case count (default: 200000)")
+    p_codecs.add_argument("--skills", type=int, default=5000, help="Distinct skills (default: 5000)")
+    p_codecs.add_argument("--seed", type=int, default=0, help="Random seed for synthetic content")
+    p_codecs.set_defaults(func=cmd_codecs)
+
+    p_results = sub.add_parser("results", help="Results database append cost and trend query times over many runs")
+    p_results.add_argument("--runs", type=int, default=2000, help="Runs to append (default: 2000)")
+    p_results.add_argument("--cases", type=int, default=5000, help="Cases per run (default: 5000)")
+    p_results.add_argument("--skills", type=int, default=200, help="Distinct skills (default: 200)")
+    p_results.add_argument("--error-rate", type=float, default=0.1, help="Share of failing cases per run (default: 0.1)")
+    p_results.add_argument("--seed", type=int, default=0, help="Random seed for synthetic outcomes")
+    p_results.set_defaults(func=cmd_results)
+
+    p_pcache = sub.add_parser(
+        "prediction-cache", help="Prediction cache lookups and stores: cold, warm, edited prompts and eviction"
+    )
+    p_pcache.add_argument("--prompts", type=int, default=100_000, help="Distinct prompts (default: 100000)")
+    p_pcache.add_argument("--batch-size", type=int, default=256, help="Prompts per lookup (default: 256)")
+    p_pcache.add_argument(
+        "--edit-rate", type=float, default=0.02, help="Share of prompts edited between runs (default: 0.02)"
+    )
+    p_pcache.add_argument("--seed", type=int, default=0, help="Random seed for synthetic prompts")
+    p_pcache.set_defaults(func=cmd_prediction_cache)
+
+    p_worker = sub.add_parser(
+        "worker", help="Successive runs: adapter process per run vs spawned and warm predictor workers"
+    )
+    p_worker.add_argument("--runs", type=int, default=5, help="Successive eval runs per setup (default: 5)")
+    p_worker.add_argument("--cases", type=int, default=2000, help="Cases per run (default: 2000)")
+    p_worker.add_argument("--skills", type=int, default=200, help="Distinct skills (default: 200)")
+    p_worker.add_argument("--batch-size", type=int, default=64, help="Cases per request (default: 64)")
+    p_worker.add_argument("--window", type=int, default=8, help="Requests in flight (default: 8)")
+    p_worker.add_argument(
+        "--mode",
+        default="keywords",
+        choices=["keyword-demo", "keywords", "none"],
+        help="Adapter mode; keywords loads the compiled automaton at startup (default: keywords)",
+    )
+    p_worker.add_argument("--seed", type=int, default=0, help="Random seed for synthetic prompts")
+    p_worker.set_defaults(func=cmd_worker)
+
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
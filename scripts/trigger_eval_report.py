@@ -4,6 +4,14 @@ Generate an HTML report from trigger evaluation CSV exports.
 
 Expected inputs are the files produced by:
   trigger_examples_tool.py score --csv-out <dir>
+
+`score --html-report` builds the same report in-process from its result
+rows (see `bundle_from_tables`) without the CSV round trip.
+
+Trend mode (`--results-db`) instead reads the run history that
+`score --results-db` appends to (see trigger_results_store.py): recall and
+reject-rate series, skills whose rates dropped, and the cases that regressed
+since the previous run.
 """
 
 from __future__ import annotations
@@ -11,8 +19,13 @@ from __future__ import annotations
 import argparse
 import csv
 import html
+import json
+import re
+from collections import defaultdict
 from pathlib import Path
 
+from trigger_results_store import REGRESSION_FIELDS, ResultsStore, skill_rates
+
 
 def read_csv_rows(path: Path) -> list[dict[str, str]]:
     if not path.exists():
@@ -21,15 +34,33 @@ def read_csv_rows(path: Path) -> list[dict[str, str]]:
         return list(csv.DictReader(f))
 
 
+DEFAULT_TITLE = "Skill Trigger Evaluation Report"
+
+# Report input key -> CSV file written by `score --csv-out`.
+CSV_BUNDLE = {
+    "overall": "overall.csv",
+    "per_skill": "per_skill.csv",
+    "details": "details.csv",
+    "pos_miss": "positive_miss_confusions.csv",
+    "pos_extra": "positive_cotriggers.csv",
+    "neg_false": "negative_false_trigger_confusions.csv",
+    "latency": "latency.csv",
+    "latency_hist": "latency_histogram.csv",
+    "threshold_curve": "threshold_curve.csv",
+    "threshold_skills": "threshold_per_skill.csv",
+}
+
+
+def bundle_from_tables(tables: dict[str, list[dict]]) -> dict[str, list[dict]]:
+    """
+    Report inputs from rows keyed by CSV file name. Values may be the strings
+    read back from CSV or the ints / strings `score` produced in memory.
+    """
+    return {key: list(tables.get(name, [])) for key, name in CSV_BUNDLE.items()}
+
+
 def load_csv_bundle(csv_dir: Path) -> dict[str, list[dict[str, str]]]:
-    return {
-        "overall": read_csv_rows(csv_dir / "overall.csv"),
-        "per_skill": read_csv_rows(csv_dir / "per_skill.csv"),
-        "details": read_csv_rows(csv_dir / "details.csv"),
-        "pos_miss": read_csv_rows(csv_dir / "positive_miss_confusions.csv"),
-        "pos_extra": read_csv_rows(csv_dir / "positive_cotriggers.csv"),
-        "neg_false": read_csv_rows(csv_dir / "negative_false_trigger_confusions.csv"),
-    }
+    return bundle_from_tables({name: read_csv_rows(csv_dir / name) for name in CSV_BUNDLE.values()})
 
 
 def metric_map(rows: list[dict[str, str]]) -> dict[str, str]:
@@ -132,10 +163,151 @@ def confusion_table_html(
     """
 
 
+def confusion_heatmap_html(
+    pos_miss: list[dict[str, str]], neg_false: list[dict[str, str]], max_skills: int = 25
+) -> str:
+    """
+    Skill-by-skill heatmap of wrong triggers (positive misses + negative false triggers).
+
+    Only the `max_skills` skills with the most confusion mass are shown, so the
+    grid stays readable on large skill sets.
+    """
+    cells: dict[tuple[str, str], int] = {}
+    for rows, left in ((pos_miss, "expected"), (neg_false, "near_miss_for")):
+        for r in rows:
+            key = (r.get(left, ""), r.get("predicted", ""))
+            cells[key] = cells.get(key, 0) + as_int(r.get("count", "0"))
+    if not cells:
+        return ""
+    mass: dict[str, int] = {}
+    for (a, b), count in cells.items():
+        mass[a] = mass.get(a, 0) + count
+        mass[b] = mass.get(b, 0) + count
+    skills = sorted(sorted(mass), key=lambda name: -mass[name])[:max_skills]
+    skills.sort()
+    peak = max(cells.values())
+    head = "".join(f'<th class="heat-col"><span>{esc(name)}</span></th>' for name in skills)
+    trs = []
+    for a in skills:
+        tds = []
+        for b in skills:
+            count = cells.get((a, b), 0)
+            alpha = 0 if not count else 0.15 + 0.85 * count / peak
+            tds.append(
+                f'<td class="heat-cell" style="background: rgba(180, 35, 24, {alpha:.3f})" '
+                f'title="{esc(a)} -> {esc(b)}: {count}">{count or ""}</td>'
+            )
+        trs.append(f"<tr><th>{esc(a)}</th>{''.join(tds)}</tr>")
+    note = ""
+    if len(mass) > len(skills):
+        note = f'<div class="muted">Showing the {len(skills)} of {len(mass)} skills with the most confusions.</div>'
+    return f"""
+    <section class="panel">
+      <h2>Confusion Heatmap</h2>
+      <div class="muted">Rows: case skill (expected / near-miss source). Columns: wrongly predicted skill.</div>
+      {note}
+      <div class="table-wrap">
+        <table class="heatmap">
+          <thead><tr><th></th>{head}</tr></thead>
+          <tbody>
+            {''.join(trs)}
+          </tbody>
+        </table>
+      </div>
+    </section>
+    """
+
+
+# One token per CJK character (prompts there have no spaces), otherwise runs of
+# word characters. The report's JavaScript tokenizes search input the same way.
+SEARCH_TOKEN_RE = re.compile(
+    r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]|(?:(?![\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af])\w)+"
+)
+ASCII_TOKEN_RE = re.compile(r"\w+")  # same tokens for ASCII text, without the per-character lookahead
+DETAIL_KINDS = ["MISS", "EXTRA", "FALSE_TRIGGER"]
+
+
+def details_payload(rows: list[dict[str, str]]) -> dict[str, list]:
+    """
+    Compact JSON form of the detail rows plus a token index over their search text.
+
+    Rows are arrays `[kind, skill, polarity, id, predicted_skills, prompt, source]`
+    with kind/skill/polarity/source as indices into lookup lists. `tokens` is the
+    sorted vocabulary of (lowercased) prompt / predicted / id tokens and
+    `postings[i]` the rows containing `tokens[i]`, as comma-separated gaps
+    between row numbers. Tokens in more than 1/16 of the rows narrow nothing
+    and get an empty posting.
+    """
+    tables: dict[str, dict[str, int]] = {"kinds": {k: i for i, k in enumerate(DETAIL_KINDS)}}
+    for name in ("skills", "polarities", "sources"):
+        tables[name] = {}
+
+    def intern(table: str, value: str) -> int:
+        ids = tables[table]
+        if value not in ids:
+            ids[value] = len(ids)
+        return ids[value]
+
+    def findall(text: str) -> list[str]:
+        return (ASCII_TOKEN_RE if text.isascii() else SEARCH_TOKEN_RE).findall(text)
+
+    # MISS / EXTRA rows of one case repeat its prompt and predicted set.
+    token_cache: dict[tuple[str, str], frozenset[str]] = {}
+    packed = []
+    index: defaultdict[str, list[int]] = defaultdict(list)
+    for n, row in enumerate(rows):
+        predicted = row.get("predicted_skills", "")
+        prompt = row.get("prompt", "")
+        case_id = row.get("id", "")
+        packed.append(
+            [
+                intern("kinds", row.get("kind", "")),
+                intern("skills", row.get("skill", "")),
+                intern("polarities", row.get("polarity", "")),
+                case_id,
+                predicted,
+                prompt,
+                intern("sources", row.get("source", "")),
+            ]
+        )
+        text_tokens = token_cache.get((prompt, predicted))
+        if text_tokens is None:
+            text_tokens = token_cache[(prompt, predicted)] = frozenset(findall(f"{prompt} {predicted}".lower()))
+        for token in text_tokens.union(findall(case_id.lower())):
+            index[token].append(n)
+    token_cache.clear()
+
+    common = max(64, len(rows) // 16)
+    tokens = sorted(index)
+    postings = []
+    for token in tokens:
+        posting = index[token]
+        if len(posting) > common:
+            postings.append("")
+            continue
+        postings.append(",".join(map(str, [b - a for a, b in zip([0, *posting], posting)])))
+    return {
+        **{name: list(ids) for name, ids in tables.items()},
+        "rows": packed,
+        "tokens": tokens,
+        "postings": postings,
+    }
+
+
+def json_script(element_id: str, payload: object) -> str:
+    """Embed `payload` as an inert JSON script element (parsed once by the page script)."""
+    # Escaping "<" keeps "</script>" and "<!--" in prompts from ending the element early.
+    text = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+    return f'<script type="application/json" id="{esc(element_id)}">{text}</script>'
+
+
 def details_table_html(rows: list[dict[str, str]], max_rows: int | None = None) -> str:
+    """
+    Filterable error details. Rows are embedded once as JSON and rendered a
+    window at a time while scrolling, so the table stays fast with any row count.
+    """
     shown = rows if max_rows is None else rows[:max_rows]
     skills = sorted({r.get("skill", "") for r in shown if r.get("skill", "")})
-    kinds = ["MISS", "EXTRA", "FALSE_TRIGGER"]
     count_note = ""
     if max_rows is not None and len(rows) > max_rows:
         count_note = f' <span class="muted">(showing {len(shown)} / {len(rows)})</span>'
@@ -144,37 +316,9 @@ def details_table_html(rows: list[dict[str, str]], max_rows: int | None = None)
         f'<option value="{esc(s)}">{esc(s)}</option>' for s in skills
     ]
     options_kind = ['<option value="">All error types</option>'] + [
-        f'<option value="{k}">{k}</option>' for k in kinds
+        f'<option value="{k}">{k}</option>' for k in DETAIL_KINDS
     ]
 
-    body_rows = []
-    for row in shown:
-        kind = row.get("kind", "")
-        skill = row.get("skill", "")
-        polarity = row.get("polarity", "")
-        predicted = row.get("predicted_skills", "")
-        prompt = row.get("prompt", "")
-        source = row.get("source", "")
-        case_id = row.get("id", "")
-        body_rows.append(
-            f"""
-            <tr class="detail-row"
-                data-kind="{esc(kind)}"
-                data-skill="{esc(skill)}"
-                data-search="{esc((prompt + ' ' + predicted + ' ' + case_id).lower())}">
-              <td><span class="pill pill-{esc(kind.lower())}">{esc(kind)}</span></td>
-              <td>{esc(skill)}</td>
-              <td>{esc(polarity)}</td>
-              <td><code>{esc(case_id)}</code></td>
-              <td>{esc(predicted)}</td>
-              <td>{esc(prompt)}</td>
-              <td><code>{esc(source)}</code></td>
-            </tr>
-            """
-        )
-    if not body_rows:
-        body_rows.append('<tr><td colspan="7" class="muted">No data</td></tr>')
-
     return f"""
     <section class="panel">
       <h2>Error Details (Filterable){count_note}</h2>
@@ -198,8 +342,17 @@ def details_table_html(rows: list[dict[str, str]], max_rows: int | None = None)
         <button id="filter-reset" type="button">Reset</button>
       </div>
       <div class="filter-summary muted" id="filter-summary"></div>
-      <div class="table-wrap">
+      <div class="table-wrap details-viewport" id="details-viewport">
         <table id="details-table">
+          <colgroup>
+            <col style="width: 130px" />
+            <col style="width: 140px" />
+            <col style="width: 80px" />
+            <col style="width: 200px" />
+            <col style="width: 160px" />
+            <col />
+            <col style="width: 220px" />
+          </colgroup>
           <thead>
             <tr>
               <th>kind</th>
@@ -212,10 +365,11 @@ def details_table_html(rows: list[dict[str, str]], max_rows: int | None = None)
             </tr>
           </thead>
           <tbody>
-            {''.join(body_rows)}
+            <tr><td colspan="7" class="muted">No data</td></tr>
           </tbody>
         </table>
       </div>
+      {json_script("details-data", details_payload(shown))}
     </section>
     """
 
@@ -286,6 +440,170 @@ def per_skill_table(rows: list[dict[str, str]]) -> str:
     """
 
 
+def latency_panel(latency_rows: list[dict[str, str]], hist_rows: list[dict[str, str]]) -> str:
+    """Latency histogram plus p50/p90/p99/max per scope; empty when predictions had no latency_ms."""
+    if not latency_rows:
+        return ""
+    total = sum(as_int(r.get("count", "0")) for r in hist_rows)
+    peak = max((as_int(r.get("count", "0")) for r in hist_rows), default=0)
+    hist_trs = []
+    for r in hist_rows:
+        count = as_int(r.get("count", "0"))
+        bound = r.get("le_ms", "")
+        label = "> last bucket" if bound == "inf" else f"<= {bound} ms"
+        share = 0.0 if total <= 0 else 100.0 * count / total
+        hist_trs.append(
+            f"""
+            <tr>
+              <td>{esc(label)}</td>
+              <td>{bar_cell(count, peak, f"{count} ({share:.1f}% of samples)")}</td>
+            </tr>
+            """
+        )
+    pct_trs = []
+    for r in latency_rows:
+        pct_trs.append(
+            "<tr>"
+            + "".join(
+                f"<td>{esc(r.get(col, ''))}</td>"
+                for col in ["scope", "group", "samples", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+            )
+            + "</tr>"
+        )
+    return f"""
+    <section class="panel">
+      <h2>Predictor Latency</h2>
+      <div class="table-wrap">
+        <table>
+          <thead><tr><th>bucket</th><th>cases</th></tr></thead>
+          <tbody>
+            {''.join(hist_trs)}
+          </tbody>
+        </table>
+      </div>
+      <div class="table-wrap">
+        <table>
+          <thead>
+            <tr>
+              <th>scope</th>
+              <th>group</th>
+              <th>samples</th>
+              <th>p50 ms</th>
+              <th>p90 ms</th>
+              <th>p99 ms</th>
+              <th>max ms</th>
+            </tr>
+          </thead>
+          <tbody>
+            {''.join(pct_trs)}
+          </tbody>
+        </table>
+      </div>
+    </section>
+    """
+
+
+def svg_polyline(points: list[tuple[float, float]], width: int, height: int, css_class: str) -> str:
+    """Polyline for points in [0, 1] x [0, 1], y pointing up."""
+    coords = " ".join(f"{x * width:.1f},{(1 - y) * height:.1f}" for x, y in points)
+    return f'<polyline class="{css_class}" points="{coords}" />'
+
+
+def threshold_panel(
+    curve_rows: list[dict[str, str]], skill_rows: list[dict[str, str]], max_points: int = 400
+) -> str:
+    """
+    Precision-recall curve and metrics-vs-threshold plot from the threshold sweep,
+    plus the skills gaining most F1 from a per-skill threshold. Empty for unscored runs.
+    """
+    if not curve_rows:
+        return ""
+    step = max(1, len(curve_rows) // max_points)
+    shown = curve_rows[::step]
+    if shown[-1] is not curve_rows[-1]:
+        shown.append(curve_rows[-1])
+    thresholds = [as_float(r.get("threshold", "0")) for r in shown]
+    lo, hi = min(thresholds), max(thresholds)
+    span = (hi - lo) or 1.0
+    width, height = 360, 220
+
+    def x_of(t: float) -> float:
+        return (t - lo) / span
+
+    pr_points = [(as_float(r.get("recall", "0")), as_float(r.get("precision", "0"))) for r in shown]
+    series = {
+        key: [(x_of(t), as_float(r.get(key, "0"))) for t, r in zip(thresholds, shown)]
+        for key in ("f1", "recall", "precision", "false_trigger_rate")
+    }
+    best = max(curve_rows, key=lambda r: as_float(r.get("f1", "0")))
+    best_x = x_of(as_float(best.get("threshold", "0"))) * width
+
+    gains = sorted(
+        (
+            r
+            for r in skill_rows
+            if r.get("best_threshold") and as_float(r.get("f1", "0")) > as_float(r.get("f1_at_threshold", "0"))
+        ),
+        key=lambda r: as_float(r.get("f1_at_threshold", "0")) - as_float(r.get("f1", "0")),
+    )
+    gain_trs = []
+    for r in gains[:50]:
+        gain_trs.append(
+            "<tr>"
+            + "".join(
+                f"<td>{esc(r.get(col, ''))}</td>"
+                for col in ["skill", "best_threshold", "f1", "f1_at_threshold", "precision", "recall", "false_trigger_rate"]
+            )
+            + "</tr>"
+        )
+    if not gain_trs:
+        gain_trs.append('<tr><td colspan="7" class="muted">The scoring threshold is already F1-optimal for every skill</td></tr>')
+    return f"""
+    <section class="panel">
+      <h2>Threshold Sweep <span class="muted">({len(curve_rows)} thresholds; best F1 {esc(best.get("f1", ""))} at {esc(best.get("threshold", ""))})</span></h2>
+      <div class="plots">
+        <figure>
+          <svg viewBox="-4 -4 {width + 8} {height + 8}" class="plot">
+            <rect x="0" y="0" width="{width}" height="{height}" class="plot-frame" />
+            {svg_polyline(pr_points, width, height, "line-pr")}
+          </svg>
+          <figcaption>Precision (y) vs recall (x)</figcaption>
+        </figure>
+        <figure>
+          <svg viewBox="-4 -4 {width + 8} {height + 8}" class="plot">
+            <rect x="0" y="0" width="{width}" height="{height}" class="plot-frame" />
+            <line x1="{best_x:.1f}" y1="0" x2="{best_x:.1f}" y2="{height}" class="plot-marker" />
+            {''.join(svg_polyline(points, width, height, f"line-{key.replace('_', '-')}") for key, points in series.items())}
+          </svg>
+          <figcaption>
+            Threshold {lo:g} &rarr; {hi:g}:
+            <span class="key-f1">F1</span>, <span class="key-recall">recall</span>,
+            <span class="key-precision">precision</span>, <span class="key-false-trigger-rate">false-trigger rate</span>
+          </figcaption>
+        </figure>
+      </div>
+      <div class="table-wrap">
+        <table>
+          <thead>
+            <tr>
+              <th>skill</th>
+              <th>best threshold</th>
+              <th>F1</th>
+              <th>F1 at scoring threshold</th>
+              <th>precision</th>
+              <th>recall</th>
+              <th>false-trigger rate</th>
+            </tr>
+          </thead>
+          <tbody>
+            {''.join(gain_trs)}
+          </tbody>
+        </table>
+      </div>
+    </section>
+    """
+
+
 def summary_cards(overall_rows: list[dict[str, str]]) -> str:
     m = metric_map(overall_rows)
     cards = [
@@ -296,6 +614,8 @@ def summary_cards(overall_rows: list[dict[str, str]]) -> str:
         ("False Triggers", m.get("negative_false_trigger", "0")),
         ("Extra Skill Predictions", m.get("positive_extra_skill_predictions", "0")),
     ]
+    if m.get("latency_p99_ms"):
+        cards.append(("Latency p50 / p99 (ms)", f"{m['latency_p50_ms']} / {m['latency_p99_ms']}"))
     html_cards = []
     for label, value in cards:
         html_cards.append(
@@ -313,10 +633,20 @@ def summary_cards(overall_rows: list[dict[str, str]]) -> str:
     """
 
 
-def build_html(title: str, csv_dir: Path, data: dict[str, list[dict[str, str]]], details_limit: int) -> str:
+def build_html(
+    title: str, csv_dir: Path | None, data: dict[str, list[dict[str, str]]], details_limit: int | None
+) -> str:
+    """Render the report; `csv_dir=None` marks a report built in-process by `score --html-report`."""
+    if csv_dir is None:
+        source = "Built in-process by <code>trigger_examples_tool.py score --html-report</code>"
+    else:
+        source = f"Source CSV directory: <code>{esc(csv_dir)}</code>"
     sections = [
         summary_cards(data["overall"]),
         per_skill_table(data["per_skill"]),
+        latency_panel(data["latency"], data["latency_hist"]),
+        threshold_panel(data["threshold_curve"], data["threshold_skills"]),
+        confusion_heatmap_html(data["pos_miss"], data["neg_false"]),
         confusion_table_html(
             "Positive Miss Confusions",
             data["pos_miss"],
@@ -349,6 +679,11 @@ def build_html(title: str, csv_dir: Path, data: dict[str, list[dict[str, str]]],
         ),
         details_table_html(data["details"], details_limit),
     ]
+    return page_html(title, source, sections)
+
+
+def page_html(title: str, subtitle: str, sections: list[str]) -> str:
+    """The report page around `sections` (shared styles; the details-table script is inert without one)."""
     return f"""<!doctype html>
 <html lang="en">
 <head>
@@ -486,6 +821,32 @@ def build_html(title: str, csv_dir: Path, data: dict[str, list[dict[str, str]]],
       background: linear-gradient(90deg, var(--accent), #14b8a6);
     }}
     .bar-text {{ font-size: 12px; color: var(--muted); white-space: nowrap; }}
+    .details-viewport {{ max-height: 640px; }}
+    #details-table {{ table-layout: fixed; }}
+    .detail-row td {{ white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }}
+    tr.spacer td {{ padding: 0; border: none; }}
+    table.heatmap {{ min-width: 0; width: auto; }}
+    .heatmap th, .heatmap td {{ padding: 4px 6px; font-size: 12px; }}
+    .heat-col {{ height: 120px; vertical-align: bottom; }}
+    .heat-col span {{ writing-mode: vertical-rl; transform: rotate(180deg); white-space: nowrap; }}
+    .heat-cell {{ text-align: center; min-width: 26px; border: 1px solid var(--line); }}
+    .plots {{ display: flex; flex-wrap: wrap; gap: 12px; margin-bottom: 10px; }}
+    .plots figure {{ margin: 0; flex: 1 1 320px; }}
+    .plots figcaption {{ font-size: 12px; color: var(--muted); }}
+    .plot {{ width: 100%; height: auto; }}
+    .plot polyline {{ fill: none; stroke-width: 1.5; }}
+    .plot-frame {{ fill: #fff; stroke: var(--line); }}
+    .plot-marker {{ stroke: var(--muted); stroke-dasharray: 4 3; }}
+    .line-f1, .line-pr {{ stroke: var(--accent); }}
+    .line-recall {{ stroke: #2563eb; }}
+    .line-precision {{ stroke: #9333ea; }}
+    .line-false-trigger-rate {{ stroke: var(--danger); }}
+    .key-f1 {{ color: var(--accent); font-weight: 600; }}
+    .key-recall {{ color: #2563eb; }}
+    .key-precision {{ color: #9333ea; }}
+    .key-false-trigger-rate {{ color: var(--danger); }}
+    .line-reject-rate {{ stroke: #d97706; }}
+    .key-reject-rate {{ color: #d97706; }}
     footer {{
       margin-top: 18px;
       color: var(--muted);
@@ -506,7 +867,7 @@ def build_html(title: str, csv_dir: Path, data: dict[str, list[dict[str, str]]],
   <div class="wrap">
     <header>
       <h1>{esc(title)}</h1>
-      <div class="subtitle">Source CSV directory: <code>{esc(csv_dir)}</code></div>
+      <div class="subtitle">{subtitle}</div>
     </header>
     {''.join(sections)}
     <footer>
@@ -516,8 +877,12 @@ def build_html(title: str, csv_dir: Path, data: dict[str, list[dict[str, str]]],
   <script>
     (function () {{
       const table = document.getElementById('details-table');
-      if (!table) return;
-      const rows = Array.from(table.querySelectorAll('tbody .detail-row'));
+      const dataEl = document.getElementById('details-data');
+      if (!table || !dataEl) return;
+      const data = JSON.parse(dataEl.textContent);
+      const rows = data.rows;
+      const body = table.tBodies[0];
+      const viewport = document.getElementById('details-viewport');
       const skillEl = document.getElementById('filter-skill');
       const kindEl = document.getElementById('filter-kind');
       const searchEl = document.getElementById('filter-search');
@@ -525,23 +890,164 @@ def build_html(title: str, csv_dir: Path, data: dict[str, list[dict[str, str]]],
       const summaryEl = document.getElementById('filter-summary');
       const confusionRows = Array.from(document.querySelectorAll('.confusion-row'));
 
+      // Must tokenize like SEARCH_TOKEN_RE in trigger_eval_report.py.
+      const CJK = /[\\u3040-\\u30ff\\u3400-\\u9fff\\uac00-\\ud7af]/u;
+      const TOKEN_RE = /[\\u3040-\\u30ff\\u3400-\\u9fff\\uac00-\\ud7af]|(?:(?![\\u3040-\\u30ff\\u3400-\\u9fff\\uac00-\\ud7af])[\\p{{L}}\\p{{N}}_])+/gu;
+      const MAX_TOKEN_HITS = 5000;
+      const OVERSCAN = 20;
+      const texts = new Array(rows.length);
+      const postings = new Map();
+      const wordHits = new Map();
+      let matches = [];
+      let rowHeight = 0;
+      let scheduled = false;
+
+      function esc(value) {{
+        return String(value).replace(/[&<>"']/g, (c) => ({{ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' }})[c]);
+      }}
+
+      function searchText(i) {{
+        if (texts[i] === undefined) {{
+          const row = rows[i];
+          texts[i] = (row[5] + ' ' + row[4] + ' ' + row[3]).toLowerCase();
+        }}
+        return texts[i];
+      }}
+
+      function posting(t) {{
+        let list = postings.get(t);
+        if (!list) {{
+          const gaps = data.postings[t].split(',');
+          list = new Int32Array(gaps.length);
+          let n = 0;
+          gaps.forEach((gap, j) => {{
+            n += +gap;
+            list[j] = n;
+          }});
+          postings.set(t, list);
+        }}
+        return list;
+      }}
+
+      // Indexed tokens containing `word`, or null when it narrows nothing (inside a
+      // token too common to have a posting, or too many tokens). Typing extends
+      // the last word, so a cached shorter word's hits are rescanned instead of
+      // the whole vocabulary.
+      function tokenHits(word) {{
+        if (wordHits.has(word)) return wordHits.get(word);
+        const pool = wordHits.get(word.slice(0, -1)) || null;
+        const count = pool ? pool.length : data.tokens.length;
+        let hits = [];
+        for (let j = 0; j < count; j++) {{
+          const t = pool ? pool[j] : j;
+          if (!data.tokens[t].includes(word)) continue;
+          if (!data.postings[t] || hits.length === MAX_TOKEN_HITS) {{
+            hits = null;
+            break;
+          }}
+          hits.push(t);
+        }}
+        if (wordHits.size > 256) wordHits.clear();
+        wordHits.set(word, hits);
+        return hits;
+      }}
+
+      // Rows that can contain `search`: for every word in it, the rows holding an
+      // indexed token that contains the word. Null when no word narrows the set;
+      // callers still check the full search string against each candidate.
+      function candidates(search) {{
+        const words = Array.from(new Set(search.match(TOKEN_RE) || []));
+        let marks = null;
+        let used = 0;
+        for (const word of words) {{
+          if ((word.length < 2 && !CJK.test(word)) || used === 255) continue;
+          const hits = tokenHits(word);
+          if (hits === null) continue;
+          if (!hits.length) return [];
+          marks = marks || new Uint8Array(rows.length);
+          used += 1;
+          for (const t of hits) {{
+            for (const i of posting(t)) {{
+              if (marks[i] === used - 1) marks[i] = used;
+            }}
+          }}
+        }}
+        if (!used) return null;
+        const out = [];
+        for (let i = 0; i < marks.length; i++) {{
+          if (marks[i] === used) out.push(i);
+        }}
+        return out;
+      }}
+
+      function rowHtml(i) {{
+        const row = rows[i];
+        const kind = data.kinds[row[0]];
+        const source = data.sources[row[6]];
+        return (
+          '<tr class="detail-row">' +
+          '<td><span class="pill pill-' + esc(kind.toLowerCase()) + '">' + esc(kind) + '</span></td>' +
+          '<td>' + esc(data.skills[row[1]]) + '</td>' +
+          '<td>' + esc(data.polarities[row[2]]) + '</td>' +
+          '<td title="' + esc(row[3]) + '"><code>' + esc(row[3]) + '</code></td>' +
+          '<td title="' + esc(row[4]) + '">' + esc(row[4]) + '</td>' +
+          '<td title="' + esc(row[5]) + '">' + esc(row[5]) + '</td>' +
+          '<td title="' + esc(source) + '"><code>' + esc(source) + '</code></td>' +
+          '</tr>'
+        );
+      }}
+
+      function spacer(height) {{
+        return height > 0 ? '<tr class="spacer" style="height: ' + height + 'px"><td colspan="7"></td></tr>' : '';
+      }}
+
+      // Render only the rows in (and near) the viewport; spacers keep the scroll height.
+      function render() {{
+        if (!matches.length) {{
+          body.innerHTML = '<tr><td colspan="7" class="muted">No data</td></tr>';
+          return;
+        }}
+        const height = rowHeight || 34;
+        const first = Math.max(0, Math.floor(viewport.scrollTop / height) - OVERSCAN);
+        const last = Math.min(matches.length, first + Math.ceil(viewport.clientHeight / height) + 2 * OVERSCAN);
+        let html = spacer(first * height);
+        for (let j = first; j < last; j++) html += rowHtml(matches[j]);
+        body.innerHTML = html + spacer((matches.length - last) * height);
+        if (!rowHeight) {{
+          const row = body.querySelector('.detail-row');
+          rowHeight = (row && row.getBoundingClientRect().height) || 34;
+          render();
+        }}
+      }}
+
+      viewport.addEventListener('scroll', () => {{
+        if (scheduled) return;
+        scheduled = true;
+        requestAnimationFrame(() => {{
+          scheduled = false;
+          render();
+        }});
+      }});
+
       function applyFilters() {{
         const skill = (skillEl?.value || '').trim();
         const kind = (kindEl?.value || '').trim();
         const search = (searchEl?.value || '').trim().toLowerCase();
-        let visible = 0;
-
-        rows.forEach((row) => {{
-          const rowSkill = row.getAttribute('data-skill') || '';
-          const rowKind = row.getAttribute('data-kind') || '';
-          const rowSearch = row.getAttribute('data-search') || '';
-          const okSkill = !skill || rowSkill === skill;
-          const okKind = !kind || rowKind === kind;
-          const okSearch = !search || rowSearch.includes(search);
-          const show = okSkill && okKind && okSearch;
-          row.style.display = show ? '' : 'none';
-          if (show) visible += 1;
-        }});
+        const skillId = data.skills.indexOf(skill);
+        const kindId = data.kinds.indexOf(kind);
+        const pool = search ? candidates(search) : null;
+        const count = pool ? pool.length : rows.length;
+        matches = [];
+        for (let j = 0; j < count; j++) {{
+          const i = pool ? pool[j] : j;
+          const row = rows[i];
+          if (skill && row[1] !== skillId) continue;
+          if (kind && row[0] !== kindId) continue;
+          if (search && !searchText(i).includes(search)) continue;
+          matches.push(i);
+        }}
+        viewport.scrollTop = 0;
+        render();
 
         if (summaryEl) {{
           const active = [];
@@ -549,7 +1055,7 @@ def build_html(title: str, csv_dir: Path, data: dict[str, list[dict[str, str]]],
           if (kind) active.push('kind=' + kind);
           if (search) active.push('search="' + search + '"');
           summaryEl.textContent =
-            'Visible rows: ' + visible + ' / ' + rows.length +
+            'Visible rows: ' + matches.length + ' / ' + rows.length +
             (active.length ? ' | Filters: ' + active.join(', ') : '');
         }}
       }}
@@ -593,31 +1099,261 @@ def build_html(title: str, csv_dir: Path, data: dict[str, list[dict[str, str]]],
 """
 
 
+TREND_TITLE = "Skill Trigger Evaluation Trends"
+
+
+def rate_text(value: float | None) -> str:
+    return "" if value is None else f"{value:.4f}"
+
+
+def series_plot(series: dict[str, list[float | None]], caption: str, width: int = 720, height: int = 200) -> str:
+    """
+    One SVG with a line per series over evenly spaced runs; the y axis spans the
+    observed values (small drifts stay visible). `None` values are skipped.
+    """
+    values = [v for points in series.values() for v in points if v is not None]
+    if not values:
+        return ""
+    lo, hi = min(values), max(values)
+    if hi - lo < 0.01:
+        mid = (hi + lo) / 2
+        lo, hi = mid - 0.005, mid + 0.005
+    n = max(len(points) for points in series.values())
+    lines = []
+    for key, points in series.items():
+        coords = [
+            (i / (n - 1) if n > 1 else 0.5, (v - lo) / (hi - lo)) for i, v in enumerate(points) if v is not None
+        ]
+        if len(coords) == 1:
+            coords = [(0.0, coords[0][1]), (1.0, coords[0][1])]
+        lines.append(svg_polyline(coords, width, height, f"line-{key.replace('_', '-')}"))
+    return f"""
+        <figure>
+          <svg viewBox="-4 -4 {width + 8} {height + 8}" class="plot">
+            <rect x="0" y="0" width="{width}" height="{height}" class="plot-frame" />
+            {''.join(lines)}
+          </svg>
+          <figcaption>{caption} (y: {lo:.4f} &rarr; {hi:.4f})</figcaption>
+        </figure>
+    """
+
+
+def trend_cards(runs: list[dict], regressed: int, fixed: int) -> str:
+    latest = runs[-1]
+    previous = runs[-2] if len(runs) > 1 else None
+
+    def with_delta(key: str) -> str:
+        value = latest[key]
+        if value is None:
+            return ""
+        if previous is None or previous[key] is None:
+            return f"{value:.4f}"
+        return f"{value:.4f} ({value - previous[key]:+.4f})"
+
+    cards = [
+        ("Run", f"#{latest['run_id']} {latest['label']}"),
+        ("Positive Recall", with_delta("positive_recall")),
+        ("Negative Reject Rate", with_delta("negative_reject_rate")),
+        ("Newly Regressed Cases", regressed),
+        ("Newly Fixed Cases", fixed),
+        ("Runs Shown", len(runs)),
+    ]
+    html_cards = "".join(
+        f"""
+            <div class="card">
+              <div class="card-label">{esc(label)}</div>
+              <div class="card-value">{esc(value)}</div>
+            </div>
+            """
+        for label, value in cards
+    )
+    return f"""
+    <section class="cards">
+      {html_cards}
+    </section>
+    """
+
+
+def trend_panel(runs: list[dict], skill: str | None, skill_rows: list[dict]) -> str:
+    plots = [
+        series_plot(
+            {
+                "recall": [r["positive_recall"] for r in runs],
+                "reject_rate": [r["negative_reject_rate"] for r in runs],
+            },
+            f'Runs #{runs[0]["run_id"]} &rarr; #{runs[-1]["run_id"]}: '
+            '<span class="key-recall">positive recall</span>, '
+            '<span class="key-reject-rate">negative reject rate</span>',
+        )
+    ]
+    if skill is not None:
+        by_run = {row["run_id"]: row for row in skill_rows}
+        rates = [skill_rates(by_run[r["run_id"]]) if r["run_id"] in by_run else (None, None) for r in runs]
+        plots.append(
+            series_plot(
+                {"recall": [rate[0] for rate in rates], "reject_rate": [rate[1] for rate in rates]},
+                f"Skill <code>{esc(skill)}</code> ({len(skill_rows)} runs)",
+            )
+            or f'<p class="muted">No runs of skill <code>{esc(skill)}</code> in this window.</p>'
+        )
+    return f"""
+    <section class="panel">
+      <h2>Metric Trends</h2>
+      <div class="plots">
+        {''.join(plots)}
+      </div>
+    </section>
+    """
+
+
+def skill_movers(base: dict[str, dict], current: dict[str, dict], limit: int = 50) -> list[dict[str, str]]:
+    """Skills whose recall or reject rate dropped between two runs, largest drop first."""
+    movers = []
+    for skill in base.keys() & current.keys():
+        before, after = skill_rates(base[skill]), skill_rates(current[skill])
+        deltas = [b - a for a, b in zip(before, after) if a is not None and b is not None]
+        if deltas and min(deltas) < 0:
+            movers.append((min(deltas), skill, before, after))
+    movers.sort()
+    return [
+        {
+            "skill": skill,
+            "recall_before": rate_text(before[0]),
+            "recall": rate_text(after[0]),
+            "reject_rate_before": rate_text(before[1]),
+            "reject_rate": rate_text(after[1]),
+            "drop": f"{drop:.4f}",
+        }
+        for drop, skill, before, after in movers[:limit]
+    ]
+
+
+def build_trend_html(
+    title: str,
+    db_path: Path,
+    store: ResultsStore,
+    runs_limit: int,
+    run_id: int | None,
+    base_run: int | None,
+    skill: str | None,
+    regressions_limit: int,
+) -> str:
+    """Render run history from a `score --results-db` database: trends, skill drops and new regressions."""
+    for flag, value in (("--run", run_id), ("--base-run", base_run)):
+        if value is not None and not store.has_run(value):
+            raise SystemExit(f"{flag} {value}: no such run in {db_path}")
+    runs = store.runs(runs_limit, until=run_id)
+    if not runs:
+        raise SystemExit(f"No runs recorded in {db_path}" + (f" up to run {run_id}" if run_id is not None else ""))
+    latest = runs[-1]["run_id"]
+    if base_run is None:
+        base_run = store.previous_run(latest)
+    skill_rows = store.skill_series(skill, runs[0]["run_id"], latest) if skill is not None else []
+    sections = []
+    if base_run is None:
+        sections.append(trend_cards(runs, 0, 0))
+        sections.append(trend_panel(runs, skill, skill_rows))
+        sections.append('<section class="panel muted">Only one run recorded; nothing to compare yet.</section>')
+    else:
+        regressions, regressed, fixed = store.regressions(base_run, latest, regressions_limit)
+        sections.append(trend_cards(runs, regressed, fixed))
+        sections.append(trend_panel(runs, skill, skill_rows))
+        sections.append(
+            table_html(
+                f"Skills With Dropped Rates (run #{base_run} \u2192 #{latest})",
+                skill_movers(store.skill_metrics(base_run), store.skill_metrics(latest)),
+                ["skill", "drop", "recall_before", "recall", "reject_rate_before", "reject_rate"],
+            )
+        )
+        shown = f" (showing {len(regressions)})" if len(regressions) < regressed else ""
+        sections.append(
+            table_html(
+                f"Newly Regressed Cases: {regressed} (run #{base_run} \u2192 #{latest}){shown}",
+                regressions,
+                REGRESSION_FIELDS,
+            )
+        )
+    history = [
+        {
+            **r,
+            "positive_recall": rate_text(r["positive_recall"]),
+            "negative_reject_rate": rate_text(r["negative_reject_rate"]),
+        }
+        for r in reversed(runs)
+    ]
+    sections.append(
+        table_html(
+            "Runs",
+            history,
+            ["run_id", "created_at", "label", "source", "positive_recall", "negative_reject_rate",
+             "positive_total", "negative_total", "missing_predictions", "latency_p50_ms", "latency_p99_ms"],
+        )
+    )
+    return page_html(title, f"Results database: <code>{esc(db_path)}</code>", sections)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Generate HTML report from trigger evaluation CSV outputs.")
-    parser.add_argument("--csv-dir", required=True, help="Directory created by score --csv-out")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv-dir", help="Directory created by score --csv-out")
+    source.add_argument(
+        "--results-db",
+        metavar="DB",
+        help="Trend mode: render run history from a database written by score --results-db",
+    )
     parser.add_argument("--out", required=True, help="Output HTML file path")
-    parser.add_argument("--title", default="Skill Trigger Evaluation Report", help="Report title")
+    parser.add_argument("--title", help=f"Report title (default: {DEFAULT_TITLE!r}, or {TREND_TITLE!r} in trend mode)")
     parser.add_argument(
         "--details-limit",
         type=int,
-        default=200,
-        help="Maximum rows shown in the details table (default: 200)",
+        default=0,
+        help="Maximum rows embedded in the details table; 0 embeds all of them (default: 0)",
+    )
+    trend = parser.add_argument_group("trend mode (--results-db)")
+    trend.add_argument("--runs", type=int, default=100, help="Most recent runs plotted and listed (default: 100)")
+    trend.add_argument("--run", type=int, help="Treat this run id as the latest (default: the newest run)")
+    trend.add_argument(
+        "--base-run", type=int, help="Run to compare against for regressions (default: the run before --run)"
+    )
+    trend.add_argument("--skill", help="Also plot this skill's recall and reject rate")
+    trend.add_argument(
+        "--regressions-limit",
+        type=int,
+        default=1000,
+        help="Maximum newly regressed cases listed (default: 1000)",
     )
     args = parser.parse_args()
 
-    csv_dir = Path(args.csv_dir).resolve()
     out_path = Path(args.out).resolve()
-    if not csv_dir.exists():
-        raise SystemExit(f"CSV directory not found: {csv_dir}")
+    if args.results_db:
+        db_path = Path(args.results_db).resolve()
+        if not db_path.exists():
+            raise SystemExit(f"Results database not found: {db_path}")
+        with ResultsStore(db_path, readonly=True) as store:
+            html_doc = build_trend_html(
+                args.title or TREND_TITLE,
+                db_path,
+                store,
+                args.runs,
+                args.run,
+                args.base_run,
+                args.skill,
+                args.regressions_limit,
+            )
+    else:
+        csv_dir = Path(args.csv_dir).resolve()
+        if not csv_dir.exists():
+            raise SystemExit(f"CSV directory not found: {csv_dir}")
 
-    data = load_csv_bundle(csv_dir)
-    if not data["overall"] or not data["per_skill"]:
-        raise SystemExit(
-            "Missing required CSV inputs (expected at least overall.csv and per_skill.csv)."
-        )
+        data = load_csv_bundle(csv_dir)
+        if not data["overall"] or not data["per_skill"]:
+            raise SystemExit(
+                "Missing required CSV inputs (expected at least overall.csv and per_skill.csv)."
+            )
 
-    html_doc = build_html(args.title, csv_dir, data, max(1, args.details_limit))
+        html_doc = build_html(
+            args.title or DEFAULT_TITLE, csv_dir, data, args.details_limit if args.details_limit > 0 else None
+        )
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(html_doc, encoding="utf-8")
     print(f"Wrote HTML report to {out_path}")
@@ -6,6 +6,8 @@ This script reads `skills/**/references/trigger-examples.md` and can:
 - summarize example coverage
 - export cases to JSONL for trigger testing
 - score predictions from an external trigger runner
+- maintain an on-disk index of parsed cases so unchanged files are not re-parsed
+- export / score only the skills changed since a git ref, merged into the last stored run
 
 No external dependencies required.
 """
@@ -13,16 +15,53 @@ No external dependencies required.
 from __future__ import annotations
 
 import argparse
+import bisect
 import csv
+import glob
+import gzip
+import hashlib
+import heapq
+import importlib
+import importlib.util
 import json
+import lzma
+import os
 import sys
-from dataclasses import dataclass, asdict
+import tempfile
+import time
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import IO, Callable, Iterable, Iterator
+
+from predictor_worker import DEFAULT_WINDOW, WorkerClient, WorkerError
+from skill_catalog import SkillCatalog, find_skill_dirs, skill_category
+from trigger_bootstrap import BinomialSampler, mcnemar_exact, paired_difference, proportion_intervals
+from trigger_confusion import ConfusionMatrix, SkillIds
+from trigger_eval_report import DEFAULT_TITLE, build_html, bundle_from_tables, read_csv_rows
+from trigger_incremental import ChangeScope, plan_scope
+from trigger_prediction_cache import DEFAULT_MAX_ENTRIES, MISS, PredictionCache, files_version
+from trigger_results_store import ResultsStore
+from trigger_thresholds import CURVE_FIELDS, SKILL_THRESHOLD_FIELDS, ThresholdSweep, best_curve_row
 
 
 ROOT = Path(__file__).resolve().parents[1]
 SKILLS_DIR = ROOT / "skills"
+DEFAULT_INDEX_PATH = ROOT / ".cache" / "trigger-case-index.json"
+INDEX_VERSION = 1
+OUTCOME_CACHE_VERSION = 3
+
+GZIP_LEVEL = 1
+XZ_PRESET = 1
+DEFAULT_SCORE_THRESHOLD = 0.5
+
+# Case id schemes: `ordinal` numbers examples per section (`skill:positive:en:3`);
+# `content` hashes the normalized prompt (`skill:positive:1f3a9c0b2d`), so ids
+# survive reordering and edits elsewhere in the file.
+ID_SCHEMES = ("ordinal", "content")
+CONTENT_ID_CHARS = 10
+DUPLICATE_MARK = "~"
 
 SECTION_MAP = {
     "Positive (Chinese)": ("positive", "zh"),
@@ -33,6 +72,9 @@ SECTION_MAP = {
 
 @dataclass
 class Case:
+    # Explicit slots: no per-instance __dict__, which matters at millions of cases.
+    __slots__ = ("id", "skill", "prompt", "polarity", "language", "source")
+
     id: str
     skill: str
     prompt: str
@@ -40,50 +82,92 @@ class Case:
     language: str  # zh | en | mixed
     source: str
 
+    @classmethod
+    def from_row(cls, row: list[str] | tuple[str, ...]) -> Case:
+        """
+        Build a case from `[id, skill, prompt, polarity, language, source]`.
+
+        The low-cardinality fields are interned so rows decoded from JSON (index,
+        sorted runs) share one string object per distinct value.
+        """
+        case_id, skill, prompt, polarity, language, source = row
+        return cls(
+            case_id,
+            sys.intern(skill),
+            prompt,
+            sys.intern(polarity),
+            sys.intern(language),
+            sys.intern(source),
+        )
+
+    def to_row(self) -> list[str]:
+        return [self.id, self.skill, self.prompt, self.polarity, self.language, self.source]
+
+
+_encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def case_to_jsonl(case: Case) -> str:
+    """
+    Serialize one exported case row without building an intermediate dict.
+
+    Field order and formatting match `json.dumps(record, ensure_ascii=False)` of
+    the historical export record.
+    """
+    enc = _encode_json
+    return (
+        f'{{"id": {enc(case.id)}, "skill": {enc(case.skill)}, "prompt": {enc(case.prompt)}, '
+        f'"polarity": {enc(case.polarity)}, "language": {enc(case.language)}, '
+        f'"source": {enc(case.source)}, '
+        f'"expected_trigger": {"true" if case.polarity == "positive" else "false"}, '
+        f'"expected_skill": {enc(case.skill)}}}'
+    )
+
+
+def open_text(path: Path, mode: str = "r") -> IO[str]:
+    """
+    Open a text file (JSONL) for streaming I/O, compressed by extension.
+
+    `.gz` goes through gzip and `.xz` through LZMA; anything else is plain
+    UTF-8. Data is (de)compressed block by block as it is read or written.
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=GZIP_LEVEL)
+    if suffix == ".xz":
+        preset = XZ_PRESET if "w" in mode else None
+        return lzma.open(path, mode + "t", encoding="utf-8", preset=preset)
+    return path.open(mode, encoding="utf-8")
+
 
 def iter_skill_dirs(skills_dir: Path) -> Iterable[Path]:
-    for skill_file in sorted(skills_dir.rglob("SKILL.md")):
-        yield skill_file.parent.resolve()
+    return find_skill_dirs(skills_dir.resolve())
 
 
-def read_top_level_scalar(yaml_path: Path, key: str) -> str | None:
-    if not yaml_path.exists():
-        return None
-    prefix = f"{key}:"
-    for raw in yaml_path.read_text(encoding="utf-8").splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#"):
-            continue
-        if line.startswith(prefix):
-            return line.split(":", 1)[1].strip()
-    return None
+def normalize_prompt(prompt: str) -> str:
+    """NFKC, case-folded, whitespace-collapsed prompt text used for content ids."""
+    return " ".join(unicodedata.normalize("NFKC", prompt).casefold().split())
 
 
-def skill_category(skill_dir: Path) -> str:
-    try:
-        rel_parts = skill_dir.relative_to(SKILLS_DIR).parts
-    except ValueError:
-        rel_parts = ()
-    if rel_parts:
-        head = rel_parts[0]
-        if head in {"global", "cron", "auto", "manual"}:
-            return head
-
-    yaml_path = skill_dir / "skill.yaml"
-    category = read_top_level_scalar(yaml_path, "category")
-    if category:
-        return category
-    activation = read_top_level_scalar(yaml_path, "activation")
-    if activation == "always_on":
-        return "auto"
-    if activation in {"cron", "scheduled"}:
-        return "cron"
-    if activation in {"global", "auto", "manual"}:
-        return activation
-    return "manual"
-
-
-def parse_trigger_examples(skill_dir: Path) -> list[Case]:
+def content_case_id(skill: str, polarity: str, prompt: str) -> str:
+    raw = "\0".join((skill, polarity, normalize_prompt(prompt)))
+    return f"{skill}:{polarity}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()[:CONTENT_ID_CHARS]}"
+
+
+def duplicate_case_ids(cases: Iterable[Case]) -> list[str]:
+    """Ids of content-id cases repeating an earlier prompt of the same skill and polarity."""
+    # The mark only ever follows the content hash; skill names may contain it too.
+    return [c.id for c in cases if DUPLICATE_MARK in c.id.rpartition(":")[2]]
+
+
+def parse_trigger_examples(skill_dir: Path, id_scheme: str = "ordinal") -> list[Case]:
+    """
+    Parse a skill's `references/trigger-examples.md` into cases.
+
+    With `id_scheme="content"`, a prompt repeating an earlier one of the same
+    skill and polarity (after normalization) keeps its case, with `~2`, `~3`...
+    appended to the shared id; `duplicate_case_ids` lists those.
+    """
     skill_name = skill_dir.name
     ref_path = skill_dir / "references" / "trigger-examples.md"
     if not ref_path.exists():
@@ -98,6 +182,7 @@ def parse_trigger_examples(skill_dir: Path) -> list[Case]:
     lines = ref_path.read_text(encoding="utf-8").splitlines()
     current_section = None
     counters: dict[tuple[str, str], int] = {}
+    seen_ids: dict[str, int] = {}
     cases: list[Case] = []
 
     for raw in lines:
@@ -111,16 +196,22 @@ def parse_trigger_examples(skill_dir: Path) -> list[Case]:
             continue
 
         polarity, language = current_section
-        key = (polarity, language)
-        counters[key] = counters.get(key, 0) + 1
-        idx = counters[key]
-        case_id = f"{skill_name}:{polarity}:{language}:{idx}"
+        prompt = line[2:].strip()
+        if id_scheme == "content":
+            case_id = content_case_id(skill_name, polarity, prompt)
+            copies = seen_ids[case_id] = seen_ids.get(case_id, 0) + 1
+            if copies > 1:
+                case_id = f"{case_id}{DUPLICATE_MARK}{copies}"
+        else:
+            key = (polarity, language)
+            counters[key] = counters.get(key, 0) + 1
+            case_id = f"{skill_name}:{polarity}:{language}:{counters[key]}"
 
         cases.append(
             Case(
                 id=case_id,
                 skill=skill_name,
-                prompt=line[2:].strip(),
+                prompt=prompt,
                 polarity=polarity,
                 language=language,
                 source=source_path,
@@ -130,26 +221,296 @@ def parse_trigger_examples(skill_dir: Path) -> list[Case]:
     return cases
 
 
+def file_stat_key(path: Path) -> list[int] | None:
+    """Return `[mtime_ns, size]` for a file, or None when it does not exist."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def file_digest(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class CaseIndex:
+    """
+    On-disk cache of parsed trigger example cases, one entry per skill directory.
+
+    Each entry records the `skill.yaml` and `references/trigger-examples.md`
+    fingerprints (mtime, size, sha256) together with the derived category and
+    parsed case rows. A file whose mtime/size still match is trusted as-is; a
+    file whose stat changed is re-hashed, and only re-parsed when its content
+    hash differs.
+    """
+
+    def __init__(self, path: Path, skills_dir: Path, id_scheme: str = "ordinal") -> None:
+        self.path = path
+        self.skills_dir = skills_dir.resolve()
+        self.id_scheme = id_scheme
+        self.entries: dict[str, dict] = {}
+        self.dirty = False
+        self.stats = {"reused": 0, "rehashed": 0, "parsed": 0, "pruned": 0}
+
+    def _header(self) -> dict:
+        header = {"version": INDEX_VERSION, "root": str(ROOT), "skills_dir": str(self.skills_dir)}
+        if self.id_scheme != "ordinal":
+            header["id_scheme"] = self.id_scheme
+        return header
+
+    def load(self) -> CaseIndex:
+        if not self.path.exists():
+            return self
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            print(f"Warning: ignoring unreadable case index: {self.path}", file=sys.stderr)
+            return self
+        if not isinstance(data, dict) or data.get("header") != self._header():
+            # Different layout or tree; start over rather than trusting stale rows.
+            return self
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            self.entries = entries
+        return self
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        payload = {"header": self._header(), "entries": self.entries}
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def _key(self, skill_dir: Path) -> str:
+        try:
+            return str(skill_dir.relative_to(self.skills_dir))
+        except ValueError:
+            return str(skill_dir)
+
+    @staticmethod
+    def _file_matches(path: Path, recorded: dict | None) -> tuple[bool, dict | None]:
+        """
+        Compare a file against its recorded fingerprint.
+
+        Returns `(content_unchanged, fresh_fingerprint)`; the fresh fingerprint
+        is None when the recorded one can be kept verbatim.
+        """
+        stat_key = file_stat_key(path)
+        if recorded is None:
+            return stat_key is None, None
+        if stat_key is None:
+            return False, None
+        if stat_key == recorded.get("stat"):
+            return True, None
+        digest = file_digest(path)
+        fresh = {"stat": stat_key, "sha256": digest}
+        return digest == recorded.get("sha256"), fresh
+
+    @staticmethod
+    def _fingerprint(path: Path) -> dict | None:
+        stat_key = file_stat_key(path)
+        if stat_key is None:
+            return None
+        return {"stat": stat_key, "sha256": file_digest(path)}
+
+    def lookup(self, skill_dir: Path) -> tuple[str, list[Case], bool] | None:
+        """Return `(category, cases, has_reference_file)` when the entry is still valid."""
+        entry = self.entries.get(self._key(skill_dir))
+        if entry is None:
+            return None
+        yaml_ok, yaml_fresh = self._file_matches(skill_dir / "skill.yaml", entry.get("yaml"))
+        ref_ok, ref_fresh = self._file_matches(
+            skill_dir / "references" / "trigger-examples.md", entry.get("ref")
+        )
+        if not (yaml_ok and ref_ok):
+            return None
+        if yaml_fresh or ref_fresh:
+            if yaml_fresh:
+                entry["yaml"] = yaml_fresh
+            if ref_fresh:
+                entry["ref"] = ref_fresh
+            self.dirty = True
+            self.stats["rehashed"] += 1
+        else:
+            self.stats["reused"] += 1
+        cases = [Case.from_row(row) for row in entry["cases"]]
+        return entry["category"], cases, entry.get("ref") is not None
+
+    def store(self, skill_dir: Path, category: str, cases: list[Case]) -> None:
+        self.entries[self._key(skill_dir)] = {
+            "yaml": self._fingerprint(skill_dir / "skill.yaml"),
+            "ref": self._fingerprint(skill_dir / "references" / "trigger-examples.md"),
+            "category": category,
+            "cases": [c.to_row() for c in cases],
+        }
+        self.dirty = True
+        self.stats["parsed"] += 1
+
+    def prune(self, seen_keys: set[str]) -> None:
+        for key in sorted(set(self.entries) - seen_keys):
+            del self.entries[key]
+            self.dirty = True
+            self.stats["pruned"] += 1
+
+    def verify(self) -> list[str]:
+        """Re-hash and re-parse every indexed skill; return human-readable problems."""
+        problems: list[str] = []
+        seen: set[str] = set()
+        for skill_dir in iter_skill_dirs(self.skills_dir):
+            key = self._key(skill_dir)
+            seen.add(key)
+            entry = self.entries.get(key)
+            if entry is None:
+                problems.append(f"missing entry: {key}")
+                continue
+            for name, path in (
+                ("yaml", skill_dir / "skill.yaml"),
+                ("ref", skill_dir / "references" / "trigger-examples.md"),
+            ):
+                recorded = entry.get(name)
+                current = self._fingerprint(path)
+                if (recorded or {}).get("sha256") != (current or {}).get("sha256"):
+                    problems.append(f"stale {name}: {key}")
+            fresh_rows = [c.to_row() for c in parse_trigger_examples(skill_dir, self.id_scheme)]
+            if fresh_rows != entry.get("cases"):
+                problems.append(f"stale cases: {key}")
+            if skill_category(skill_dir, self.skills_dir) != entry.get("category"):
+                problems.append(f"stale category: {key}")
+        for key in sorted(set(self.entries) - seen):
+            problems.append(f"orphan entry: {key}")
+        return problems
+
+
+def scan_skill_dir(
+    skill_dir: Path,
+    parse_all: bool,
+    category: str | None = None,
+    skills_dir: Path = SKILLS_DIR,
+    id_scheme: str = "ordinal",
+) -> tuple[str, list[Case] | None, bool]:
+    """
+    Parse one skill's examples; its category is read from skill.yaml unless
+    already known (from the catalog).
+
+    Non-manual skills are only parsed when `parse_all` is set. Module-level so it
+    can run inside a process pool worker.
+    """
+    if category is None:
+        category = skill_category(skill_dir, skills_dir)
+    if not parse_all and category != "manual":
+        return category, None, False
+    cases = parse_trigger_examples(skill_dir, id_scheme)
+    has_ref = (skill_dir / "references" / "trigger-examples.md").exists()
+    return category, cases, has_ref
+
+
+def scan_skill_dirs(
+    skill_dirs: list[Path],
+    categories: list[str | None],
+    parse_all: bool,
+    jobs: int = 1,
+    id_scheme: str = "ordinal",
+    skills_dir: Path = SKILLS_DIR,
+) -> list[tuple[str, list[Case] | None, bool]]:
+    """
+    Run `scan_skill_dir` over skill dirs under `skills_dir`, fanning out to
+    `jobs` processes; order is preserved.
+    """
+    if jobs <= 1 or len(skill_dirs) < 2:
+        return [
+            scan_skill_dir(d, parse_all, c, skills_dir, id_scheme) for d, c in zip(skill_dirs, categories)
+        ]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(jobs, len(skill_dirs))
+    # Large chunks keep pickling/IPC overhead small relative to parse work.
+    chunksize = max(1, len(skill_dirs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        n = len(skill_dirs)
+        return list(
+            pool.map(
+                scan_skill_dir,
+                skill_dirs,
+                [parse_all] * n,
+                categories,
+                [skills_dir] * n,
+                [id_scheme] * n,
+                chunksize=chunksize,
+            )
+        )
+
+
 def load_all_cases(
-    skills_dir: Path, *, include_non_manual: bool = False
+    skills_dir: Path,
+    *,
+    include_non_manual: bool = False,
+    index: CaseIndex | None = None,
+    jobs: int = 1,
+    catalog_path: Path | None = None,
+    id_scheme: str = "ordinal",
 ) -> tuple[list[Case], list[str], list[str]]:
     all_cases: list[Case] = []
     skipped_non_manual: list[str] = []
     zero_parsed_skills: list[str] = []
-    for skill_dir in iter_skill_dirs(skills_dir):
-        category = skill_category(skill_dir)
+
+    catalog = SkillCatalog(skills_dir, catalog_path).load()
+    skill_dirs = [catalog.skill_dir(entry) for entry in catalog]
+    categories = [entry["category"] for entry in catalog]
+    results: list[tuple[str, list[Case] | None, bool] | None]
+    if index is not None:
+        results = [index.lookup(d) for d in skill_dirs]
+    else:
+        results = [None] * len(skill_dirs)
+
+    # The index stores every skill, so misses are parsed regardless of category.
+    pending = [i for i, r in enumerate(results) if r is None]
+    scanned = scan_skill_dirs(
+        [skill_dirs[i] for i in pending],
+        [categories[i] for i in pending],
+        parse_all=include_non_manual or index is not None,
+        jobs=jobs,
+        id_scheme=id_scheme,
+        skills_dir=catalog.skills_dir,
+    )
+    for i, result in zip(pending, scanned):
+        results[i] = result
+        if index is not None:
+            index.store(skill_dirs[i], result[0], result[1] or [])
+
+    for skill_dir, (category, parsed, has_ref) in zip(skill_dirs, results):
         if not include_non_manual and category != "manual":
             skipped_non_manual.append(f"{skill_dir.name}({category})")
             continue
-        parsed = parse_trigger_examples(skill_dir)
-        ref_path = skill_dir / "references" / "trigger-examples.md"
-        if ref_path.exists() and not parsed:
+        if has_ref and not parsed:
             zero_parsed_skills.append(skill_dir.name)
-        all_cases.extend(parsed)
+        all_cases.extend(parsed or [])
+
+    if index is not None:
+        index.prune({index._key(d) for d in skill_dirs})
+        index.save()
     return all_cases, skipped_non_manual, zero_parsed_skills
 
 
-def report_dataset_notes(skipped_non_manual: list[str], zero_parsed_skills: list[str]) -> None:
+def open_index(args: argparse.Namespace) -> CaseIndex | None:
+    if not args.index:
+        return None
+    return CaseIndex(Path(args.index), Path(args.skills_dir), args.id_scheme).load()
+
+
+def catalog_path(args: argparse.Namespace) -> Path | None:
+    return Path(args.catalog) if args.catalog else None
+
+
+def report_dataset_notes(
+    skipped_non_manual: list[str], zero_parsed_skills: list[str], cases: list[Case] | None = None
+) -> None:
     if skipped_non_manual:
         print(
             "Note: skipped non-manual skills by default: "
@@ -162,14 +523,41 @@ def report_dataset_notes(skipped_non_manual: list[str], zero_parsed_skills: list
             + ", ".join(sorted(zero_parsed_skills)),
             file=sys.stderr,
         )
+    duplicates = duplicate_case_ids(cases or [])
+    if duplicates:
+        print(
+            f"Warning: {len(duplicates)} duplicate prompts (same skill, polarity and normalized text): "
+            + ", ".join(duplicates),
+            file=sys.stderr,
+        )
+
+
+def change_scope(
+    args: argparse.Namespace, cases: list[Case], predictor_paths: Iterable[Path] = ()
+) -> tuple[ChangeScope, list[Case]]:
+    """Plan `--changed-since` and return the scope with the cases it covers."""
+    scope = plan_scope(
+        args.changed_since,
+        SkillCatalog(Path(args.skills_dir), catalog_path(args)).load(),
+        Path(args.results_db) if args.results_db else None,
+        [Path(p) for p in args.predictor_path] + list(predictor_paths),
+    )
+    print(scope.describe(len({c.skill for c in cases})), file=sys.stderr)
+    if scope.skills is not None:
+        cases = [c for c in cases if c.skill in scope.skills]
+    return scope, cases
 
 
 def cmd_summary(args: argparse.Namespace) -> int:
     cases, skipped_non_manual, zero_parsed_skills = load_all_cases(
         Path(args.skills_dir),
         include_non_manual=args.include_non_manual or args.include_always_on,
+        index=open_index(args),
+        jobs=args.jobs,
+        catalog_path=catalog_path(args),
+        id_scheme=args.id_scheme,
     )
-    report_dataset_notes(skipped_non_manual, zero_parsed_skills)
+    report_dataset_notes(skipped_non_manual, zero_parsed_skills, cases)
     if not cases:
         print("No trigger example cases found.")
         return 1
@@ -189,37 +577,81 @@ def cmd_summary(args: argparse.Namespace) -> int:
     return 0
 
 
+def stratified_shards(cases: list[Case], count: int) -> list[list[Case]]:
+    """
+    Deal cases round-robin into `count` shards, skill by skill.
+
+    Cases arrive grouped by skill (positives before negatives), and the dealer
+    carries on from where the previous skill stopped, so shard sizes differ by
+    at most one and every skill and polarity is spread evenly across shards.
+    Always returns `count` shards; with fewer cases than that, some are empty.
+    """
+    shards: list[list[Case]] = [[] for _ in range(count)]
+    for position, case in enumerate(cases):
+        shards[position % count].append(case)
+    return shards
+
+
+def shard_path(out_path: Path, index: int, count: int) -> Path:
+    """`cases.jsonl` -> `cases.shard-2-of-8.jsonl` (1-based, extensions kept)."""
+    base, dot, extensions = out_path.name.partition(".")
+    return out_path.with_name(f"{base}.shard-{index}-of-{count}{dot}{extensions}")
+
+
 def cmd_export(args: argparse.Namespace) -> int:
     cases, skipped_non_manual, zero_parsed_skills = load_all_cases(
         Path(args.skills_dir),
         include_non_manual=args.include_non_manual or args.include_always_on,
+        index=open_index(args),
+        jobs=args.jobs,
+        catalog_path=catalog_path(args),
+        id_scheme=args.id_scheme,
     )
-    report_dataset_notes(skipped_non_manual, zero_parsed_skills)
+    report_dataset_notes(skipped_non_manual, zero_parsed_skills, cases)
     if not cases:
         print("No trigger example cases found.", file=sys.stderr)
         return 1
+    scope = None
+    if args.changed_since:
+        scope, cases = change_scope(args, cases)
 
     out_path = Path(args.out) if args.out else None
-    records = []
-    for c in cases:
-        rec = asdict(c)
-        rec["expected_trigger"] = c.polarity == "positive"
-        rec["expected_skill"] = c.skill
-        records.append(rec)
-
-    if out_path:
+    if args.shards > 1:
+        if out_path is None:
+            raise SystemExit("--shards needs --out (shard files are named after it)")
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        with out_path.open("w", encoding="utf-8") as f:
-            for rec in records:
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-        print(f"Wrote {len(records)} cases to {out_path}")
+        # Small (or --changed-since narrowed) exports still write --shards files, so the
+        # `-of-N` names match what the caller globs for.
+        for index, shard in enumerate(stratified_shards(cases, args.shards), start=1):
+            path = shard_path(out_path, index, args.shards)
+            with open_text(path, "w") as f:
+                f.writelines(case_to_jsonl(c) + "\n" for c in shard)
+            print(f"Wrote {len(shard)} cases to {path}")
+    elif out_path:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with open_text(out_path, "w") as f:
+            f.writelines(case_to_jsonl(c) + "\n" for c in cases)
+        print(f"Wrote {len(cases)} cases to {out_path}")
     else:
-        for rec in records:
-            print(json.dumps(rec, ensure_ascii=False))
+        sys.stdout.writelines(case_to_jsonl(c) + "\n" for c in cases)
 
     return 0
 
 
+def _parse_scores(value) -> dict[str, float] | None:
+    """`{skill: score}` prediction map with numeric scores, or None for bare skill names."""
+    if not isinstance(value, dict):
+        return None
+    return {
+        name.strip(): float(score)
+        for name, score in value.items()
+        if isinstance(name, str)
+        and name.strip()
+        and isinstance(score, (int, float))
+        and not isinstance(score, bool)
+    }
+
+
 def _normalize_predicted(value) -> list[str]:
     if value is None:
         return []
@@ -234,9 +666,35 @@ def _normalize_predicted(value) -> list[str]:
     return []
 
 
-def load_predictions(pred_path: Path) -> dict[str, list[str]]:
-    preds: dict[str, list[str]] = {}
-    with pred_path.open("r", encoding="utf-8") as f:
+def _predicted_and_scores(value, threshold: float) -> tuple[list[str], dict[str, float] | None]:
+    """Predicted skill names plus the parsed `{skill: score}` map (None for bare names)."""
+    scores = _parse_scores(value)
+    if scores is not None:
+        return [name for name, score in scores.items() if score >= threshold], scores
+    return _normalize_predicted(value), None
+
+
+def _parse_latency(value) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value) if value >= 0 else None
+
+
+def iter_predictions(
+    pred_path: Path,
+    latencies: dict[str, float] | None = None,
+    scores: dict[str, dict[str, float]] | None = None,
+    threshold: float = DEFAULT_SCORE_THRESHOLD,
+) -> Iterator[tuple[str, list[str]]]:
+    """
+    Yield `(case_id, predicted_skills)` rows from a predictions JSONL file.
+
+    When `latencies` is given, each row's optional `latency_ms` is recorded in it.
+    `predicted` may be a `{skill: score}` map: skills scoring `>= threshold` are
+    the predicted set, and the full map is recorded in `scores` when given. A
+    repeated id replaces both, so they always describe the last row for an id.
+    """
+    with open_text(pred_path) as f:
         for lineno, raw in enumerate(f, start=1):
             line = raw.strip()
             if not line:
@@ -257,12 +715,33 @@ def load_predictions(pred_path: Path) -> dict[str, list[str]]:
             if predicted is None and "predicted_skills" in obj:
                 predicted = obj.get("predicted_skills")
 
-            preds[case_id.strip()] = _normalize_predicted(predicted)
+            if latencies is not None:
+                latency = _parse_latency(obj.get("latency_ms"))
+                if latency is not None:
+                    latencies[case_id.strip()] = latency
+                else:
+                    latencies.pop(case_id.strip(), None)
+
+            names, row_scores = _predicted_and_scores(predicted, threshold)
+            if scores is not None:
+                if row_scores is not None:
+                    scores[case_id.strip()] = row_scores
+                else:
+                    scores.pop(case_id.strip(), None)
 
-    return preds
+            yield case_id.strip(), names
 
 
-def _write_csv(path: Path, fieldnames: list[str], rows: list[dict]) -> None:
+def load_predictions(
+    pred_path: Path,
+    latencies: dict[str, float] | None = None,
+    scores: dict[str, dict[str, float]] | None = None,
+    threshold: float = DEFAULT_SCORE_THRESHOLD,
+) -> dict[str, list[str]]:
+    return dict(iter_predictions(pred_path, latencies, scores, threshold))
+
+
+def _write_csv(path: Path, fieldnames: list[str], rows: Iterable[dict]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -271,149 +750,332 @@ def _write_csv(path: Path, fieldnames: list[str], rows: list[dict]) -> None:
             writer.writerow({k: row.get(k, "") for k in fieldnames})
 
 
-def cmd_score(args: argparse.Namespace) -> int:
-    cases, skipped_non_manual, zero_parsed_skills = load_all_cases(
-        Path(args.skills_dir),
-        include_non_manual=args.include_non_manual or args.include_always_on,
-    )
-    report_dataset_notes(skipped_non_manual, zero_parsed_skills)
-    if not cases:
-        print("No trigger example cases found.", file=sys.stderr)
-        return 1
+def spill_sorted_runs(
+    records: Iterable[list], chunk_rows: int, tmp_dir: Path
+) -> list[list[list]] | list[Path]:
+    """
+    Sort `[id, seq, payload]` records by `(id, seq)` in chunks of `chunk_rows`.
 
-    pred_path = Path(args.predictions)
-    predictions = load_predictions(pred_path)
-
-    totals = {
-        "positive_total": 0,
-        "positive_hit": 0,
-        "positive_miss": 0,
-        "negative_total": 0,
-        "negative_correct_reject": 0,
-        "negative_false_trigger": 0,  # any predicted skill on a negative case
-        "negative_false_trigger_self": 0,  # predicted the source skill on its own near-miss case
-        "positive_extra_skill_predictions": 0,
-        "missing_predictions": 0,
-    }
+    Returns the single sorted chunk in memory when everything fits, otherwise the
+    paths of sorted JSONL run files written under `tmp_dir`.
+    """
+    runs: list[Path] = []
+    buf: list[list] = []
 
-    by_skill: dict[str, dict[str, int]] = {}
-    details: list[str] = []
-    detail_rows: list[dict[str, str]] = []
-    pos_confusions: dict[tuple[str, str], int] = {}
-    pos_cotriggers: dict[tuple[str, str], int] = {}
-    neg_false_confusions: dict[tuple[str, str], int] = {}
+    def flush() -> None:
+        buf.sort(key=lambda r: (r[0], r[1]))
+        run_path = tmp_dir / f"run-{len(runs):05d}.jsonl"
+        with run_path.open("w", encoding="utf-8") as f:
+            for rec in buf:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        runs.append(run_path)
+        buf.clear()
+
+    for rec in records:
+        buf.append(rec)
+        if len(buf) >= chunk_rows:
+            flush()
+    if not runs:
+        buf.sort(key=lambda r: (r[0], r[1]))
+        return [buf]
+    if buf:
+        flush()
+    return runs
+
+
+def merge_sorted_runs(runs: list[list[list]] | list[Path]) -> Iterator[list]:
+    """k-way merge of runs from `spill_sorted_runs`, reading run files line by line."""
+    if runs and not isinstance(runs[0], Path):
+        yield from runs[0]
+        return
+
+    def read_run(path: Path) -> Iterator[list]:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    yield from heapq.merge(*(read_run(p) for p in runs), key=lambda r: (r[0], r[1]))
+
+
+def format_detail_line(row: dict[str, str]) -> str:
+    if row["kind"] == "MISS":
+        return f"MISS\t{row['id']}\t{row['prompt']}"
+    return f"{row['kind']}\t{row['id']}\t{row['predicted_skills']}\t{row['prompt']}"
+
+
+DETAIL_FIELDS = ["kind", "id", "skill", "polarity", "predicted_skills", "prompt", "source"]
+PER_SKILL_FIELDS = [
+    "skill",
+    "positive_total",
+    "positive_hit",
+    "negative_total",
+    "negative_false_trigger",
+    "negative_false_trigger_self",
+    "missing_predictions",
+]
+
+
+# ScoreTally attribute, CSV stem and column names for each confusion kind.
+CONFUSION_KINDS = {
+    "pos_confusions": ("positive_miss_confusions", "expected", "predicted"),
+    "pos_cotriggers": ("positive_cotriggers", "expected", "extra"),
+    "neg_false_confusions": ("negative_false_trigger_confusions", "near_miss_for", "predicted"),
+}
 
-    for case in cases:
-        skill_stats = by_skill.setdefault(
-            case.skill,
+
+class ScoreTally:
+    """
+    Incremental scorer: feed `(case, predicted)` pairs one at a time.
+
+    Counters and confusion tallies are updated in place; every MISS / EXTRA /
+    FALSE_TRIGGER detail row is handed to `on_detail` instead of being kept here.
+    """
+
+    def __init__(self, on_detail: Callable[[dict[str, str]], None]) -> None:
+        self.on_detail = on_detail
+        self.totals = {
+            "positive_total": 0,
+            "positive_hit": 0,
+            "positive_miss": 0,
+            "negative_total": 0,
+            "negative_correct_reject": 0,
+            "negative_false_trigger": 0,  # any predicted skill on a negative case
+            "negative_false_trigger_self": 0,  # predicted the source skill on its own near-miss case
+            "positive_extra_skill_predictions": 0,
+            "missing_predictions": 0,
+        }
+        self.by_skill: dict[str, dict[str, int]] = {}
+        # Positive cases with extra predicted skills, by skill (kept out of per_skill.csv).
+        self.extra_by_skill: dict[str, int] = {}
+        # language -> [positive_hit, positive_total, negative_correct_reject, negative_total]
+        self.by_language: dict[str, list[int]] = {}
+        self.skill_ids = SkillIds()
+        self.pos_confusions = ConfusionMatrix(self.skill_ids)
+        self.pos_cotriggers = ConfusionMatrix(self.skill_ids)
+        self.neg_false_confusions = ConfusionMatrix(self.skill_ids)
+
+    def _detail(self, kind: str, case: Case, predicted: Iterable[str]) -> None:
+        self.on_detail(
             {
-                "positive_total": 0,
-                "positive_hit": 0,
-                "negative_total": 0,
-                "negative_false_trigger": 0,  # any
-                "negative_false_trigger_self": 0,
-                "missing_predictions": 0,
-            },
+                "kind": kind,
+                "id": case.id,
+                "skill": case.skill,
+                "polarity": case.polarity,
+                "prompt": case.prompt,
+                "predicted_skills": ",".join(sorted(predicted)),
+                "source": case.source,
+            }
         )
-        predicted = predictions.get(case.id)
+
+    def add(self, case: Case, predicted: list[str] | None, sign: int = 1) -> str:
+        """
+        Tally one case; return its outcome: HIT / MISS (positive) or REJECT / FALSE_TRIGGER.
+
+        `sign=-1` retracts a previously added case (no detail rows are emitted),
+        which lets cached aggregates be updated incrementally.
+        """
+        totals = self.totals
+        skill_stats = self.by_skill.get(case.skill)
+        if skill_stats is None:
+            skill_stats = self.by_skill[case.skill] = {k: 0 for k in PER_SKILL_FIELDS[1:]}
         if predicted is None:
             predicted = []
-            totals["missing_predictions"] += 1
-            skill_stats["missing_predictions"] += 1
+            totals["missing_predictions"] += sign
+            skill_stats["missing_predictions"] += sign
 
         predicted_set = {p.strip() for p in predicted if p.strip()}
         expected = case.skill
+        emit = sign > 0
+        language = self.by_language.get(case.language)
+        if language is None:
+            language = self.by_language[case.language] = [0, 0, 0, 0]
 
         if case.polarity == "positive":
-            totals["positive_total"] += 1
-            skill_stats["positive_total"] += 1
+            totals["positive_total"] += sign
+            skill_stats["positive_total"] += sign
+            language[1] += sign
             if expected in predicted_set:
-                totals["positive_hit"] += 1
-                skill_stats["positive_hit"] += 1
+                totals["positive_hit"] += sign
+                skill_stats["positive_hit"] += sign
+                language[0] += sign
+                outcome = "HIT"
             else:
-                totals["positive_miss"] += 1
-                details.append(f"MISS\t{case.id}\t{case.prompt}")
-                detail_rows.append(
-                    {
-                        "kind": "MISS",
-                        "id": case.id,
-                        "skill": case.skill,
-                        "polarity": case.polarity,
-                        "prompt": case.prompt,
-                        "predicted_skills": ",".join(sorted(predicted_set)),
-                        "source": case.source,
-                    }
-                )
-                for wrong in sorted(predicted_set):
-                    pos_confusions[(expected, wrong)] = pos_confusions.get((expected, wrong), 0) + 1
+                outcome = "MISS"
+                totals["positive_miss"] += sign
+                if emit:
+                    self._detail("MISS", case, predicted_set)
+                self.pos_confusions.add_row(expected, predicted_set, sign)
             extra = predicted_set - {expected}
             if extra:
-                totals["positive_extra_skill_predictions"] += 1
-                for wrong in sorted(extra):
-                    pos_cotriggers[(expected, wrong)] = pos_cotriggers.get((expected, wrong), 0) + 1
-                details.append(
-                    f"EXTRA\t{case.id}\t{','.join(sorted(extra))}\t{case.prompt}"
-                )
-                detail_rows.append(
-                    {
-                        "kind": "EXTRA",
-                        "id": case.id,
-                        "skill": case.skill,
-                        "polarity": case.polarity,
-                        "prompt": case.prompt,
-                        "predicted_skills": ",".join(sorted(extra)),
-                        "source": case.source,
-                    }
-                )
+                totals["positive_extra_skill_predictions"] += sign
+                self.extra_by_skill[expected] = self.extra_by_skill.get(expected, 0) + sign
+                self.pos_cotriggers.add_row(expected, extra, sign)
+                if emit:
+                    self._detail("EXTRA", case, extra)
+            return outcome
         else:
-            totals["negative_total"] += 1
-            skill_stats["negative_total"] += 1
+            totals["negative_total"] += sign
+            skill_stats["negative_total"] += sign
+            language[3] += sign
             if predicted_set:
-                totals["negative_false_trigger"] += 1
-                skill_stats["negative_false_trigger"] += 1
-                for wrong in sorted(predicted_set):
-                    neg_false_confusions[(expected, wrong)] = (
-                        neg_false_confusions.get((expected, wrong), 0) + 1
-                    )
-                details.append(
-                    f"FALSE_TRIGGER\t{case.id}\t{','.join(sorted(predicted_set))}\t{case.prompt}"
-                )
-                detail_rows.append(
-                    {
-                        "kind": "FALSE_TRIGGER",
-                        "id": case.id,
-                        "skill": case.skill,
-                        "polarity": case.polarity,
-                        "prompt": case.prompt,
-                        "predicted_skills": ",".join(sorted(predicted_set)),
-                        "source": case.source,
-                    }
-                )
+                totals["negative_false_trigger"] += sign
+                skill_stats["negative_false_trigger"] += sign
+                self.neg_false_confusions.add_row(expected, predicted_set, sign)
+                if emit:
+                    self._detail("FALSE_TRIGGER", case, predicted_set)
                 if expected in predicted_set:
-                    totals["negative_false_trigger_self"] += 1
-                    skill_stats["negative_false_trigger_self"] += 1
-            else:
-                totals["negative_correct_reject"] += 1
+                    totals["negative_false_trigger_self"] += sign
+                    skill_stats["negative_false_trigger_self"] += sign
+                return "FALSE_TRIGGER"
+            totals["negative_correct_reject"] += sign
+            language[2] += sign
+            return "REJECT"
+
+    def prune_empty(self) -> None:
+        """Drop skills whose counts were retracted to zero (zero matrix cells are never reported)."""
+        for skill in [k for k, v in self.by_skill.items() if not any(v.values())]:
+            del self.by_skill[skill]
+        for skill in [k for k, v in self.extra_by_skill.items() if not v]:
+            del self.extra_by_skill[skill]
+        for language in [k for k, v in self.by_language.items() if not any(v)]:
+            del self.by_language[language]
+
+    def to_state(self) -> dict:
+        return {
+            "totals": self.totals,
+            "by_skill": self.by_skill,
+            "extra_by_skill": self.extra_by_skill,
+            "by_language": self.by_language,
+            **{
+                name: [[a, b, n] for (a, b), n in getattr(self, name).items()]
+                for name in CONFUSION_KINDS
+            },
+        }
+
+    def load_state(self, state: dict) -> None:
+        self.totals.update(state["totals"])
+        self.by_skill = {skill: dict(stats) for skill, stats in state["by_skill"].items()}
+        self.extra_by_skill = dict(state.get("extra_by_skill", {}))
+        self.by_language = {language: list(counts) for language, counts in state.get("by_language", {}).items()}
+        for name in CONFUSION_KINDS:
+            getattr(self, name).load(state[name])
+
+    @property
+    def positive_recall(self) -> float:
+        t = self.totals
+        return t["positive_hit"] / t["positive_total"] if t["positive_total"] else 0.0
+
+    @property
+    def negative_reject_rate(self) -> float:
+        t = self.totals
+        return t["negative_correct_reject"] / t["negative_total"] if t["negative_total"] else 0.0
+
+    def overall_rows(self) -> list[dict[str, str | int]]:
+        totals = self.totals
+        return [
+            {"metric": "positive_total", "value": totals["positive_total"]},
+            {"metric": "positive_hit", "value": totals["positive_hit"]},
+            {"metric": "positive_miss", "value": totals["positive_miss"]},
+            {"metric": "positive_recall", "value": f"{self.positive_recall:.6f}"},
+            {"metric": "negative_total", "value": totals["negative_total"]},
+            {"metric": "negative_correct_reject", "value": totals["negative_correct_reject"]},
+            {"metric": "negative_false_trigger", "value": totals["negative_false_trigger"]},
+            {
+                "metric": "negative_false_trigger_self",
+                "value": totals["negative_false_trigger_self"],
+            },
+            {"metric": "negative_reject_rate", "value": f"{self.negative_reject_rate:.6f}"},
+            {"metric": "missing_predictions", "value": totals["missing_predictions"]},
+            {
+                "metric": "positive_extra_skill_predictions",
+                "value": totals["positive_extra_skill_predictions"],
+            },
+        ]
 
-    positive_recall = (
-        totals["positive_hit"] / totals["positive_total"] if totals["positive_total"] else 0.0
-    )
-    negative_reject_rate = (
-        totals["negative_correct_reject"] / totals["negative_total"]
-        if totals["negative_total"]
-        else 0.0
-    )
+    def per_skill_rows(self) -> list[dict[str, str | int]]:
+        return [{"skill": skill, **self.by_skill[skill]} for skill in sorted(self.by_skill)]
+
+
+LATENCY_FIELDS = ["samples", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+LATENCY_BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class LatencyStats:
+    """
+    Per-prompt predictor latency samples (ms), overall and by skill / language.
+
+    Percentiles use the nearest-rank method, so every reported value is an
+    observed sample.
+    """
 
+    def __init__(self) -> None:
+        self.overall: list[float] = []
+        self.by_skill: dict[str, list[float]] = {}
+        self.by_language: dict[str, list[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.overall)
+
+    def add(self, case: Case, latency_ms: float | None) -> None:
+        if latency_ms is None:
+            return
+        self.overall.append(latency_ms)
+        self.by_skill.setdefault(case.skill, []).append(latency_ms)
+        self.by_language.setdefault(case.language, []).append(latency_ms)
+
+    @staticmethod
+    def summarize(samples: list[float]) -> dict[str, str | int]:
+        ordered = sorted(samples)
+        n = len(ordered)
+
+        def rank(q: int) -> str:
+            # Nearest rank: ceil(q / 100 * n), 1-based.
+            return f"{ordered[max(0, -(-q * n // 100) - 1)]:.3f}" if n else ""
+
+        return {
+            "samples": n,
+            "p50_ms": rank(50),
+            "p90_ms": rank(90),
+            "p99_ms": rank(99),
+            "max_ms": f"{ordered[-1]:.3f}" if n else "",
+        }
+
+    def overall_rows(self) -> list[dict[str, str | int]]:
+        summary = self.summarize(self.overall)
+        return [
+            {"metric": "latency_samples", "value": summary["samples"]},
+            *({"metric": f"latency_{key}", "value": summary[key]} for key in LATENCY_FIELDS[1:]),
+        ]
+
+    def group_rows(self) -> list[dict[str, str | int]]:
+        """Rows for latency.csv: one per scope (overall, each language, each skill)."""
+        rows: list[dict[str, str | int]] = [{"scope": "overall", "group": "all", **self.summarize(self.overall)}]
+        for language in sorted(self.by_language):
+            rows.append({"scope": "language", "group": language, **self.summarize(self.by_language[language])})
+        for skill in sorted(self.by_skill):
+            rows.append({"scope": "skill", "group": skill, **self.summarize(self.by_skill[skill])})
+        return rows
+
+    def histogram_rows(self) -> list[dict[str, str | int]]:
+        counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for value in self.overall:
+            counts[bisect.bisect_left(LATENCY_BUCKETS_MS, value)] += 1
+        labels = [str(b) for b in LATENCY_BUCKETS_MS] + ["inf"]
+        return [{"le_ms": label, "count": count} for label, count in zip(labels, counts)]
+
+
+def print_score_report(tally: ScoreTally) -> None:
+    totals = tally.totals
     print("Overall")
     print(f"- Positive cases: {totals['positive_total']}")
     print(f"- Positive hits: {totals['positive_hit']}")
     print(f"- Positive misses: {totals['positive_miss']}")
-    print(f"- Positive recall: {positive_recall:.3f}")
+    print(f"- Positive recall: {tally.positive_recall:.3f}")
     print(f"- Negative cases: {totals['negative_total']}")
     print(f"- Correct rejects: {totals['negative_correct_reject']}")
     print(f"- False triggers: {totals['negative_false_trigger']}")
     print(f"- False triggers (same skill near-miss): {totals['negative_false_trigger_self']}")
-    print(f"- Negative reject rate: {negative_reject_rate:.3f}")
+    print(f"- Negative reject rate: {tally.negative_reject_rate:.3f}")
     print(f"- Missing predictions: {totals['missing_predictions']}")
     print(
         f"- Positive cases with extra skill predictions: {totals['positive_extra_skill_predictions']}"
@@ -421,138 +1083,1437 @@ def cmd_score(args: argparse.Namespace) -> int:
 
     print("\nPer skill")
     print("skill\tpos_hit/pos_total\tneg_false_any/neg_total\tneg_false_self/neg_total\tmissing_preds")
-    for skill in sorted(by_skill):
-        s = by_skill[skill]
+    for skill in sorted(tally.by_skill):
+        s = tally.by_skill[skill]
         print(
             f"{skill}\t{s['positive_hit']}/{s['positive_total']}\t"
             f"{s['negative_false_trigger']}/{s['negative_total']}\t"
             f"{s['negative_false_trigger_self']}/{s['negative_total']}\t{s['missing_predictions']}"
         )
 
-    if args.fail_on_miss and (totals["positive_miss"] > 0 or totals["negative_false_trigger"] > 0):
-        exit_code = 2
-    else:
-        exit_code = 0
 
-    if args.details:
-        print("\nDetails")
-        for line in details:
-            print(line)
+def print_latency_report(latency: LatencyStats) -> None:
+    print(f"\nPredictor latency (ms, {len(latency)} samples)")
+    print("scope\tgroup\tsamples\tp50\tp90\tp99\tmax")
+    for row in latency.group_rows():
+        print(
+            f"{row['scope']}\t{row['group']}\t{row['samples']}\t{row['p50_ms']}\t"
+            f"{row['p90_ms']}\t{row['p99_ms']}\t{row['max_ms']}"
+        )
 
-    if args.confusion:
-        def _print_pairs(title: str, pairs: dict[tuple[str, str], int], left: str, right: str) -> None:
-            print(f"\n{title}")
-            if not pairs:
-                print("- none")
-                return
-            print(f"{left}\t{right}\tcount")
-            for (a, b), count in sorted(pairs.items(), key=lambda kv: (-kv[1], kv[0][0], kv[0][1]))[: args.top]:
-                print(f"{a}\t{b}\t{count}")
-
-        _print_pairs(
-            "Positive Miss Confusions (expected -> predicted wrong skill)",
-            pos_confusions,
-            "expected",
-            "predicted",
+
+BOOTSTRAP_FIELDS = ["scope", "group", "metric", "estimate", "lo", "hi", "n"]
+
+
+def bootstrap_rows(tally: ScoreTally, args: argparse.Namespace) -> list[dict[str, str | int]]:
+    """
+    Bootstrap intervals for recall / reject rate, overall, per language and per
+    skill. A `--changed-since` merged tally has no language counts (stored runs
+    keep per-skill metrics only), so it gets overall and per-skill rows.
+    """
+    totals = tally.totals
+    keys: list[tuple[str, str, str]] = [
+        ("overall", "all", "positive_recall"),
+        ("overall", "all", "negative_reject_rate"),
+    ]
+    groups = [
+        (totals["positive_hit"], totals["positive_total"]),
+        (totals["negative_correct_reject"], totals["negative_total"]),
+    ]
+    for language in sorted(tally.by_language):
+        hits, positives, rejects, negatives = tally.by_language[language]
+        keys += [("language", language, "positive_recall"), ("language", language, "negative_reject_rate")]
+        groups += [(hits, positives), (rejects, negatives)]
+    for skill in sorted(tally.by_skill):
+        s = tally.by_skill[skill]
+        keys += [("skill", skill, "positive_recall"), ("skill", skill, "negative_reject_rate")]
+        groups += [
+            (s["positive_hit"], s["positive_total"]),
+            (s["negative_total"] - s["negative_false_trigger"], s["negative_total"]),
+        ]
+    sampler = BinomialSampler(args.bootstrap_seed)
+    intervals = proportion_intervals(groups, args.bootstrap, args.confidence, sampler)
+    rows = []
+    for (scope, group, metric), (hits, total), interval in zip(keys, groups, intervals):
+        if interval is None:
+            continue
+        rows.append(
+            {
+                "scope": scope,
+                "group": group,
+                "metric": metric,
+                "estimate": f"{hits / total:.6f}",
+                "lo": f"{interval[0]:.6f}",
+                "hi": f"{interval[1]:.6f}",
+                "n": total,
+            }
         )
-        _print_pairs(
-            "Positive Co-Trigger Confusions (expected + extra predicted skill)",
-            pos_cotriggers,
-            "expected",
-            "extra",
+    return rows
+
+
+def print_bootstrap(rows: list[dict[str, str | int]], args: argparse.Namespace) -> None:
+    print(f"\nBootstrap {args.confidence:.0%} intervals ({args.bootstrap} resamples)")
+    print("scope\tgroup\tmetric\testimate\tinterval\tn")
+    for row in rows:
+        print(
+            f"{row['scope']}\t{row['group']}\t{row['metric']}\t{float(row['estimate']):.3f}\t"
+            f"[{float(row['lo']):.3f}, {float(row['hi']):.3f}]\t{row['n']}"
         )
-        _print_pairs(
-            "Negative False Trigger Confusions (near-miss source -> predicted skill)",
-            neg_false_confusions,
-            "near_miss_for",
-            "predicted",
+
+
+def case_scores(scores: dict[str, float] | None, predicted: list[str] | None) -> dict[str, float]:
+    """A case's `{skill: score}` map; bare predicted names count as score 1.0."""
+    if scores is not None:
+        return scores
+    return dict.fromkeys(predicted or (), 1.0)
+
+
+def sweep_pairs(
+    pairs: Iterable[tuple[Case, list[str]]], scores: dict[str, dict[str, float]], sweep: ThresholdSweep
+) -> Iterator[tuple[Case, list[str]]]:
+    """Pass `(case, predicted)` pairs through, feeding each case's scores to `sweep`."""
+    for case, predicted in pairs:
+        sweep.add(case.skill, case.polarity, case_scores(scores.get(case.id), predicted))
+        yield case, predicted
+
+
+def print_threshold_sweep(
+    curve: list[dict[str, str | int]], skill_rows: list[dict[str, str | int]], args: argparse.Namespace
+) -> None:
+    print(f"\nThreshold sweep ({len(curve)} thresholds; a skill triggers when its score >= threshold)")
+    print("at\tthreshold\ttriggers\tprecision\trecall\tfalse_trigger_rate\tf1")
+    # The curve is ordered by descending threshold; the operating point is the last row at or above it.
+    operating = None
+    for row in curve:
+        if float(row["threshold"]) < args.threshold:
+            break
+        operating = row
+    for label, row in (("best_f1", best_curve_row(curve)), ("--threshold", operating)):
+        if row is None:
+            print(f"{label}\t-\t0\t-\t-\t-\t-")
+            continue
+        print(
+            f"{label}\t{row['threshold']}\t{row['triggers']}\t{float(row['precision']):.3f}\t"
+            f"{float(row['recall']):.3f}\t{float(row['false_trigger_rate']):.3f}\t{float(row['f1']):.3f}"
         )
 
-    if args.csv_out:
-        out_dir = Path(args.csv_out)
+    gains = sorted(
+        (
+            (float(row["f1"]) - float(row["f1_at_threshold"]), row)
+            for row in skill_rows
+            if row["best_threshold"] != "" and float(row["f1"]) > float(row["f1_at_threshold"])
+        ),
+        key=lambda item: (-item[0], item[1]["skill"]),
+    )
+    print(f"\nPer-skill optimal thresholds (largest F1 gain over --threshold {args.threshold:g} first)")
+    if not gains:
+        print("- none (--threshold is already F1-optimal for every skill)")
+        return
+    print("skill\tbest_threshold\tf1\tf1_at_threshold\tprecision\trecall")
+    for _, row in gains[: args.top]:
+        print(
+            f"{row['skill']}\t{row['best_threshold']}\t{float(row['f1']):.3f}\t"
+            f"{float(row['f1_at_threshold']):.3f}\t{float(row['precision']):.3f}\t{float(row['recall']):.3f}"
+        )
 
-        overall_rows = [
-            {"metric": "positive_total", "value": totals["positive_total"]},
-            {"metric": "positive_hit", "value": totals["positive_hit"]},
-            {"metric": "positive_miss", "value": totals["positive_miss"]},
-            {"metric": "positive_recall", "value": f"{positive_recall:.6f}"},
-            {"metric": "negative_total", "value": totals["negative_total"]},
-            {"metric": "negative_correct_reject", "value": totals["negative_correct_reject"]},
-            {"metric": "negative_false_trigger", "value": totals["negative_false_trigger"]},
-            {
-                "metric": "negative_false_trigger_self",
-                "value": totals["negative_false_trigger_self"],
-            },
-            {"metric": "negative_reject_rate", "value": f"{negative_reject_rate:.6f}"},
-            {"metric": "missing_predictions", "value": totals["missing_predictions"]},
+
+def print_confusions(tally: ScoreTally, top: int) -> None:
+    def _print_pairs(title: str, pairs: ConfusionMatrix, left: str, right: str) -> None:
+        print(f"\n{title}")
+        ranked = pairs.top(top)
+        if not ranked:
+            print("- none")
+            return
+        print(f"{left}\t{right}\tcount")
+        for (a, b), count in ranked:
+            print(f"{a}\t{b}\t{count}")
+
+    _print_pairs(
+        "Positive Miss Confusions (expected -> predicted wrong skill)",
+        tally.pos_confusions,
+        "expected",
+        "predicted",
+    )
+    _print_pairs(
+        "Positive Co-Trigger Confusions (expected + extra predicted skill)",
+        tally.pos_cotriggers,
+        "expected",
+        "extra",
+    )
+    _print_pairs(
+        "Negative False Trigger Confusions (near-miss source -> predicted skill)",
+        tally.neg_false_confusions,
+        "near_miss_for",
+        "predicted",
+    )
+
+
+def write_matrix_csv(path: Path, matrix: ConfusionMatrix, left: str, right: str) -> None:
+    """Dense matrix over the skills in any non-zero confusion cell, sorted by name."""
+    names, rows = matrix.dense()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([f"{left}\\{right}", *names])
+        writer.writerows([name, *row] for name, row in zip(names, rows))
+
+
+def score_tables(
+    tally: ScoreTally,
+    detail_rows: list[dict[str, str]] | None,
+    latency: LatencyStats | None = None,
+) -> dict[str, tuple[list[str], list[dict]]]:
+    """
+    The CSV bundle as `{file name: (fieldnames, rows)}`; `detail_rows=None`
+    leaves out details.csv (already streamed to disk).
+    """
+    overall_rows = tally.overall_rows()
+    per_skill_fields = PER_SKILL_FIELDS
+    per_skill_rows = tally.per_skill_rows()
+    tables: dict[str, tuple[list[str], list[dict]]] = {}
+    if latency:
+        overall_rows += latency.overall_rows()
+        per_skill_fields = PER_SKILL_FIELDS + [f"latency_{key}" for key in LATENCY_FIELDS[1:]]
+        for row in per_skill_rows:
+            summary = LatencyStats.summarize(latency.by_skill.get(row["skill"], []))
+            row.update({f"latency_{key}": summary[key] for key in LATENCY_FIELDS[1:]})
+        tables["latency.csv"] = (["scope", "group", *LATENCY_FIELDS], latency.group_rows())
+        tables["latency_histogram.csv"] = (["le_ms", "count"], latency.histogram_rows())
+    tables["overall.csv"] = (["metric", "value"], overall_rows)
+    tables["per_skill.csv"] = (per_skill_fields, per_skill_rows)
+    if detail_rows is not None:
+        tables["details.csv"] = (DETAIL_FIELDS, detail_rows)
+    for name, (stem, left, right) in CONFUSION_KINDS.items():
+        tables[f"{stem}.csv"] = (
+            [left, right, "count", "row_rate", "col_rate"],
+            getattr(tally, name).rate_rows(left, right),
+        )
+    return tables
+
+
+def write_tables(out_dir: Path, tables: dict[str, tuple[list[str], list[dict]]]) -> None:
+    for name, (fieldnames, rows) in tables.items():
+        _write_csv(out_dir / name, fieldnames, rows)
+
+
+def write_matrix_csvs(tally: ScoreTally, out_dir: Path) -> None:
+    """A dense `matrix_<kind>.csv` per confusion kind."""
+    for name, (stem, left, right) in CONFUSION_KINDS.items():
+        write_matrix_csv(out_dir / f"matrix_{stem}.csv", getattr(tally, name), left, right)
+
+
+def write_score_csvs(
+    tally: ScoreTally,
+    out_dir: Path,
+    detail_rows: list[dict[str, str]] | None,
+    latency: LatencyStats | None = None,
+    full_matrix: bool = False,
+) -> None:
+    """Write the CSV bundle; `detail_rows=None` means details.csv was already streamed."""
+    write_tables(out_dir, score_tables(tally, detail_rows, latency))
+    if full_matrix:
+        write_matrix_csvs(tally, out_dir)
+
+
+def write_html_report(out_path: Path, tables: dict[str, tuple[list[str], list[dict]]]) -> None:
+    """Render the trigger_eval_report.py layout straight from in-memory result tables."""
+    data = bundle_from_tables({name: rows for name, (_, rows) in tables.items()})
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(build_html(DEFAULT_TITLE, None, data, None), encoding="utf-8")
+
+
+def stream_score(
+    cases: list[Case],
+    pred_path: Path,
+    args: argparse.Namespace,
+    tmp_dir: Path,
+    details_path: Path | None = None,
+    outcome_sink: list[tuple[str, str, str, str]] | None = None,
+) -> tuple[ScoreTally, LatencyStats, ThresholdSweep | None, Path | None]:
+    """
+    Score by external-sorting cases and predictions on `id` and merge-joining them.
+
+    Only `--sort-chunk` rows are held in memory while sorting; detail rows go
+    straight to `details_path` (a details.csv) and to a spool file for
+    `--details`; `outcome_sink` collects `(id, skill, polarity, outcome)` per
+    case. The threshold sweep is returned only when some
+    prediction rows carried scores.
+    """
+    (tmp_dir / "cases").mkdir()
+    (tmp_dir / "preds").mkdir()
+    case_records = ([c.id, seq, c.to_row()] for seq, c in enumerate(cases))
+    case_runs = spill_sorted_runs(case_records, args.sort_chunk, tmp_dir / "cases")
+    # The sorted runs now own the case data; drop the caller's list.
+    cases.clear()
+    row_latency: dict[str, float] = {}
+    row_scores: dict[str, dict[str, float]] = {}
+    scored_rows = 0
+
+    def pred_records() -> Iterator[list]:
+        nonlocal scored_rows
+        rows = iter_predictions(pred_path, row_latency, row_scores, args.threshold)
+        for seq, (case_id, predicted) in enumerate(rows):
+            scores = row_scores.pop(case_id, None)
+            scored_rows += scores is not None
+            yield [case_id, seq, [predicted, row_latency.pop(case_id, None), scores]]
+
+    pred_runs = spill_sorted_runs(pred_records(), args.sort_chunk, tmp_dir / "preds")
+
+    details_csv = None
+    details_writer = None
+    if details_path is not None:
+        details_path.parent.mkdir(parents=True, exist_ok=True)
+        details_csv = details_path.open("w", encoding="utf-8", newline="")
+        details_writer = csv.DictWriter(details_csv, fieldnames=DETAIL_FIELDS)
+        details_writer.writeheader()
+    spool_path = tmp_dir / "details.txt" if args.details else None
+    spool = spool_path.open("w", encoding="utf-8") if spool_path else None
+
+    def on_detail(row: dict[str, str]) -> None:
+        if details_writer is not None:
+            details_writer.writerow(row)
+        if spool is not None:
+            spool.write(format_detail_line(row) + "\n")
+
+    tally = ScoreTally(on_detail)
+    latency = LatencyStats()
+    sweep = ThresholdSweep() if scored_rows else None
+    preds = merge_sorted_runs(pred_runs)
+    pending = next(preds, None)
+    # The prediction matched to the current case id, held for duplicate case rows.
+    matched_id: str | None = None
+    matched: list = [None, None, None]
+    try:
+        for case_id, _, row in merge_sorted_runs(case_runs):
+            if case_id != matched_id:
+                while pending is not None and pending[0] < case_id:
+                    pending = next(preds, None)
+                matched_id, matched = case_id, [None, None, None]
+                # Duplicate prediction ids: the last row in file order wins, as in load_predictions.
+                while pending is not None and pending[0] == case_id:
+                    matched = pending[2]
+                    pending = next(preds, None)
+            predicted, latency_ms, scores = matched
+            case = Case.from_row(row)
+            outcome = tally.add(case, predicted)
+            if outcome_sink is not None:
+                outcome_sink.append((case.id, case.skill, case.polarity, outcome))
+            latency.add(case, latency_ms)
+            if sweep is not None:
+                sweep.add(case.skill, case.polarity, case_scores(scores, predicted))
+    finally:
+        if details_csv is not None:
+            details_csv.close()
+        if spool is not None:
+            spool.close()
+    return tally, latency, sweep, spool_path
+
+
+def load_predictor(spec: str, reload: bool = False) -> Callable[[list[Case]], list]:
+    """
+    Import a batch predictor from `module:function` or `path/to/file.py:function`.
+
+    The function is called with a list of `Case` objects and must return one
+    prediction per case, in order (a skill name, a list of names, or None).
+    `reload=True` re-executes an already imported module (used by `watch`).
+    """
+    module_ref, sep, func_name = spec.rpartition(":")
+    if not sep or not module_ref or not func_name:
+        raise SystemExit(f"--predictor must look like module:function, got {spec!r}")
+    if module_ref.endswith(".py") or os.sep in module_ref:
+        module_path = Path(module_ref).resolve()
+        module_spec = importlib.util.spec_from_file_location(module_path.stem, module_path)
+        if module_spec is None or module_spec.loader is None:
+            raise SystemExit(f"Cannot import predictor file: {module_path}")
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(module_ref)
+        if reload:
+            module = importlib.reload(module)
+    func = getattr(module, func_name, None)
+    if not callable(func):
+        raise SystemExit(f"Predictor {spec!r} does not name a callable")
+    return func
+
+
+def predictor_source_path(spec: str) -> Path | None:
+    """Source file behind a `--predictor` spec, for change detection."""
+    module_ref = spec.rpartition(":")[0]
+    if module_ref.endswith(".py") or os.sep in module_ref:
+        return Path(module_ref).resolve()
+    found = importlib.util.find_spec(module_ref)
+    if found is None or not found.origin or not found.has_location:
+        return None
+    return Path(found.origin)
+
+
+def predictor_version(spec: str, predictor: Callable, paths: Iterable[Path] = ()) -> str:
+    """
+    Prediction cache version of a `--predictor`: a digest of its source file and
+    of `paths`, plus `predictor.cache_key()` when the function defines one (for
+    inputs the source does not show, such as keywords read from skill.yaml).
+    """
+    source = predictor_source_path(spec)
+    cache_key = getattr(predictor, "cache_key", None)
+    return files_version(
+        ([source] if source is not None else []) + list(paths),
+        *([str(cache_key())] if callable(cache_key) else []),
+    )
+
+
+def open_prediction_cache(
+    args: argparse.Namespace, predictor: Callable, paths: Iterable[Path] = ()
+) -> PredictionCache | None:
+    """
+    The `--prediction-cache` for `predictor`. A worker is cached under the name
+    and version it reports in `hello`, combined with the `paths` digest.
+    """
+    if not args.prediction_cache:
+        return None
+    if isinstance(predictor, WorkerClient):
+        name = predictor.name
+        version = args.predictor_version or files_version(list(paths), predictor.version)
+    else:
+        name = args.predictor
+        version = args.predictor_version or predictor_version(args.predictor, predictor, paths)
+    return PredictionCache(Path(args.prediction_cache), name, version, args.prediction_cache_max_entries)
+
+
+def open_predictor_worker(args: argparse.Namespace) -> WorkerClient | None:
+    """Client for `--predictor-worker` (spawned for this session) or `--predictor-socket`, if given."""
+    if args.predictor_worker:
+        return WorkerClient(command=args.predictor_worker, window=args.worker_window)
+    if args.predictor_socket:
+        return WorkerClient(socket_path=Path(args.predictor_socket), window=args.worker_window)
+    return None
+
+
+def timed_batches(
+    predictor: Callable[[list[Case]], list], batches: Iterable[list[Case]]
+) -> Iterator[tuple[list, float]]:
+    """`(results, seconds)` per batch, in order; a worker client pipelines the requests."""
+    if isinstance(predictor, WorkerClient):
+        yield from predictor.map_batches(batches)
+        return
+    for batch in batches:
+        if not batch:
+            yield [], 0.0
+            continue
+        start = time.perf_counter()
+        results = list(predictor(batch))
+        yield results, time.perf_counter() - start
+
+
+def iter_batches(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def predict_in_process(
+    predictor: Callable[[list[Case]], list],
+    cases: list[Case],
+    batch_size: int,
+    latencies: dict[str, float] | None = None,
+    scores: dict[str, dict[str, float]] | None = None,
+    threshold: float = DEFAULT_SCORE_THRESHOLD,
+    cache: PredictionCache | None = None,
+) -> Iterator[tuple[Case, list[str]]]:
+    """
+    Yield `(case, predicted_skills)` by calling `predictor` on consecutive batches.
+
+    When `latencies` is given, each case is recorded with its batch's wall time
+    divided by the batch size (use `--batch-size 1` for true per-prompt latency).
+    `{skill: score}` results are thresholded and recorded in `scores`, as in
+    `iter_predictions`. With a `cache`, only uncached prompts reach `predictor`
+    (cache hits have no latency). A `WorkerClient` gets several batches in
+    flight, and latency is the worker's own time on each request.
+    """
+    # Cache lookups happen as batches are pulled; `pending` lines results back up with their batch.
+    pending: deque = deque()
+
+    def uncached() -> Iterator[list[Case]]:
+        for batch in iter_batches(cases, batch_size):
+            prompts = [case.prompt for case in batch]
+            cached = cache.get_many(prompts) if cache is not None else [MISS] * len(batch)
+            todo = [case for case, value in zip(batch, cached) if value is MISS]
+            pending.append((batch, cached, todo))
+            yield todo
+
+    for results, seconds in timed_batches(predictor, uncached()):
+        batch, cached, todo = pending.popleft()
+        if todo:
+            if len(results) != len(todo):
+                raise ValueError(
+                    f"Predictor returned {len(results)} predictions for a batch of {len(todo)} cases"
+                )
+            if latencies is not None:
+                per_case_ms = seconds * 1000 / len(todo)
+                for case in todo:
+                    latencies[case.id] = per_case_ms
+            if cache is not None:
+                cache.put_many([case.prompt for case in todo], results)
+        fresh = iter(results)
+        for case, value in zip(batch, cached):
+            predicted = next(fresh) if value is MISS else value
+            names, row_scores = _predicted_and_scores(predicted, threshold)
+            if scores is not None and row_scores is not None:
+                scores[case.id] = row_scores
+            yield case, names
+
+
+def case_content_key(case: Case) -> str:
+    raw = "\0".join((case.skill, case.polarity, case.prompt, case.source))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def predicted_key(predicted: list[str] | None) -> str:
+    if predicted is None:
+        return "missing"
+    normalized = sorted({p.strip() for p in predicted if p.strip()})
+    return hashlib.sha1("\x1f".join(normalized).encode("utf-8")).hexdigest()[:20]
+
+
+class OutcomeCache:
+    """
+    Persistent per-case scoring results plus the aggregate tally they add up to.
+
+    Each entry is keyed by case id and records a content hash of the case
+    (skill, polarity, prompt, source) and of its normalized predicted set. On
+    re-scoring, cases whose hashes match are reused as-is; changed or removed
+    cases have their old contribution retracted from the cached aggregates and
+    the new one added, so only the difference is recomputed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.state: dict | None = None
+        self.stats = {"rescored": 0, "reused": 0, "new": 0, "removed": 0}
+
+    def load(self) -> OutcomeCache:
+        if not self.path.exists():
+            return self
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            print(f"Warning: ignoring unreadable outcome cache: {self.path}", file=sys.stderr)
+            return self
+        if isinstance(data, dict) and data.get("version") == OUTCOME_CACHE_VERSION:
+            self.entries = data.get("entries", {})
+            self.state = data.get("tally")
+        return self
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        payload = {"version": OUTCOME_CACHE_VERSION, "tally": self.state, "entries": self.entries}
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _retract(tally: ScoreTally, case_id: str, entry: dict) -> None:
+        stub = Case(case_id, entry["skill"], "", entry["polarity"], "", "")
+        tally.add(stub, entry["predicted"], sign=-1)
+
+    def rescore(
+        self, pairs: Iterable[tuple[Case, list[str] | None]]
+    ) -> tuple[ScoreTally, list[dict[str, str]], list[dict[str, str]]]:
+        """Return `(tally, detail_rows, outcome_changes)` for the current predictions."""
+        tally = ScoreTally(lambda row: None)
+        if self.state is not None:
+            tally.load_state(self.state)
+        old = self.entries
+        fresh: dict[str, dict] = {}
+        detail_rows: list[dict[str, str]] = []
+        changes: list[dict[str, str]] = []
+
+        for case, predicted in pairs:
+            case_key = case_content_key(case)
+            pred_key = predicted_key(predicted)
+            prev = old.get(case.id)
+            if prev is not None and prev["case"] == case_key and prev["pred"] == pred_key:
+                entry = prev
+                self.stats["reused"] += 1
+            else:
+                if prev is not None:
+                    self._retract(tally, case.id, prev)
+                    self.stats["rescored"] += 1
+                else:
+                    self.stats["new"] += 1
+                rows: list[dict[str, str]] = []
+                tally.on_detail = rows.append
+                outcome = tally.add(case, predicted)
+                entry = {
+                    "case": case_key,
+                    "pred": pred_key,
+                    "skill": case.skill,
+                    "polarity": case.polarity,
+                    "predicted": None
+                    if predicted is None
+                    else sorted({p.strip() for p in predicted if p.strip()}),
+                    "outcome": outcome,
+                    "details": rows,
+                }
+                if prev is not None and prev["outcome"] != outcome:
+                    changes.append(
+                        {"id": case.id, "skill": case.skill, "before": prev["outcome"], "after": outcome}
+                    )
+            fresh[case.id] = entry
+            detail_rows.extend(entry["details"])
+
+        for case_id, prev in old.items():
+            if case_id not in fresh:
+                self._retract(tally, case_id, prev)
+                self.stats["removed"] += 1
+                changes.append(
+                    {"id": case_id, "skill": prev["skill"], "before": prev["outcome"], "after": "REMOVED"}
+                )
+
+        tally.prune_empty()
+        tally.on_detail = lambda row: None
+        self.entries = fresh
+        self.state = tally.to_state()
+        return tally, detail_rows, changes
+
+
+SHARD_FIELDS = ["shard", "rows", "duplicate_ids", "unknown_ids", "latency_rows", "predict_seconds", "cases_per_second"]
+
+
+def merge_prediction_shards(
+    paths: list[Path],
+    cases: list[Case],
+    latencies: dict[str, float],
+    scores: dict[str, dict[str, float]] | None = None,
+    threshold: float = DEFAULT_SCORE_THRESHOLD,
+) -> tuple[dict[str, list[str]], list[dict[str, str | int]], list[dict[str, str]]]:
+    """
+    Merge per-shard prediction files into one `id -> predicted` map.
+
+    Returns the merged predictions, one stats row per shard and one issue row
+    per DUPLICATE (id seen again, in the same or another shard), UNKNOWN (id
+    not in the dataset) or MISSING (case id no shard predicted). As within a
+    single file, the last row read wins on duplicates.
+    """
+    known = {case.id for case in cases}
+    merged: dict[str, list[str]] = {}
+    seen_in: dict[str, str] = {}
+    shard_rows: list[dict[str, str | int]] = []
+    issues: list[dict[str, str]] = []
+    for path in paths:
+        shard_latency: dict[str, float] = {}
+        rows = duplicates = unknown = 0
+        for case_id, predicted in iter_predictions(path, shard_latency, scores, threshold):
+            rows += 1
+            first = seen_in.get(case_id)
+            if first is not None:
+                duplicates += 1
+                issues.append({"kind": "DUPLICATE", "id": case_id, "shards": f"{first} {path}"})
+            elif case_id not in known:
+                unknown += 1
+                issues.append({"kind": "UNKNOWN", "id": case_id, "shards": str(path)})
+            seen_in[case_id] = str(path)
+            merged[case_id] = predicted
+            # Latency follows the winning row, even when an earlier shard had one.
+            if case_id in shard_latency:
+                latencies[case_id] = shard_latency[case_id]
+            else:
+                latencies.pop(case_id, None)
+        # Shards run concurrently, so throughput is judged on time spent predicting.
+        busy = sum(shard_latency.values()) / 1000
+        shard_rows.append(
             {
-                "metric": "positive_extra_skill_predictions",
-                "value": totals["positive_extra_skill_predictions"],
-            },
-        ]
+                "shard": str(path),
+                "rows": rows,
+                "duplicate_ids": duplicates,
+                "unknown_ids": unknown,
+                "latency_rows": len(shard_latency),
+                "predict_seconds": f"{busy:.3f}" if shard_latency else "",
+                "cases_per_second": f"{len(shard_latency) / busy:.0f}" if busy else "",
+            }
+        )
+    issues.extend(
+        {"kind": "MISSING", "id": case.id, "shards": ""} for case in cases if case.id not in merged
+    )
+    return merged, shard_rows, issues
 
-        per_skill_rows = []
-        for skill in sorted(by_skill):
-            s = by_skill[skill]
-            per_skill_rows.append(
+
+def print_shard_report(shard_rows: list[dict[str, str | int]], issues: list[dict[str, str]], top: int) -> None:
+    print(f"\nShards ({len(shard_rows)} files)")
+    print("shard\trows\tduplicate_ids\tunknown_ids\tpredict_s\tcases/s")
+    for row in shard_rows:
+        print(
+            f"{row['shard']}\t{row['rows']}\t{row['duplicate_ids']}\t{row['unknown_ids']}\t"
+            f"{row['predict_seconds'] or '-'}\t{row['cases_per_second'] or '-'}"
+        )
+    for kind in ("MISSING", "DUPLICATE", "UNKNOWN"):
+        rows = [issue for issue in issues if issue["kind"] == kind]
+        print(f"- {kind.lower()} ids: {len(rows)}")
+        for issue in rows[:top]:
+            print(f"  {issue['id']}\t{issue['shards']}".rstrip())
+
+
+PAIRED_FIELDS = ["run", "metric", "diff", "lo", "hi", "fixed", "broken", "n", "p_bootstrap", "p_mcnemar"]
+
+
+def paired_run_rows(
+    labels: list[str], tallies: list[ScoreTally], discordant: list[dict], args: argparse.Namespace
+) -> list[dict[str, str | int]]:
+    """Paired bootstrap and McNemar test of each run against the first, per metric."""
+    sampler = BinomialSampler(args.bootstrap_seed)
+    rows = []
+    for label, tally, counts in zip(labels[1:], tallies[1:], discordant[1:]):
+        for metric, polarity, total_key in (
+            ("positive_recall", "positive", "positive_total"),
+            ("negative_reject_rate", "negative", "negative_total"),
+        ):
+            broken, fixed = counts[polarity]
+            total = tally.totals[total_key]
+            result = paired_difference(fixed, broken, total, args.bootstrap, args.confidence, sampler)
+            rows.append(
                 {
-                    "skill": skill,
-                    "positive_total": s["positive_total"],
-                    "positive_hit": s["positive_hit"],
-                    "negative_total": s["negative_total"],
-                    "negative_false_trigger": s["negative_false_trigger"],
-                    "negative_false_trigger_self": s["negative_false_trigger_self"],
-                    "missing_predictions": s["missing_predictions"],
+                    "run": label,
+                    "metric": metric,
+                    "diff": f"{result['diff']:+.6f}",
+                    "lo": f"{result['lo']:+.6f}",
+                    "hi": f"{result['hi']:+.6f}",
+                    "fixed": fixed,
+                    "broken": broken,
+                    "n": total,
+                    "p_bootstrap": f"{result['p_bootstrap']:.4f}",
+                    "p_mcnemar": f"{mcnemar_exact(fixed, broken):.4g}",
                 }
             )
+    return rows
+
+
+def run_labels(paths: list[Path]) -> list[str]:
+    """Short unique labels for prediction files: the file name, or the full path on clashes."""
+    names = [p.name for p in paths]
+    return [p.name if names.count(p.name) == 1 else str(p) for p in paths]
+
+
+def compare_runs(cases: list[Case], pred_paths: list[Path], args: argparse.Namespace) -> int:
+    """Score several prediction files against one case load in a single pass over the cases."""
+    labels = run_labels(pred_paths)
+    run_latencies: list[dict[str, float]] = [{} for _ in pred_paths]
+    runs = [
+        load_predictions(p, lat, threshold=args.threshold) for p, lat in zip(pred_paths, run_latencies)
+    ]
+    latency_stats = [LatencyStats() for _ in runs]
+    keep_details = bool(args.csv_out or args.details)
+    run_details: list[list[dict[str, str]]] = [[] for _ in runs]
+    tallies = [
+        ScoreTally(run_details[i].append if keep_details else (lambda row: None))
+        for i in range(len(runs))
+    ]
+    flipped: list[tuple[Case, list[str]]] = []
+    # Per run (vs the first): cases only this run gets right / only the first gets right.
+    discordant = [{"positive": [0, 0], "negative": [0, 0]} for _ in runs]
+    good = {"HIT", "REJECT"}
 
-        def _pair_rows(pairs: dict[tuple[str, str], int], left: str, right: str) -> list[dict[str, str | int]]:
-            rows: list[dict[str, str | int]] = []
-            for (a, b), count in sorted(
-                pairs.items(), key=lambda kv: (-kv[1], kv[0][0], kv[0][1])
-            ):
-                rows.append({left: a, right: b, "count": count})
-            return rows
-
-        _write_csv(out_dir / "overall.csv", ["metric", "value"], overall_rows)
-        _write_csv(
-            out_dir / "per_skill.csv",
-            [
-                "skill",
-                "positive_total",
-                "positive_hit",
-                "negative_total",
-                "negative_false_trigger",
-                "negative_false_trigger_self",
-                "missing_predictions",
-            ],
-            per_skill_rows,
-        )
-        _write_csv(
-            out_dir / "details.csv",
-            ["kind", "id", "skill", "polarity", "predicted_skills", "prompt", "source"],
-            detail_rows,
-        )
-        _write_csv(
-            out_dir / "positive_miss_confusions.csv",
-            ["expected", "predicted", "count"],
-            _pair_rows(pos_confusions, "expected", "predicted"),
+    for case in cases:
+        outcomes = [tally.add(case, preds.get(case.id)) for tally, preds in zip(tallies, runs)]
+        if len(set(outcomes)) > 1:
+            flipped.append((case, outcomes))
+            base_good = outcomes[0] in good
+            for counts, outcome in zip(discordant[1:], outcomes[1:]):
+                if (outcome in good) != base_good:
+                    counts[case.polarity][not base_good] += 1  # [broken, fixed]
+        for stats, lat in zip(latency_stats, run_latencies):
+            stats.add(case, lat.get(case.id))
+
+    overall_rows = []
+    has_latency = any(latency_stats)
+    per_run_overall = [
+        {r["metric"]: r["value"] for r in t.overall_rows() + (lat.overall_rows() if has_latency else [])}
+        for t, lat in zip(tallies, latency_stats)
+    ]
+    for metric in per_run_overall[0]:
+        overall_rows.append({"metric": metric, **{lbl: m[metric] for lbl, m in zip(labels, per_run_overall)}})
+
+    print("Run comparison")
+    print("metric\t" + "\t".join(labels))
+    for row in overall_rows:
+        print(row["metric"] + "\t" + "\t".join(str(row[lbl]) for lbl in labels))
+
+    def rate(num: int, den: int) -> float:
+        return num / den if den else 0.0
+
+    skills = sorted(set().union(*(t.by_skill for t in tallies)))
+    per_skill_rows = []
+    for skill in skills:
+        row: dict[str, str | int] = {"skill": skill}
+        base = tallies[0].by_skill.get(skill, {})
+        base_recall = rate(base.get("positive_hit", 0), base.get("positive_total", 0))
+        base_reject = rate(
+            base.get("negative_total", 0) - base.get("negative_false_trigger", 0),
+            base.get("negative_total", 0),
         )
-        _write_csv(
-            out_dir / "positive_cotriggers.csv",
-            ["expected", "extra", "count"],
-            _pair_rows(pos_cotriggers, "expected", "extra"),
+        for label, tally in zip(labels, tallies):
+            s = tally.by_skill.get(skill, {})
+            recall = rate(s.get("positive_hit", 0), s.get("positive_total", 0))
+            reject = rate(
+                s.get("negative_total", 0) - s.get("negative_false_trigger", 0),
+                s.get("negative_total", 0),
+            )
+            row[f"{label}:positive_recall"] = f"{recall:.6f}"
+            row[f"{label}:negative_reject_rate"] = f"{reject:.6f}"
+            row[f"{label}:recall_delta"] = f"{recall - base_recall:+.6f}"
+            row[f"{label}:reject_delta"] = f"{reject - base_reject:+.6f}"
+        per_skill_rows.append(row)
+
+    print(f"\nPer skill (recall / reject rate, delta vs {labels[0]})")
+    print("skill\t" + "\t".join(labels))
+    for row in per_skill_rows:
+        cells = []
+        for i, label in enumerate(labels):
+            cell = f"{float(row[f'{label}:positive_recall']):.3f}/{float(row[f'{label}:negative_reject_rate']):.3f}"
+            if i:
+                recall_delta = float(row[f"{label}:recall_delta"])
+                reject_delta = float(row[f"{label}:reject_delta"])
+                cell += f" ({recall_delta:+.3f}/{reject_delta:+.3f})"
+            cells.append(cell)
+        print(row["skill"] + "\t" + "\t".join(cells))
+
+    print(f"\nFlipped cases ({len(flipped)})")
+    if flipped:
+        print("id\tskill\tpolarity\t" + "\t".join(labels))
+        for case, outcomes in flipped:
+            print(f"{case.id}\t{case.skill}\t{case.polarity}\t" + "\t".join(outcomes))
+    else:
+        print("- none")
+
+    paired_rows = paired_run_rows(labels, tallies, discordant, args) if args.bootstrap else []
+    if paired_rows:
+        print(
+            f"\nPaired bootstrap vs {labels[0]} "
+            f"({args.confidence:.0%} interval, {args.bootstrap} resamples; McNemar exact p)"
         )
+        print("run\tmetric\tdiff\tinterval\tfixed\tbroken\tp_bootstrap\tp_mcnemar")
+        for row in paired_rows:
+            print(
+                f"{row['run']}\t{row['metric']}\t{float(row['diff']):+.3f}\t"
+                f"[{float(row['lo']):+.3f}, {float(row['hi']):+.3f}]\t{row['fixed']}\t{row['broken']}\t"
+                f"{row['p_bootstrap']}\t{row['p_mcnemar']}"
+            )
+
+    if args.details:
+        for label, details in zip(labels, run_details):
+            print(f"\nDetails ({label})")
+            for row in details:
+                print(format_detail_line(row))
+
+    if args.confusion:
+        for label, tally in zip(labels, tallies):
+            print(f"\n== {label} ==")
+            print_confusions(tally, args.top)
+
+    if args.csv_out:
+        out_dir = Path(args.csv_out)
+        _write_csv(out_dir / "runs_overall.csv", ["metric", *labels], overall_rows)
+        skill_fields = ["skill"] + [
+            f"{label}:{col}"
+            for label in labels
+            for col in ("positive_recall", "negative_reject_rate", "recall_delta", "reject_delta")
+        ]
+        _write_csv(out_dir / "runs_per_skill.csv", skill_fields, per_skill_rows)
+        if paired_rows:
+            _write_csv(out_dir / "runs_paired.csv", PAIRED_FIELDS, paired_rows)
         _write_csv(
-            out_dir / "negative_false_trigger_confusions.csv",
-            ["near_miss_for", "predicted", "count"],
-            _pair_rows(neg_false_confusions, "near_miss_for", "predicted"),
+            out_dir / "flipped_cases.csv",
+            ["id", "skill", "polarity", *labels],
+            (
+                {"id": c.id, "skill": c.skill, "polarity": c.polarity, **dict(zip(labels, outcomes))}
+                for c, outcomes in flipped
+            ),
         )
+        for i, (tally, details, lat) in enumerate(zip(tallies, run_details, latency_stats), start=1):
+            write_score_csvs(
+                tally, out_dir / f"run-{i}-{pred_paths[i - 1].stem}", details, lat, args.confusion_matrix
+            )
         print(f"\nCSV exports written to {out_dir}")
 
+    failing = any(
+        t.totals["positive_miss"] > 0 or t.totals["negative_false_trigger"] > 0 for t in tallies
+    )
+    return 2 if args.fail_on_miss and failing else 0
+
+
+def tally_confusions(tally: ScoreTally) -> list[tuple[str, str, str, int]]:
+    """`(kind, expected, predicted, count)` for every confusion cell, as kept by the results store."""
+    return [(kind, a, b, n) for kind in CONFUSION_KINDS for (a, b), n in getattr(tally, kind).items()]
+
+
+def merge_into_run(
+    tally: ScoreTally,
+    outcomes: list[tuple[str, str, str, str]],
+    store: ResultsStore,
+    base_run: int,
+    rescored: set[str],
+    current: set[str],
+) -> tuple[ScoreTally, list[tuple[str, str, str, str]]]:
+    """
+    Fold a `--changed-since` tally into stored run `base_run`. Skills in
+    `rescored` come from `tally`; other skills still in `current` keep their
+    stored metrics, confusions and outcomes; skills no longer in the tree are
+    dropped. Returns the merged tally and case outcomes.
+    """
+    kept = current - rescored
+    merged = ScoreTally(lambda row: None)
+    for skill, metrics in store.skill_metrics(base_run).items():
+        if skill in kept:
+            merged.by_skill[skill] = {key: metrics[key] for key in PER_SKILL_FIELDS[1:]}
+            merged.extra_by_skill[skill] = metrics["positive_extra_skill_predictions"]
+    merged.by_skill.update(tally.by_skill)
+    merged.extra_by_skill.update(tally.extra_by_skill)
+    for kind, expected, predicted, count in store.confusions(base_run):
+        if expected in kept:
+            getattr(merged, kind).add(expected, predicted, count)
+    for kind, expected, predicted, count in tally_confusions(tally):
+        getattr(merged, kind).add(expected, predicted, count)
+    merged.prune_empty()
+
+    totals = merged.totals
+    for key in PER_SKILL_FIELDS[1:]:
+        totals[key] = sum(stats[key] for stats in merged.by_skill.values())
+    totals["positive_miss"] = totals["positive_total"] - totals["positive_hit"]
+    totals["negative_correct_reject"] = totals["negative_total"] - totals["negative_false_trigger"]
+    totals["positive_extra_skill_predictions"] = sum(merged.extra_by_skill.values())
+    return merged, [row for row in store.case_outcomes(base_run) if row[1] in kept] + outcomes
+
+
+def cmd_score(args: argparse.Namespace) -> int:
+    predicts = bool(args.predictor or args.predictor_worker or args.predictor_socket)
+    if args.stream and predicts:
+        raise SystemExit("--stream scores a --predictions file; it cannot be combined with a predictor")
+    if args.stream and args.outcome_cache:
+        raise SystemExit("--outcome-cache rescores in memory; it cannot be combined with --stream")
+    if (args.predictions_glob or (args.predictions and len(args.predictions) > 1)) and args.stream:
+        raise SystemExit("--stream scores a single --predictions file")
+    if args.html_report and args.predictions and len(args.predictions) > 1:
+        raise SystemExit("--html-report renders a single run; compare runs with --csv-out")
+    if args.results_db and args.predictions and len(args.predictions) > 1:
+        raise SystemExit("--results-db records a single run; score each predictions file separately")
+    if args.outcome_cache and args.predictions and len(args.predictions) > 1:
+        raise SystemExit("--outcome-cache rescores a single run; score each predictions file separately")
+    if args.changed_since and not args.results_db:
+        raise SystemExit("--changed-since merges into a stored run; it needs --results-db")
+    if args.prediction_cache and not predicts:
+        raise SystemExit(
+            "--prediction-cache caches --predictor or worker calls; pass --cache to the adapter instead"
+        )
+    if args.changed_since and args.outcome_cache:
+        raise SystemExit("--changed-since scores a subset of cases; it cannot be combined with --outcome-cache")
+    shard_paths: list[Path] = []
+    if args.predictions_glob:
+        shard_paths = sorted(Path(p) for p in glob.glob(args.predictions_glob))
+        if not shard_paths:
+            raise SystemExit(f"No prediction shards match: {args.predictions_glob}")
+    cases, skipped_non_manual, zero_parsed_skills = load_all_cases(
+        Path(args.skills_dir),
+        include_non_manual=args.include_non_manual or args.include_always_on,
+        index=open_index(args),
+        jobs=args.jobs,
+        catalog_path=catalog_path(args),
+        id_scheme=args.id_scheme,
+    )
+    report_dataset_notes(skipped_non_manual, zero_parsed_skills, cases)
+    if not cases:
+        print("No trigger example cases found.", file=sys.stderr)
+        return 1
+
+    if args.predictions and len(args.predictions) > 1:
+        return compare_runs(cases, [Path(p) for p in args.predictions], args)
+
+    scope = None
+    worker = None
+    current_skills = {c.skill for c in cases}
+    if args.changed_since:
+        source_path = predictor_source_path(args.predictor) if args.predictor else None
+        scope, cases = change_scope(args, cases, [source_path] if source_path else [])
+        if not cases and scope.skills is not None:
+            with ResultsStore(Path(args.results_db)) as store:
+                removed = store.skill_metrics(scope.base_run).keys() - current_skills
+            if not removed:
+                print(f"Nothing to re-evaluate; run {scope.base_run} stands.")
+                return 0
+    merged = scope is not None and scope.skills is not None
+
+    pred_path = Path(args.predictions[0]) if args.predictions else None
+    changes: list[dict[str, str]] | None = None
+    shard_rows: list[dict[str, str | int]] | None = None
+    shard_issues: list[dict[str, str]] = []
+    # --stream writes details.csv as it goes; the HTML report reads the rows back from it.
+    report_details: list[dict[str, str]] | None = None
+    outcomes: list[tuple[str, str, str, str]] | None = [] if args.results_db else None
+    with tempfile.TemporaryDirectory(prefix="trigger-score-") as tmp:
+        spool_path = None
+        if args.stream:
+            if args.csv_out:
+                details_path = Path(args.csv_out) / "details.csv"
+            else:
+                details_path = Path(tmp) / "details.csv" if args.html_report else None
+            tally, latency, sweep, spool_path = stream_score(
+                cases, pred_path, args, Path(tmp), details_path, outcomes
+            )
+            detail_rows = None
+        else:
+            latencies: dict[str, float] = {}
+            scores: dict[str, dict[str, float]] = {}
+            if predicts:
+                worker = open_predictor_worker(args)
+                predictor = worker or load_predictor(args.predictor)
+                prediction_cache = open_prediction_cache(
+                    args, predictor, [Path(p) for p in args.predictor_path]
+                )
+                pairs = predict_in_process(
+                    predictor, cases, args.batch_size, latencies, scores, args.threshold, prediction_cache
+                )
+            elif shard_paths:
+                predictions, shard_rows, shard_issues = merge_prediction_shards(
+                    shard_paths, cases, latencies, scores, args.threshold
+                )
+                pairs = ((case, predictions.get(case.id)) for case in cases)
+            else:
+                predictions = load_predictions(pred_path, latencies, scores, args.threshold)
+                pairs = ((case, predictions.get(case.id)) for case in cases)
+            # A predictor's scores only show up as it runs, so its sweep is fed speculatively.
+            sweep = ThresholdSweep() if predicts or scores else None
+            if sweep is not None:
+                pairs = sweep_pairs(pairs, scores, sweep)
+
+            start = time.perf_counter()
+            try:
+                if args.outcome_cache:
+                    cache = OutcomeCache(Path(args.outcome_cache)).load()
+                    tally, detail_rows, changes = cache.rescore(pairs)
+                    cache.save()
+                    print(
+                        f"Outcome cache: rescored {cache.stats['rescored']}, "
+                        f"reused {cache.stats['reused']}, new {cache.stats['new']}, "
+                        f"removed {cache.stats['removed']}",
+                        file=sys.stderr,
+                    )
+                    if outcomes is not None:
+                        outcomes.extend(
+                            (case_id, entry["skill"], entry["polarity"], entry["outcome"])
+                            for case_id, entry in cache.entries.items()
+                        )
+                else:
+                    detail_rows = []
+                    tally = ScoreTally(detail_rows.append)
+                    for case, predicted in pairs:
+                        outcome = tally.add(case, predicted)
+                        if outcomes is not None:
+                            outcomes.append((case.id, case.skill, case.polarity, outcome))
+            except WorkerError as exc:
+                raise SystemExit(str(exc)) from None
+            finally:
+                if worker is not None:
+                    worker.close()  # a spawned worker exits at end of input
+            elapsed = time.perf_counter() - start
+            if not scores:
+                sweep = None
+            latency = LatencyStats()
+            for case in cases:
+                latency.add(case, latencies.get(case.id))
+            if predicts:
+                via = f"via {worker.describe()}" if worker is not None else f"in-process via {args.predictor}"
+                print(
+                    f"Predicted {len(cases)} cases {via} "
+                    f"({elapsed:.2f}s, {len(cases) / elapsed if elapsed else 0:.0f} cases/s)",
+                    file=sys.stderr,
+                )
+                if prediction_cache is not None:
+                    prediction_cache.close()
+                    print(prediction_cache.summary(), file=sys.stderr)
+
+        if merged:
+            with ResultsStore(Path(args.results_db)) as store:
+                tally, outcomes = merge_into_run(tally, outcomes, store, scope.base_run, scope.skills, current_skills)
+            print(
+                f"Merged {len(scope.skills)} re-evaluated skills into run {scope.base_run} "
+                f"({len(tally.by_skill)} skills)",
+                file=sys.stderr,
+            )
+
+        print_score_report(tally)
+        if latency:
+            print_latency_report(latency)
+        if shard_rows is not None:
+            print_shard_report(shard_rows, shard_issues, args.top)
+        boot_rows = bootstrap_rows(tally, args) if args.bootstrap else None
+        if boot_rows is not None:
+            print_bootstrap(boot_rows, args)
+        curve = skill_thresholds = None
+        if sweep is not None:
+            curve, skill_thresholds = sweep.sweep(args.threshold)
+            print_threshold_sweep(curve, skill_thresholds, args)
+
+        totals = tally.totals
+        if args.fail_on_miss and (totals["positive_miss"] > 0 or totals["negative_false_trigger"] > 0):
+            exit_code = 2
+        else:
+            exit_code = 0
+
+        if args.details:
+            print("\nDetails")
+            if spool_path is not None:
+                with spool_path.open("r", encoding="utf-8") as f:
+                    for line in f:
+                        sys.stdout.write(line)
+            else:
+                for row in detail_rows or []:
+                    print(format_detail_line(row))
+
+        if args.stream and args.html_report:
+            # The report embeds every detail row; they are loaded only now, after the merge-join.
+            report_details = read_csv_rows(details_path)
+
+    if changes is not None:
+        print(f"\nOutcome changes since last run ({len(changes)})")
+        if changes:
+            print("id\tskill\tbefore\tafter")
+            for change in changes:
+                print(f"{change['id']}\t{change['skill']}\t{change['before']}\t{change['after']}")
+        else:
+            print("- none")
+
+    if args.confusion:
+        print_confusions(tally, args.top)
+
+    if args.csv_out or args.html_report:
+        tables = score_tables(tally, detail_rows, latency)
+        if boot_rows is not None:
+            tables["bootstrap.csv"] = (BOOTSTRAP_FIELDS, boot_rows)
+        if curve is not None:
+            tables["threshold_curve.csv"] = (CURVE_FIELDS, curve)
+            tables["threshold_per_skill.csv"] = (SKILL_THRESHOLD_FIELDS, skill_thresholds)
+        if shard_rows is not None:
+            tables["shards.csv"] = (SHARD_FIELDS, shard_rows)
+            tables["shard_issues.csv"] = (["kind", "id", "shards"], shard_issues)
+        if changes is not None:
+            tables["outcome_changes.csv"] = (["id", "skill", "before", "after"], changes)
+        if args.csv_out:
+            out_dir = Path(args.csv_out)
+            write_tables(out_dir, tables)
+            if args.confusion_matrix:
+                write_matrix_csvs(tally, out_dir)
+            print(f"\nCSV exports written to {out_dir}")
+        if args.html_report:
+            if report_details is not None:
+                tables["details.csv"] = (DETAIL_FIELDS, report_details)
+            write_html_report(Path(args.html_report), tables)
+            print(f"HTML report written to {args.html_report}")
+
+    if outcomes is not None:
+        if worker is not None:
+            source = worker.name
+        else:
+            source = args.predictor or args.predictions_glob or str(pred_path)
+        # Latency of the re-evaluated cases alone does not describe a merged run.
+        overall_rows = tally.overall_rows() + ([] if merged else latency.overall_rows())
+        overall = {row["metric"]: row["value"] for row in overall_rows}
+        if merged:
+            source += f" (changed since {scope.ref}, merged into run {scope.base_run})"
+        per_skill = [
+            {**row, "positive_extra_skill_predictions": tally.extra_by_skill.get(str(row["skill"]), 0)}
+            for row in tally.per_skill_rows()
+        ]
+        with ResultsStore(Path(args.results_db)) as store:
+            run_id = store.record_run(
+                args.run_label or source, source, overall, per_skill, outcomes, tally_confusions(tally)
+            )
+        print(f"Run {run_id} appended to {args.results_db}")
+
     return exit_code
 
 
+def cmd_watch(args: argparse.Namespace) -> int:
+    """
+    Poll the skills tree and predictor source; re-parse touched reference files,
+    re-predict only cases whose content changed, and print updated metrics.
+    A predictor worker stays connected across cycles; changed `--also-watch`
+    files re-query its version and re-predict everything, but reloading its
+    code is up to the worker.
+    """
+    skills_dir = Path(args.skills_dir)
+    include_non_manual = args.include_non_manual or args.include_always_on
+    worker = open_predictor_worker(args)
+    predictor = worker or load_predictor(args.predictor)
+    source = predictor_source_path(args.predictor) if args.predictor else None
+    predictor_files = [source] if source is not None else []
+    predictor_files += [Path(p).resolve() for p in args.also_watch]
+    also_watch = [Path(p) for p in args.also_watch]
+    prediction_cache = open_prediction_cache(args, predictor, also_watch)
+
+    skills: dict[Path, dict] = {}
+    predictions: dict[str, tuple[str, list[str]]] = {}  # id -> (case content key, predicted)
+    outcomes: dict[str, str] = {}
+    predictor_stats = {p: file_stat_key(p) for p in predictor_files}
+    last_rescan = 0.0
+    prev_rates: tuple[float, float] | None = None
+    failed = False
+    cycle = 0
+
+    def skill_stat(skill_dir: Path) -> tuple:
+        return (
+            file_stat_key(skill_dir / "skill.yaml"),
+            file_stat_key(skill_dir / "references" / "trigger-examples.md"),
+        )
+
+    print(
+        f"Watching {skills_dir} and {len(predictor_files)} predictor file(s) "
+        + (f"with {worker.describe()} " if worker is not None else "")
+        + f"every {args.interval}s (Ctrl-C to stop)",
+        file=sys.stderr,
+    )
+    try:
+        while True:
+            cycle_start = time.perf_counter()
+            now = time.monotonic()
+            if now - last_rescan >= args.rescan_interval:
+                # New or deleted skills need a walk; content changes only need stats.
+                current_dirs = list(iter_skill_dirs(skills_dir))
+                for gone in set(skills) - set(current_dirs):
+                    del skills[gone]
+                for skill_dir in current_dirs:
+                    skills.setdefault(skill_dir, {"stat": None})
+                last_rescan = now
+
+            reparsed = 0
+            for skill_dir, entry in skills.items():
+                stat = skill_stat(skill_dir)
+                if stat == entry["stat"]:
+                    continue
+                category, parsed, has_ref = scan_skill_dir(
+                    skill_dir, parse_all=True, skills_dir=skills_dir.resolve(), id_scheme=args.id_scheme
+                )
+                entry.update(stat=stat, category=category, cases=parsed or [], has_ref=has_ref)
+                reparsed += 1
+
+            reloaded = False
+            for path in predictor_files:
+                stat = file_stat_key(path)
+                if stat != predictor_stats[path]:
+                    predictor_stats[path] = stat
+                    reloaded = True
+            if reloaded:
+                try:
+                    if worker is not None:
+                        worker.hello()
+                    else:
+                        predictor = load_predictor(args.predictor, reload=True)
+                    predictions.clear()
+                    if prediction_cache is not None:
+                        prediction_cache.close()
+                        prediction_cache = open_prediction_cache(args, predictor, also_watch)
+                except Exception as exc:  # keep watching through syntax errors while editing
+                    print(f"Predictor reload failed: {exc}", file=sys.stderr)
+
+            cases = [
+                case
+                for skill_dir in sorted(skills)
+                if include_non_manual or skills[skill_dir]["category"] == "manual"
+                for case in skills[skill_dir]["cases"]
+            ]
+            keys = {case.id: case_content_key(case) for case in cases}
+            stale = [c for c in cases if predictions.get(c.id, ("",))[0] != keys[c.id]]
+            if failed and not (reparsed or reloaded):
+                stale = []  # retry a failed prediction once something has been edited
+            try:
+                fresh = {}
+                for case, predicted in predict_in_process(
+                    predictor, stale, args.batch_size, threshold=args.threshold, cache=prediction_cache
+                ):
+                    fresh[case.id] = (keys[case.id], predicted)
+                predictions.update(fresh)
+                for case_id in set(predictions) - set(keys):
+                    del predictions[case_id]
+                if prediction_cache is not None and stale:
+                    prediction_cache.flush()
+
+                if cycle == 0 or reparsed or stale or reloaded:
+                    tally = ScoreTally(lambda row: None)
+                    flips = []
+                    fresh_outcomes = {}
+                    for case in cases:
+                        outcome = tally.add(case, predictions[case.id][1])
+                        fresh_outcomes[case.id] = outcome
+                        before = outcomes.get(case.id)
+                        if cycle and before != outcome:
+                            flips.append((case.id, before or "NEW", outcome))
+                    outcomes = fresh_outcomes
+                    rates = (tally.positive_recall, tally.negative_reject_rate)
+                    delta = ""
+                    if prev_rates is not None:
+                        delta = f" ({rates[0] - prev_rates[0]:+.3f} / {rates[1] - prev_rates[1]:+.3f})"
+                    prev_rates = rates
+                    elapsed_ms = (time.perf_counter() - cycle_start) * 1000
+                    print(
+                        f"[{time.strftime('%H:%M:%S')}] reparsed {reparsed} skill(s), "
+                        f"re-predicted {len(stale)} of {len(cases)} case(s)"
+                        f"{', predictor reloaded' if reloaded else ''} in {elapsed_ms:.0f} ms | "
+                        f"recall {rates[0]:.3f} / reject {rates[1]:.3f}{delta}",
+                        flush=True,
+                    )
+                    for case_id, before, after in flips[: args.top]:
+                        print(f"  {before} -> {after}\t{case_id}", flush=True)
+                    if len(flips) > args.top:
+                        print(f"  ... {len(flips) - args.top} more outcome change(s)", flush=True)
+                    if prediction_cache is not None and stale:
+                        print(f"  {prediction_cache.summary()}", flush=True)
+                    failed = False
+            except Exception as exc:  # keep watching through predictor bugs while editing
+                failed = True
+                print(
+                    f"[{time.strftime('%H:%M:%S')}] prediction failed, keeping the previous results: {exc}",
+                    file=sys.stderr,
+                    flush=True,
+                )
+
+            cycle += 1
+            if args.cycles and cycle >= args.cycles:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        if prediction_cache is not None:
+            prediction_cache.close()
+        if worker is not None:
+            worker.close()
+
+
+def cmd_index(args: argparse.Namespace) -> int:
+    index_path = Path(args.index) if args.index else DEFAULT_INDEX_PATH
+    index = CaseIndex(index_path, Path(args.skills_dir), args.id_scheme)
+    if args.verify:
+        index.load()
+        if not index.entries:
+            print(f"Case index is empty or missing: {index_path}", file=sys.stderr)
+            return 1
+        problems = index.verify()
+        for problem in problems:
+            print(problem)
+        if problems:
+            print(f"\nCase index is stale ({len(problems)} problems): {index_path}", file=sys.stderr)
+            return 1
+        print(f"Case index OK ({len(index.entries)} skills): {index_path}")
+        return 0
+
+    if not args.rebuild:
+        index.load()
+    index.dirty = True
+    cases, _, _ = load_all_cases(
+        Path(args.skills_dir),
+        include_non_manual=True,
+        index=index,
+        jobs=args.jobs,
+        catalog_path=catalog_path(args),
+        id_scheme=args.id_scheme,
+    )
+    stats = index.stats
+    print(
+        f"Indexed {len(index.entries)} skills ({len(cases)} cases) to {index_path}: "
+        f"reused={stats['reused']} rehashed={stats['rehashed']} "
+        f"parsed={stats['parsed']} pruned={stats['pruned']}"
+    )
+    return 0
+
+
+def positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a value >= 1, got {number}")
+    return number
+
+
+def open_fraction(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number, got {value!r}") from None
+    if not 0 < number < 1:
+        raise argparse.ArgumentTypeError(f"expected a value between 0 and 1 (exclusive), got {number}")
+    return number
+
+
+def add_changed_since_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--changed-since",
+        metavar="GIT_REF",
+        help=(
+            "Only evaluate skills with files changed since GIT_REF (git diff, plus untracked files) "
+            "and the skills they are confused with in the last --results-db run; score merges the "
+            "result into that run. A changed --predictor-path evaluates everything"
+        ),
+    )
+    p.add_argument(
+        "--predictor-path",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help=(
+            "Predictor file (code, rules, model) whose change invalidates every prediction, for "
+            "--changed-since and the --prediction-cache version; repeatable (a --predictor "
+            "module's source is always included)"
+        ),
+    )
+
+
+def add_predictor_worker_arguments(
+    p: argparse.ArgumentParser, source: argparse._MutuallyExclusiveGroup
+) -> None:
+    source.add_argument(
+        "--predictor-worker",
+        metavar="COMMAND",
+        help=(
+            "Start COMMAND (through the shell) as a predictor worker speaking the predictor_worker.py "
+            "JSONL protocol on stdin/stdout, e.g. 'python3 scripts/predictor_adapter_template.py --serve'"
+        ),
+    )
+    source.add_argument(
+        "--predictor-socket",
+        metavar="PATH",
+        help="Use the running predictor worker on this Unix socket (kept warm across runs)",
+    )
+    p.add_argument(
+        "--worker-window",
+        type=positive_int,
+        default=DEFAULT_WINDOW,
+        help=f"Predict requests kept in flight to a predictor worker (default: {DEFAULT_WINDOW})",
+    )
+
+
+def add_prediction_cache_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--prediction-cache",
+        metavar="DB",
+        help=(
+            "Persistent SQLite cache of --predictor results keyed by normalized prompt and predictor "
+            "version; only uncached prompts are predicted, and the hit ratio is reported"
+        ),
+    )
+    p.add_argument(
+        "--prediction-cache-max-entries",
+        type=positive_int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=f"Evict least recently used predictions beyond this many (default: {DEFAULT_MAX_ENTRIES})",
+    )
+    p.add_argument(
+        "--predictor-version",
+        help=(
+            "Cache version of the predictor; entries of other versions are invalidated "
+            "(default: a digest of the predictor source and its data files)"
+        ),
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Export and score skill trigger example cases.")
     parser.add_argument(
@@ -570,6 +2531,36 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help=argparse.SUPPRESS,
     )
+    parser.add_argument(
+        "--index",
+        help=(
+            "Read/update a parsed-case index at this path so unchanged trigger-examples.md "
+            f"files are not re-parsed (the index command defaults to {DEFAULT_INDEX_PATH.relative_to(ROOT)})"
+        ),
+    )
+    parser.add_argument(
+        "--catalog",
+        help=(
+            "Read/update the skill catalog cache at this path so unchanged skill.yaml files are "
+            "not re-read (skill_catalog.py build writes the shared default, .cache/skill-catalog.json)"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=1,
+        help="Parse trigger-examples.md files across N worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--id-scheme",
+        choices=ID_SCHEMES,
+        default="ordinal",
+        help=(
+            "Case ids: ordinal (skill:positive:en:3, shifts when examples are inserted) or content "
+            "(skill:positive:<hash of the normalized prompt>, stable across edits; duplicate prompts "
+            "are reported) (default: ordinal)"
+        ),
+    )
 
     sub = parser.add_subparsers(dest="command", required=True)
 
@@ -577,14 +2568,54 @@ def build_parser() -> argparse.ArgumentParser:
     p_summary.set_defaults(func=cmd_summary)
 
     p_export = sub.add_parser("export", help="Export trigger examples as JSONL")
-    p_export.add_argument("--out", help="Output JSONL path (prints to stdout if omitted)")
+    p_export.add_argument(
+        "--out",
+        help="Output JSONL path; .gz / .xz are written compressed (prints to stdout if omitted)",
+    )
+    p_export.add_argument(
+        "--shards",
+        type=positive_int,
+        default=1,
+        help="Split into N skill-stratified shard files named after --out (e.g. cases.shard-1-of-N.jsonl)",
+    )
+    p_export.add_argument(
+        "--results-db",
+        metavar="DB",
+        help="Results history used by --changed-since to add confused skills (as score --results-db)",
+    )
+    add_changed_since_arguments(p_export)
     p_export.set_defaults(func=cmd_export)
 
     p_score = sub.add_parser("score", help="Score predictions JSONL against exported cases")
-    p_score.add_argument(
+    pred_source = p_score.add_mutually_exclusive_group(required=True)
+    pred_source.add_argument(
         "--predictions",
-        required=True,
-        help="Predictions JSONL with fields: id and predicted (string or string[])",
+        nargs="+",
+        help=(
+            "Predictions JSONL (.gz / .xz read compressed) with fields: id and predicted "
+            "(string, string[] or {skill: score}); pass several files to compare runs side by side in one pass"
+        ),
+    )
+    pred_source.add_argument(
+        "--predictions-glob",
+        help=(
+            "Glob of prediction shard files (quote it) to merge and score as one run; "
+            "reports per-shard throughput and missing / duplicated ids across shards"
+        ),
+    )
+    pred_source.add_argument(
+        "--predictor",
+        help=(
+            "Import module:function (or path/to/file.py:function) and call it in-process "
+            "with batches of Case objects instead of reading a predictions file"
+        ),
+    )
+    add_predictor_worker_arguments(p_score, pred_source)
+    p_score.add_argument(
+        "--batch-size",
+        type=positive_int,
+        default=256,
+        help="Cases per in-process --predictor call (default: 256)",
     )
     p_score.add_argument(
         "--details",
@@ -606,13 +2637,155 @@ def build_parser() -> argparse.ArgumentParser:
         "--csv-out",
         help="Directory to write CSV exports (overall, per-skill, details, confusions)",
     )
+    p_score.add_argument(
+        "--html-report",
+        metavar="OUT_HTML",
+        help=(
+            "Write the trigger_eval_report.py HTML report directly from this run (no CSV round trip needed); "
+            "it embeds every detail row, so with --stream they are read back into memory from details.csv"
+        ),
+    )
+    p_score.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_SCORE_THRESHOLD,
+        help=(
+            "Score cutoff for {skill: score} predictions; scored runs also get a threshold sweep "
+            f"(PR curve, per-skill F1-optimal thresholds) (default: {DEFAULT_SCORE_THRESHOLD})"
+        ),
+    )
+    p_score.add_argument(
+        "--bootstrap",
+        type=positive_int,
+        default=0,
+        metavar="N",
+        help=(
+            "Bootstrap N resamples for recall / reject-rate intervals (overall, per language and per skill); "
+            "with several --predictions files, also a paired test of each run against the first"
+        ),
+    )
+    p_score.add_argument(
+        "--confidence",
+        type=open_fraction,
+        default=0.95,
+        help="Interval level for --bootstrap (default: 0.95)",
+    )
+    p_score.add_argument(
+        "--bootstrap-seed",
+        type=int,
+        default=0,
+        help="Random seed for --bootstrap, for reproducible intervals (default: 0)",
+    )
+    p_score.add_argument(
+        "--confusion-matrix",
+        action="store_true",
+        help="With --csv-out, also write dense skill-by-skill matrix_<kind>.csv files",
+    )
     p_score.add_argument(
         "--fail-on-miss",
         action="store_true",
         help="Exit non-zero when there is any positive miss or false trigger",
     )
+    p_score.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Bounded-memory scoring: external-sort cases and predictions by id and merge-join them "
+            "(details are emitted in id order)"
+        ),
+    )
+    p_score.add_argument(
+        "--sort-chunk",
+        type=positive_int,
+        default=200_000,
+        help="Rows held in memory per sorted run with --stream (default: 200000)",
+    )
+    p_score.add_argument(
+        "--outcome-cache",
+        help=(
+            "Persistent per-case outcome cache; only cases whose content or predictions changed "
+            "are re-scored, and outcome changes since the last run are listed"
+        ),
+    )
+    p_score.add_argument(
+        "--results-db",
+        metavar="DB",
+        help=(
+            "Append this run's metrics, per-skill metrics and per-case outcomes to a SQLite "
+            "history (see trigger_eval_report.py --results-db for trends)"
+        ),
+    )
+    p_score.add_argument(
+        "--run-label",
+        help="Label stored with the run in --results-db (default: the predictions source)",
+    )
+    add_changed_since_arguments(p_score)
+    add_prediction_cache_arguments(p_score)
     p_score.set_defaults(func=cmd_score)
 
+    p_watch = sub.add_parser(
+        "watch", help="Re-parse, re-predict and re-score incrementally as files change"
+    )
+    watch_source = p_watch.add_mutually_exclusive_group(required=True)
+    watch_source.add_argument(
+        "--predictor",
+        help="In-process batch predictor (module:function or path/to/file.py:function)",
+    )
+    add_predictor_worker_arguments(p_watch, watch_source)
+    p_watch.add_argument(
+        "--batch-size",
+        type=positive_int,
+        default=256,
+        help="Cases per predictor call (default: 256)",
+    )
+    p_watch.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_SCORE_THRESHOLD,
+        help=f"Score cutoff for {{skill: score}} predictions (default: {DEFAULT_SCORE_THRESHOLD})",
+    )
+    p_watch.add_argument(
+        "--also-watch",
+        nargs="*",
+        default=[],
+        help="Extra files (rule tables, configs) whose change reloads the predictor",
+    )
+    p_watch.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between stat polls (default: 0.5)",
+    )
+    p_watch.add_argument(
+        "--rescan-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between full walks for added/removed skills (default: 5)",
+    )
+    p_watch.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Max outcome changes listed per update (default: 20)",
+    )
+    add_prediction_cache_arguments(p_watch)
+    p_watch.add_argument("--cycles", type=int, default=0, help=argparse.SUPPRESS)
+    p_watch.set_defaults(func=cmd_watch)
+
+    p_index = sub.add_parser("index", help="Refresh, rebuild or verify the parsed-case index")
+    index_mode = p_index.add_mutually_exclusive_group()
+    index_mode.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Discard the existing index and re-parse every skill",
+    )
+    index_mode.add_argument(
+        "--verify",
+        action="store_true",
+        help="Re-hash and re-parse every skill without writing; exit 1 if the index is stale",
+    )
+    p_index.set_defaults(func=cmd_index)
+
     return parser
 
 
@@ -0,0 +1,112 @@
+"""
+Git-aware scoping for `export` / `score --changed-since <git-ref>`.
+
+`git diff --name-only <ref>` (plus untracked files) names what changed in the
+working tree since `ref`. A changed file under a skill root touches that
+skill; a changed predictor file can move any prediction, so it widens the
+scope to every skill. Touched skills are widened once more with the skills
+they share a confusion cell with (either direction, any kind) in the merge
+base run of the results history: editing one skill's examples or keywords
+mostly moves predictions between skills that were already being confused.
+
+Only the cases of the scoped skills are exported and scored; the scorer then
+merges them into the merge base run, whose stored per-skill metrics,
+confusions and outcomes stand in for every other skill. This assumes the
+merge base was scored at `ref` (for example the last full run on the target
+branch), and it cannot see a change that makes two previously unconfused
+skills collide; run a full evaluation periodically.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from skill_catalog import SkillCatalog
+from trigger_results_store import ResultsStore
+
+
+@dataclass
+class ChangeScope:
+    """Skills to evaluate for `--changed-since`; `skills=None` means all of them."""
+
+    ref: str
+    skills: set[str] | None
+    base_run: int | None = None
+    touched: set[str] = field(default_factory=set)
+    confused: set[str] = field(default_factory=set)
+    reason: str = ""
+
+    def describe(self, total_skills: int) -> str:
+        if self.skills is None:
+            return f"Changed since {self.ref}: evaluating all {total_skills} skills ({self.reason})"
+        via = f" in run {self.base_run}" if self.base_run is not None else ""
+        return (
+            f"Changed since {self.ref}: evaluating {len(self.skills)} of {total_skills} skills "
+            f"({len(self.touched)} touched, {len(self.confused)} confused with them{via})"
+        )
+
+
+def _git(args: list[str], cwd: Path) -> str:
+    try:
+        proc = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    except FileNotFoundError:
+        raise SystemExit("--changed-since needs git on PATH") from None
+    if proc.returncode != 0:
+        raise SystemExit(f"git {' '.join(args)} failed: {proc.stderr.strip()}")
+    return proc.stdout
+
+
+def git_changed_files(ref: str, cwd: Path) -> set[Path]:
+    """Files changed (committed, staged, unstaged or untracked) in the work tree since `ref`."""
+    top = Path(_git(["rev-parse", "--show-toplevel"], cwd).strip()).resolve()
+    names = _git(["diff", "--name-only", "--no-renames", "-z", ref, "--"], top).split("\0")
+    names += _git(["ls-files", "--others", "--exclude-standard", "-z"], top).split("\0")
+    return {top / name for name in names if name}
+
+
+def touched_skills(catalog: SkillCatalog, paths: Iterable[Path]) -> set[str]:
+    """Ids of catalog skills with a changed file anywhere under their root."""
+    roots = {catalog.skill_dir(entry): entry["id"] for entry in catalog}
+    touched = set()
+    for path in paths:
+        for parent in path.parents:
+            if parent in roots:
+                touched.add(roots[parent])
+                break
+            if parent == catalog.skills_dir:
+                break
+    return touched
+
+
+def plan_scope(
+    ref: str,
+    catalog: SkillCatalog,
+    results_db: Path | None,
+    predictor_paths: Iterable[Path] = (),
+) -> ChangeScope:
+    """
+    Work out what `--changed-since ref` has to evaluate. With a results
+    history but no run to merge into, everything is evaluated (so the
+    result can seed the history); without one, only touched skills are.
+    """
+    changed = git_changed_files(ref, catalog.skills_dir)
+    base_run = None
+    if results_db is not None:
+        if results_db.exists():
+            with ResultsStore(results_db) as store:
+                base_run = store.merge_base()
+        if base_run is None:
+            return ChangeScope(ref, None, reason=f"no run in {results_db} to merge into")
+    predictors = sorted(str(p) for p in predictor_paths if p.resolve() in changed)
+    if predictors:
+        return ChangeScope(ref, None, base_run, reason="predictor changed: " + ", ".join(predictors))
+
+    touched = touched_skills(catalog, changed)
+    confused: set[str] = set()
+    if base_run is not None and touched:
+        with ResultsStore(results_db) as store:
+            confused = store.confused_skills(base_run, touched)
+    return ChangeScope(ref, touched | confused, base_run, touched, confused)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Compiled keyword matcher for skill trigger prediction.
+
+Collects every skill's `triggers.keywords` from the skill catalog and
+compiles them (English and CJK alike) into one Aho-Corasick automaton, so a
+prompt is matched against all skills in a single pass over its characters.
+
+The compiled automaton is cached on disk and rebuilt when any `skill.yaml`
+changes.
+
+Usage:
+  python3 scripts/trigger_keyword_engine.py build
+  python3 scripts/trigger_keyword_engine.py match "please review my pull request"
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+from collections import deque
+from pathlib import Path
+
+from skill_catalog import SkillCatalog, find_skill_dirs, parse_skill_yaml, stat_key
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SKILLS_DIR = ROOT / "skills"
+DEFAULT_CACHE_PATH = ROOT / ".cache" / "trigger-keywords.pickle"
+CACHE_VERSION = 1
+
+
+def read_trigger_keywords(yaml_path: Path) -> list[str]:
+    """Read the `triggers.keywords` list from a skill.yaml without a YAML dependency."""
+    if not yaml_path.exists():
+        return []
+    return parse_skill_yaml(yaml_path.read_text(encoding="utf-8"))[1]
+
+
+def collect_skill_keywords(skills_dir: Path) -> dict[str, list[str]]:
+    """Map skill name (directory name, as used by the scorer) to its trigger keywords."""
+    return {entry["id"]: entry["keywords"] for entry in SkillCatalog(skills_dir).load() if entry["keywords"]}
+
+
+def skills_fingerprint(skills_dir: Path) -> str:
+    """Hash of every skill's skill.yaml path, mtime and size; changes whenever keywords could."""
+    digest = hashlib.sha256()
+    for skill_dir in find_skill_dirs(skills_dir):
+        yaml_path = os.path.join(skill_dir, "skill.yaml")
+        stat = stat_key(yaml_path)
+        if stat is not None:
+            digest.update(f"{yaml_path}\0{stat[0]}\0{stat[1]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over case-folded keywords.
+
+    States are integers; `goto[state]` maps a character to the next state,
+    `fail[state]` is the failure link and `out[state]` holds the indices of the
+    skills whose keyword ends at that state (including via failure links).
+    """
+
+    def __init__(self, skills: list[str]) -> None:
+        self.skills = skills
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[tuple[int, ...]] = [()]
+
+    @classmethod
+    def build(cls, skill_keywords: dict[str, list[str]]) -> KeywordAutomaton:
+        skills = sorted(skill_keywords)
+        automaton = cls(skills)
+        goto = automaton.goto
+        outputs: list[set[int]] = [set()]
+        for skill_idx, skill in enumerate(skills):
+            for keyword in skill_keywords[skill]:
+                word = keyword.casefold()
+                if not word:
+                    continue
+                state = 0
+                for ch in word:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        outputs.append(set())
+                    state = nxt
+                outputs[state].add(skill_idx)
+
+        fail = [0] * len(goto)
+        queue: deque[int] = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                # Root children keep fail=0; deeper states never resolve to themselves.
+                fail[nxt] = goto[f].get(ch, 0) if state else 0
+                outputs[nxt] |= outputs[fail[nxt]]
+
+        automaton.fail = fail
+        automaton.out = [tuple(sorted(o)) for o in outputs]
+        return automaton
+
+    def match(self, text: str) -> list[str]:
+        """Return skills with at least one keyword in `text`, in skill-name order."""
+        goto = self.goto
+        fail = self.fail
+        out = self.out
+        hits: set[int] = set()
+        state = 0
+        for ch in text.casefold():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                hits.update(out[state])
+        return [self.skills[i] for i in sorted(hits)]
+
+
+def load_automaton(
+    skills_dir: Path = SKILLS_DIR, cache_path: Path | None = DEFAULT_CACHE_PATH
+) -> KeywordAutomaton:
+    """Load the compiled automaton from cache, rebuilding it when skill.yaml files changed."""
+    fingerprint = skills_fingerprint(skills_dir)
+    if cache_path is not None and cache_path.exists():
+        try:
+            with cache_path.open("rb") as f:
+                cached = pickle.load(f)
+            if cached.get("version") == CACHE_VERSION and cached.get("fingerprint") == fingerprint:
+                automaton = KeywordAutomaton(cached["skills"])
+                automaton.goto, automaton.fail, automaton.out = cached["tables"]
+                return automaton
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, ValueError):
+            pass
+
+    automaton = KeywordAutomaton.build(collect_skill_keywords(skills_dir))
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            pickle.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "fingerprint": fingerprint,
+                    # Plain containers only, so the cache loads regardless of module name.
+                    "skills": automaton.skills,
+                    "tables": (automaton.goto, automaton.fail, automaton.out),
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, cache_path)
+    return automaton
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compile and query the skill trigger keyword automaton.")
+    parser.add_argument("--skills-dir", default=str(SKILLS_DIR), help="Skills directory (default: ./skills)")
+    parser.add_argument(
+        "--cache",
+        default=str(DEFAULT_CACHE_PATH),
+        help=f"Compiled automaton cache (default: {DEFAULT_CACHE_PATH.relative_to(ROOT)})",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="Compile the automaton and write the cache")
+    p_match = sub.add_parser("match", help="Print skills whose keywords occur in a prompt")
+    p_match.add_argument("prompt", help="Prompt text")
+    args = parser.parse_args()
+
+    automaton = load_automaton(Path(args.skills_dir), Path(args.cache))
+    if args.command == "build":
+        print(
+            f"Compiled {len(automaton.skills)} skills into {len(automaton.goto)} states: {args.cache}"
+        )
+        return 0
+    for skill in automaton.match(args.prompt):
+        print(skill)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Persistent prediction cache for trigger predictors.
+
+Predictions are kept in one SQLite file, keyed by the predictor (an identity
+such as `module:function` plus a version string) and the SHA-1 of the
+normalized prompt (NFKC, whitespace collapsed; case is kept, since engines
+may be case-sensitive). `predictor_adapter_template.py --cache` and
+`trigger_examples_tool.py score/watch --prediction-cache` look every batch up
+first, so only new or edited prompts reach the engine.
+
+- Versions: a predictor is opened with its current version; if the cache
+  holds entries from another version of the same predictor, they are dropped
+  (reported as invalidated). Callers derive the version from the predictor's
+  source and data files unless one is given explicitly.
+- LRU: each open is one access tick and hits are stamped with it; once the
+  cache holds more than `max_entries` rows, rows with the oldest tick are
+  evicted first.
+- Writes (tick stamps, new predictions, eviction) are buffered and applied
+  in one transaction per `flush()` (every FLUSH_ROWS rows and on `close()`),
+  so lookups never wait on a commit.
+
+Usage:
+  python3 scripts/trigger_prediction_cache.py --cache .cache/predictions.sqlite stats
+  python3 scripts/trigger_prediction_cache.py --cache .cache/predictions.sqlite clear --predictor NAME
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Iterable
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_PATH = ROOT / ".cache" / "predictions.sqlite"
+DEFAULT_MAX_ENTRIES = 1_000_000
+SCHEMA_VERSION = 1
+LOOKUP_CHUNK = 500  # stays under SQLite's bound-parameter limit
+FLUSH_ROWS = 20_000  # hits / new predictions buffered between write transactions
+
+MISS = object()  # `get_many` placeholder for uncached prompts (None is a valid prediction)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS predictors (
+    predictor_key INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    version TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS predictions (
+    predictor_key INTEGER NOT NULL,
+    prompt_hash BLOB NOT NULL,
+    value TEXT NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (predictor_key, prompt_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS predictions_used ON predictions (used);
+"""
+
+
+def prompt_hash(prompt: str) -> bytes:
+    """SHA-1 of the prompt after NFKC normalization and whitespace collapsing."""
+    normalized = " ".join(unicodedata.normalize("NFKC", prompt).split())
+    return hashlib.sha1(normalized.encode("utf-8")).digest()
+
+
+def files_version(paths: Iterable[Path], *extra: str) -> str:
+    """Short digest of the given files' contents (missing files count as empty) and `extra` strings."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(str(path).encode("utf-8") + b"\0")
+        try:
+            digest.update(path.read_bytes())
+        except FileNotFoundError:
+            pass
+        digest.update(b"\0")
+    for item in extra:
+        digest.update(item.encode("utf-8") + b"\0")
+    return digest.hexdigest()[:16]
+
+
+def _connect(path: Path, shared: bool = False) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Shard predictors may share one cache file; `shared` lets worker threads share the connection.
+    db = sqlite3.connect(path, timeout=30, check_same_thread=not shared)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    with db:
+        db.executescript(SCHEMA)
+        row = db.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None:
+            db.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+            db.execute("INSERT INTO meta VALUES ('tick', '0')")
+        elif int(row[0]) != SCHEMA_VERSION:
+            raise SystemExit(f"Unsupported prediction cache schema {row[0]}: {path}")
+    return db
+
+
+class PredictionCache:
+    """
+    Cached predictions of one predictor version; `stats` counts this session's
+    traffic. Not thread-safe: with `shared=True` it may be used from several
+    threads, one at a time (the caller holds a lock).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        predictor: str,
+        version: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        shared: bool = False,
+    ) -> None:
+        self.path = path
+        self.predictor = predictor
+        self.version = version
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0, "invalidated": 0}
+        self.db = _connect(path, shared)
+        with self.db:
+            self.tick = int(self.db.execute("SELECT value FROM meta WHERE key = 'tick'").fetchone()[0]) + 1
+            self.db.execute("UPDATE meta SET value = ? WHERE key = 'tick'", (str(self.tick),))
+            row = self.db.execute(
+                "SELECT predictor_key, version FROM predictors WHERE name = ?", (predictor,)
+            ).fetchone()
+            if row is None:
+                self.key = self.db.execute(
+                    "INSERT INTO predictors (name, version) VALUES (?, ?)", (predictor, version)
+                ).lastrowid
+            else:
+                self.key = row[0]
+                if row[1] != version:
+                    self.stats["invalidated"] = self.db.execute(
+                        "DELETE FROM predictions WHERE predictor_key = ?", (self.key,)
+                    ).rowcount
+                    self.db.execute("UPDATE predictors SET version = ? WHERE predictor_key = ?", (version, self.key))
+            self.size = self.db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        self._touched: set[bytes] = set()
+        self._pending: dict[bytes, str] = {}
+
+    def close(self) -> None:
+        self.flush()
+        self.db.close()
+
+    def __enter__(self) -> PredictionCache:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get_many(self, prompts: list[str]) -> list[object]:
+        """Cached prediction per prompt, in order, with `MISS` where there is none."""
+        hashes = [prompt_hash(p) for p in prompts]
+        found: dict[bytes, str] = {}
+        unique = [h for h in dict.fromkeys(hashes) if h not in self._pending]
+        for start in range(0, len(unique), LOOKUP_CHUNK):
+            chunk = unique[start : start + LOOKUP_CHUNK]
+            found.update(
+                self.db.execute(
+                    "SELECT prompt_hash, value FROM predictions "
+                    f"WHERE predictor_key = ? AND prompt_hash IN ({', '.join('?' * len(chunk))})",
+                    (self.key, *chunk),
+                )
+            )
+        self._touched.update(found)
+        out: list[object] = []
+        for h in hashes:
+            value = found.get(h) or self._pending.get(h)
+            out.append(MISS if value is None else json.loads(value))
+        hits = sum(v is not MISS for v in out)
+        self.stats["hits"] += hits
+        self.stats["misses"] += len(out) - hits
+        if len(self._touched) >= FLUSH_ROWS:
+            self.flush()
+        return out
+
+    def put_many(self, prompts: Iterable[str], predictions: Iterable[object]) -> None:
+        """Queue fresh predictions; they are written (and the cache trimmed) on `flush`."""
+        for prompt, predicted in zip(prompts, predictions):
+            self._pending[prompt_hash(prompt)] = json.dumps(predicted, ensure_ascii=False, separators=(",", ":"))
+        if len(self._pending) >= FLUSH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        In one transaction: stamp this session's hits with its tick, store
+        queued predictions, and evict least recently used rows past `max_entries`.
+        """
+        with self.db:
+            self.db.executemany(
+                "UPDATE predictions SET used = ? WHERE predictor_key = ? AND prompt_hash = ? AND used < ?",
+                ((self.tick, self.key, h, self.tick) for h in self._touched),
+            )
+            before = self.db.total_changes
+            self.db.executemany(
+                "INSERT OR IGNORE INTO predictions VALUES (?, ?, ?, ?)",
+                ((self.key, h, value, self.tick) for h, value in self._pending.items()),
+            )
+            added = self.db.total_changes - before
+            self.stats["stored"] += added
+            self.size += added
+            if self.size > self.max_entries:
+                evicted = self.db.execute(
+                    "DELETE FROM predictions WHERE (predictor_key, prompt_hash) IN "
+                    "(SELECT predictor_key, prompt_hash FROM predictions ORDER BY used LIMIT ?)",
+                    (self.size - self.max_entries,),
+                ).rowcount
+                self.stats["evicted"] += evicted
+                self.size -= evicted
+        self._touched.clear()
+        self._pending.clear()
+
+    def summary(self) -> str:
+        s = self.stats
+        looked_up = s["hits"] + s["misses"]
+        ratio = s["hits"] / looked_up if looked_up else 0.0
+        return (
+            f"Prediction cache: {s['hits']}/{looked_up} hits ({ratio:.1%}), stored {s['stored']}, "
+            f"evicted {s['evicted']}, invalidated {s['invalidated']} ({self.predictor} @ {self.version})"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Inspect or clear the persistent prediction cache.")
+    parser.add_argument(
+        "--cache",
+        default=str(DEFAULT_CACHE_PATH),
+        help=f"Cache file (default: {DEFAULT_CACHE_PATH.relative_to(ROOT)})",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entries per predictor and version")
+    p_clear = sub.add_parser("clear", help="Drop cached predictions")
+    p_clear.add_argument("--predictor", help="Only this predictor's entries (default: all)")
+    args = parser.parse_args()
+
+    db = _connect(Path(args.cache))
+    if args.command == "stats":
+        rows = db.execute(
+            "SELECT p.name, p.version, COUNT(c.prompt_hash), MAX(c.used) FROM predictors p "
+            "LEFT JOIN predictions c ON c.predictor_key = p.predictor_key GROUP BY p.predictor_key ORDER BY p.name"
+        ).fetchall()
+        print("predictor\tversion\tentries\tlast_used_tick")
+        for name, version, entries, used in rows:
+            print(f"{name}\t{version}\t{entries}\t{used or ''}")
+        print(f"\nTotal entries: {sum(row[2] for row in rows)}")
+        return 0
+
+    with db:
+        if args.predictor:
+            removed = db.execute(
+                "DELETE FROM predictions WHERE predictor_key IN (SELECT predictor_key FROM predictors WHERE name = ?)",
+                (args.predictor,),
+            ).rowcount
+            db.execute("DELETE FROM predictors WHERE name = ?", (args.predictor,))
+        else:
+            removed = db.execute("DELETE FROM predictions").rowcount
+            db.execute("DELETE FROM predictors")
+    print(f"Removed {removed} cached predictions from {args.cache}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+"""
+SQLite history of trigger evaluation runs.
+
+`score --results-db` appends each run: its overall metrics (`runs`), one row
+per skill (`skill_metrics`) and the outcome of every case (`case_outcomes`).
+Skill names and case ids are interned once into `skills` / `cases`, so the
+per-run tables hold only integers. Both per-run tables are `WITHOUT ROWID`
+tables clustered on their lookup order: `case_outcomes` on `(run_id,
+case_key)`, so one run's outcomes are a contiguous range and comparing two
+runs is a merge over two ranges; `skill_metrics` on `(skill_key, run_id)`, so
+a skill's history is a contiguous range (with a `run_id` index for the
+per-run view). Trend queries therefore cost what they return, not the size
+of the history.
+
+Runs also keep their confusion cells (`skill_confusions`), which is what
+`--changed-since` needs to widen a change to the skills it is confused with
+and to merge a partial evaluation into the last full one (`merge_base`).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+
+SCHEMA_VERSION = 2
+
+OUTCOMES = ["HIT", "MISS", "REJECT", "FALSE_TRIGGER"]
+OUTCOME_CODES = {name: code for code, name in enumerate(OUTCOMES)}
+BAD_OUTCOMES = (OUTCOME_CODES["MISS"], OUTCOME_CODES["FALSE_TRIGGER"])
+GOOD_OUTCOMES = (OUTCOME_CODES["HIT"], OUTCOME_CODES["REJECT"])
+
+# overall.csv metrics kept per run (latency ones stay NULL for runs without latency).
+RUN_METRICS = [
+    "positive_total",
+    "positive_hit",
+    "positive_miss",
+    "positive_recall",
+    "negative_total",
+    "negative_correct_reject",
+    "negative_false_trigger",
+    "negative_false_trigger_self",
+    "negative_reject_rate",
+    "missing_predictions",
+    "positive_extra_skill_predictions",
+    "latency_p50_ms",
+    "latency_p99_ms",
+]
+SKILL_METRICS = [
+    "positive_total",
+    "positive_hit",
+    "negative_total",
+    "negative_false_trigger",
+    "negative_false_trigger_self",
+    "missing_predictions",
+    "positive_extra_skill_predictions",
+]
+# Confusion kinds, as ScoreTally attribute names (stored as their index).
+CONFUSION_KINDS = ["pos_confusions", "pos_cotriggers", "neg_false_confusions"]
+RUN_FIELDS = ["run_id", "created_at", "label", "source", *RUN_METRICS]
+REGRESSION_FIELDS = ["id", "skill", "polarity", "before", "after"]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    label TEXT NOT NULL,
+    source TEXT NOT NULL,
+    {", ".join(f"{m} REAL" if m.endswith(("_recall", "_rate", "_ms")) else f"{m} INTEGER" for m in RUN_METRICS)}
+);
+CREATE INDEX IF NOT EXISTS runs_created_at ON runs (created_at);
+CREATE TABLE IF NOT EXISTS skills (skill_key INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS skill_metrics (
+    skill_key INTEGER NOT NULL,
+    run_id INTEGER NOT NULL,
+    {", ".join(f"{m} INTEGER NOT NULL" for m in SKILL_METRICS)},
+    PRIMARY KEY (skill_key, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS skill_metrics_run ON skill_metrics (run_id);
+CREATE TABLE IF NOT EXISTS cases (
+    case_key INTEGER PRIMARY KEY,
+    case_id TEXT NOT NULL UNIQUE,
+    skill_key INTEGER NOT NULL,
+    polarity TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS case_outcomes (
+    run_id INTEGER NOT NULL,
+    case_key INTEGER NOT NULL,
+    outcome INTEGER NOT NULL,
+    PRIMARY KEY (run_id, case_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS skill_confusions (
+    run_id INTEGER NOT NULL,
+    kind INTEGER NOT NULL,
+    expected_key INTEGER NOT NULL,
+    predicted_key INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, kind, expected_key, predicted_key)
+) WITHOUT ROWID;
+"""
+
+
+def skill_rates(row: dict) -> tuple[float | None, float | None]:
+    """`(recall, reject rate)` of a skill_metrics row; None where the skill has no such cases."""
+    recall = row["positive_hit"] / row["positive_total"] if row["positive_total"] else None
+    reject = (
+        (row["negative_total"] - row["negative_false_trigger"]) / row["negative_total"]
+        if row["negative_total"]
+        else None
+    )
+    return recall, reject
+
+
+class ResultsStore:
+    """Append-only run history in one SQLite file (WAL mode, so reports can read while scoring writes)."""
+
+    def __init__(self, path: Path, readonly: bool = False) -> None:
+        self.path = path
+        if readonly:
+            self._open_readonly()
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            row = None
+            if self.db.execute("SELECT 1 FROM sqlite_master WHERE name = 'meta'").fetchone():
+                row = self.db.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if row is not None and int(row[0]) == 1:
+                self._migrate_v1()
+            elif row is not None and int(row[0]) != SCHEMA_VERSION:
+                raise SystemExit(f"Unsupported results database schema {row[0]}: {path}")
+            self.db.executescript(SCHEMA)
+            if row is None:
+                self.db.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+
+    def _open_readonly(self) -> None:
+        """Query an existing database without creating, migrating or switching its journal mode."""
+        self.db = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+        self.db.row_factory = sqlite3.Row
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        except sqlite3.DatabaseError as exc:
+            self.db.close()
+            raise SystemExit(f"Not a results database: {self.path} ({exc})") from None
+        if row is None or int(row[0]) != SCHEMA_VERSION:
+            self.db.close()
+            version = row[0] if row is not None else "unknown"
+            raise SystemExit(
+                f"Results database schema {version} is not {SCHEMA_VERSION}: {self.path} "
+                "(recording a run with score --results-db migrates it)"
+            )
+
+    def _migrate_v1(self) -> None:
+        """
+        v1 runs have no confusion cells or per-skill extra counts (stored as 0),
+        so they stay in the history but are never used as a merge base.
+        """
+        self.db.execute(
+            "ALTER TABLE skill_metrics ADD COLUMN positive_extra_skill_predictions INTEGER NOT NULL DEFAULT 0"
+        )
+        self.db.execute(
+            "INSERT INTO meta VALUES ('merge_base_from', (SELECT COALESCE(MAX(run_id), 0) + 1 FROM runs))"
+        )
+        self.db.execute("UPDATE meta SET value = ? WHERE key = 'schema_version'", (str(SCHEMA_VERSION),))
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> ResultsStore:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _skill_keys(self, names: Iterable[str]) -> dict[str, int]:
+        keys = {name: key for key, name in self.db.execute("SELECT skill_key, name FROM skills")}
+        new = sorted(set(names) - keys.keys())
+        if new:
+            self.db.executemany("INSERT INTO skills (name) VALUES (?)", ((name,) for name in new))
+            keys.update(
+                (name, key)
+                for key, name in self.db.execute(
+                    "SELECT skill_key, name FROM skills WHERE skill_key > ?", (max(keys.values(), default=0),)
+                )
+            )
+        return keys
+
+    def _case_keys(
+        self, outcomes: list[tuple[str, str, str, str]], skill_keys: dict[str, int]
+    ) -> dict[str, int]:
+        """Intern case ids, updating the skill / polarity of cases that moved."""
+        known = {
+            case_id: (case_key, skill_key, polarity)
+            for case_id, case_key, skill_key, polarity in self.db.execute(
+                "SELECT case_id, case_key, skill_key, polarity FROM cases"
+            )
+        }
+        new: dict[str, tuple[int, str]] = {}
+        moved = []
+        for case_id, skill, polarity, _ in outcomes:
+            entry = known.get(case_id)
+            if entry is None:
+                new[case_id] = (skill_keys[skill], polarity)
+            elif entry[1:] != (skill_keys[skill], polarity):
+                moved.append((skill_keys[skill], polarity, entry[0]))
+        if moved:
+            self.db.executemany("UPDATE cases SET skill_key = ?, polarity = ? WHERE case_key = ?", moved)
+        keys = {case_id: entry[0] for case_id, entry in known.items()}
+        if new:
+            last_key = max(keys.values(), default=0)
+            self.db.executemany(
+                "INSERT INTO cases (case_id, skill_key, polarity) VALUES (?, ?, ?)",
+                ((case_id, *entry) for case_id, entry in new.items()),
+            )
+            keys.update(self.db.execute("SELECT case_id, case_key FROM cases WHERE case_key > ?", (last_key,)))
+        return keys
+
+    def record_run(
+        self,
+        label: str,
+        source: str,
+        overall: dict[str, str | int],
+        per_skill: list[dict[str, str | int]],
+        outcomes: Iterable[tuple[str, str, str, str]],
+        confusions: Iterable[tuple[str, str, str, int]] = (),
+    ) -> int:
+        """
+        Append one run and return its id. `overall` maps overall.csv metrics to
+        values, `per_skill` are per_skill.csv rows (plus their
+        `positive_extra_skill_predictions`), `outcomes` yields `(case_id,
+        skill, polarity, outcome)` for every scored case and `confusions`
+        yields `(kind, expected, predicted, count)` cells.
+        """
+        outcomes = list(outcomes)
+        confusions = list(confusions)
+        created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self.db:
+            cur = self.db.execute(
+                f"INSERT INTO runs (created_at, label, source, {', '.join(RUN_METRICS)}) "
+                f"VALUES (?, ?, ?, {', '.join('?' * len(RUN_METRICS))})",
+                (created_at, label, source, *(overall.get(m) for m in RUN_METRICS)),
+            )
+            run_id = cur.lastrowid
+            skill_keys = self._skill_keys(
+                [str(row["skill"]) for row in per_skill]
+                + [skill for _, skill, _, _ in outcomes]
+                + [name for _, expected, predicted, _ in confusions for name in (expected, predicted)]
+            )
+            self.db.executemany(
+                f"INSERT INTO skill_metrics (skill_key, run_id, {', '.join(SKILL_METRICS)}) "
+                f"VALUES (?, ?, {', '.join('?' * len(SKILL_METRICS))})",
+                (
+                    (skill_keys[str(row["skill"])], run_id, *(int(row.get(m, 0)) for m in SKILL_METRICS))
+                    for row in per_skill
+                ),
+            )
+            self.db.executemany(
+                "INSERT INTO skill_confusions VALUES (?, ?, ?, ?, ?)",
+                (
+                    (run_id, CONFUSION_KINDS.index(kind), skill_keys[expected], skill_keys[predicted], count)
+                    for kind, expected, predicted, count in confusions
+                ),
+            )
+
+            case_keys = self._case_keys(outcomes, skill_keys)
+            # Keyed by case_key: sorted inserts append to the clustered index, and a
+            # duplicate id keeps its last outcome.
+            codes = {case_keys[case_id]: OUTCOME_CODES[outcome] for case_id, _, _, outcome in outcomes}
+            self.db.executemany(
+                "INSERT INTO case_outcomes VALUES (?, ?, ?)",
+                ((run_id, case_key, codes[case_key]) for case_key in sorted(codes)),
+            )
+        return run_id
+
+    def runs(self, limit: int | None = None, until: int | None = None) -> list[dict]:
+        """The last `limit` runs up to run `until` (default: all, to the latest), oldest first."""
+        where = "WHERE run_id <= ?" if until is not None else ""
+        params = ((until,) if until is not None else ()) + (limit if limit is not None else -1,)
+        rows = self.db.execute(
+            f"SELECT {', '.join(RUN_FIELDS)} FROM runs {where} ORDER BY run_id DESC LIMIT ?", params
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def has_run(self, run_id: int) -> bool:
+        return self.db.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone() is not None
+
+    def previous_run(self, run_id: int) -> int | None:
+        row = self.db.execute("SELECT MAX(run_id) FROM runs WHERE run_id < ?", (run_id,)).fetchone()
+        return row[0]
+
+    def merge_base(self) -> int | None:
+        """The latest run a partial (`--changed-since`) evaluation can be merged into."""
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'merge_base_from'").fetchone()
+        first = int(row[0]) if row is not None else 0
+        return self.db.execute("SELECT MAX(run_id) FROM runs WHERE run_id >= ?", (first,)).fetchone()[0]
+
+    def confused_skills(self, run_id: int, skills: Iterable[str]) -> set[str]:
+        """Skills sharing a confusion cell (in either direction, any kind) with `skills` in one run."""
+        names = sorted(set(skills))
+        if not names:
+            return set()
+        placeholders = ", ".join("?" * len(names))
+        rows = self.db.execute(
+            "SELECT e.name, p.name FROM skill_confusions c "
+            "JOIN skills e ON e.skill_key = c.expected_key JOIN skills p ON p.skill_key = c.predicted_key "
+            f"WHERE c.run_id = ? AND (e.name IN ({placeholders}) OR p.name IN ({placeholders}))",
+            (run_id, *names, *names),
+        )
+        return {name for pair in rows for name in pair} - set(names)
+
+    def confusions(self, run_id: int) -> list[tuple[str, str, str, int]]:
+        """`(kind, expected, predicted, count)` cells of one run."""
+        rows = self.db.execute(
+            "SELECT c.kind, e.name, p.name, c.count FROM skill_confusions c "
+            "JOIN skills e ON e.skill_key = c.expected_key JOIN skills p ON p.skill_key = c.predicted_key "
+            "WHERE c.run_id = ?",
+            (run_id,),
+        )
+        return [(CONFUSION_KINDS[kind], expected, predicted, count) for kind, expected, predicted, count in rows]
+
+    def case_outcomes(self, run_id: int) -> list[tuple[str, str, str, str]]:
+        """`(case_id, skill, polarity, outcome)` for every case of one run."""
+        rows = self.db.execute(
+            "SELECT c.case_id, s.name, c.polarity, o.outcome FROM case_outcomes o "
+            "JOIN cases c ON c.case_key = o.case_key JOIN skills s ON s.skill_key = c.skill_key "
+            "WHERE o.run_id = ?",
+            (run_id,),
+        )
+        return [(case_id, skill, polarity, OUTCOMES[outcome]) for case_id, skill, polarity, outcome in rows]
+
+    def skill_series(self, skill: str, first_run: int, last_run: int) -> list[dict]:
+        """One skill's metrics for runs `first_run..last_run`, oldest first."""
+        rows = self.db.execute(
+            f"SELECT m.run_id, {', '.join(f'm.{m}' for m in SKILL_METRICS)} "
+            "FROM skill_metrics m JOIN skills s ON s.skill_key = m.skill_key "
+            "WHERE s.name = ? AND m.run_id BETWEEN ? AND ? ORDER BY m.run_id",
+            (skill, first_run, last_run),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def skill_metrics(self, run_id: int) -> dict[str, dict]:
+        """`{skill: metrics}` for one run."""
+        rows = self.db.execute(
+            f"SELECT s.name AS skill, {', '.join(f'm.{m}' for m in SKILL_METRICS)} "
+            "FROM skill_metrics m JOIN skills s ON s.skill_key = m.skill_key WHERE m.run_id = ?",
+            (run_id,),
+        ).fetchall()
+        return {row["skill"]: dict(row) for row in rows}
+
+    def regressions(self, base_run: int, run_id: int, limit: int | None = None) -> tuple[list[dict], int, int]:
+        """
+        Cases that passed (HIT / REJECT) in `base_run` and fail (MISS /
+        FALSE_TRIGGER) in `run_id`, by skill then id; plus the total number of
+        such regressions and of fixes (the reverse). Cases absent from either
+        run are not compared.
+        """
+        pair = (
+            "FROM case_outcomes b JOIN case_outcomes a ON a.run_id = ? AND a.case_key = b.case_key "
+            "WHERE b.run_id = ?"
+        )
+        regressed, fixed = self.db.execute(
+            f"SELECT COALESCE(SUM(b.outcome IN {BAD_OUTCOMES} AND a.outcome IN {GOOD_OUTCOMES}), 0), "
+            f"COALESCE(SUM(b.outcome IN {GOOD_OUTCOMES} AND a.outcome IN {BAD_OUTCOMES}), 0) {pair}",
+            (base_run, run_id),
+        ).fetchone()
+        rows = self.db.execute(
+            "SELECT c.case_id AS id, s.name AS skill, c.polarity, a.outcome AS before, b.outcome AS after "
+            "FROM case_outcomes b "
+            "JOIN case_outcomes a ON a.run_id = ? AND a.case_key = b.case_key "
+            "JOIN cases c ON c.case_key = b.case_key "
+            "JOIN skills s ON s.skill_key = c.skill_key "
+            f"WHERE b.run_id = ? AND b.outcome IN {BAD_OUTCOMES} AND a.outcome IN {GOOD_OUTCOMES} "
+            "ORDER BY s.name, c.case_id LIMIT ?",
+            (base_run, run_id, limit if limit is not None else -1),
+        ).fetchall()
+        out = []
+        for row in rows:
+            item = dict(row)
+            item["before"] = OUTCOMES[item["before"]]
+            item["after"] = OUTCOMES[item["after"]]
+            out.append(item)
+        return out, regressed, fixed
@@ -0,0 +1,181 @@
+"""
+Score-threshold sweep for scored trigger predictions.
+
+A scored prediction row maps skills to confidences (`{"skill": 0.83, ...}`);
+at threshold `t` the predicted set is every skill scoring `>= t`. Each case
+contributes one event per scored skill (a true trigger for its own skill on
+a positive case, a false trigger otherwise) and, for negative cases, one
+event at its highest score (the case triggers something from there down).
+Sorting all events once by descending score and accumulating them gives the
+metrics at every distinct threshold in a single pass, overall and per skill:
+
+- recall: positive cases whose own skill triggers / positive cases
+- precision: true triggers / all triggers
+- false-trigger rate: negative cases triggering any skill / negative cases
+- F1 of precision and recall
+"""
+
+from __future__ import annotations
+
+from array import array
+
+from trigger_confusion import SkillIds
+
+
+TRUE, FALSE, NEGATIVE = 0, 1, 2
+KIND_BITS = 2
+
+CURVE_FIELDS = ["threshold", "triggers", "true_triggers", "precision", "recall", "false_trigger_rate", "f1"]
+SKILL_THRESHOLD_FIELDS = [
+    "skill",
+    "positive_total",
+    "negative_total",
+    "best_threshold",
+    "precision",
+    "recall",
+    "false_trigger_rate",
+    "f1",
+    "f1_at_threshold",
+]
+
+
+def _metrics(true: int, false: int, negative: int, positive_total: int, negative_total: int) -> dict[str, float]:
+    precision = true / (true + false) if true + false else 0.0
+    recall = true / positive_total if positive_total else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "precision": precision,
+        "recall": recall,
+        "false_trigger_rate": negative / negative_total if negative_total else 0.0,
+        "f1": f1,
+    }
+
+
+class ThresholdSweep:
+    """Collect per-case skill scores; `sweep()` turns them into curves and best thresholds."""
+
+    def __init__(self) -> None:
+        self.skills = SkillIds()
+        self._scores = array("d")
+        self._codes = array("q")
+        self.positive_total: list[int] = []
+        self.negative_total: list[int] = []
+
+    def _skill(self, name: str) -> int:
+        skill_id = self.skills.ids.get(name)
+        if skill_id is None:
+            skill_id = self.skills.id(name)
+            self.positive_total.append(0)
+            self.negative_total.append(0)
+        return skill_id
+
+    def add(self, expected: str, polarity: str, scores: dict[str, float]) -> None:
+        """Record one case of skill `expected`; `scores` is empty for an unpredicted case."""
+        expected_id = self._skill(expected)
+        append_score = self._scores.append
+        append_code = self._codes.append
+        positive = polarity == "positive"
+        if positive:
+            self.positive_total[expected_id] += 1
+        else:
+            self.negative_total[expected_id] += 1
+        for name, score in scores.items():
+            skill_id = self._skill(name)
+            kind = TRUE if positive and skill_id == expected_id else FALSE
+            append_score(score)
+            append_code(skill_id << KIND_BITS | kind)
+        if not positive and scores:
+            append_score(max(scores.values()))
+            append_code(expected_id << KIND_BITS | NEGATIVE)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def sweep(self, operating: float) -> tuple[list[dict[str, str | int]], list[dict[str, str | int]]]:
+        """
+        Return the overall curve (one row per distinct threshold, descending)
+        and one row per skill with its F1-optimal threshold. `operating` is the
+        threshold in use, reported per skill as `f1_at_threshold`.
+
+        Ties on F1 keep the higher threshold (fewer triggers for the same F1);
+        skills no threshold gives a true trigger have an empty `best_threshold`.
+        """
+        scores = self._scores
+        codes = self._codes
+        n_skills = len(self.skills)
+        pos_total = self.positive_total
+        neg_total = self.negative_total
+        all_pos = sum(pos_total)
+        all_neg = sum(neg_total)
+        counts = [[0, 0, 0] for _ in range(n_skills)]
+        overall = [0, 0, 0]
+        best: list[tuple[float, float, dict[str, float]] | None] = [None] * n_skills
+        at_operating: list[float] | None = None
+        curve: list[dict[str, str | int]] = []
+
+        def snapshot_operating() -> list[float]:
+            return [
+                _metrics(c[TRUE], c[FALSE], c[NEGATIVE], pos_total[i], neg_total[i])["f1"]
+                for i, c in enumerate(counts)
+            ]
+
+        order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        i = 0
+        while i < len(order):
+            threshold = scores[order[i]]
+            if at_operating is None and threshold < operating:
+                at_operating = snapshot_operating()
+            touched = set()
+            while i < len(order) and scores[order[i]] == threshold:
+                code = codes[order[i]]
+                skill_id, kind = code >> KIND_BITS, code & ((1 << KIND_BITS) - 1)
+                counts[skill_id][kind] += 1
+                overall[kind] += 1
+                touched.add(skill_id)
+                i += 1
+            for skill_id in touched:
+                c = counts[skill_id]
+                m = _metrics(c[TRUE], c[FALSE], c[NEGATIVE], pos_total[skill_id], neg_total[skill_id])
+                current = best[skill_id]
+                if m["f1"] > (current[1] if current else 0.0):
+                    best[skill_id] = (threshold, m["f1"], m)
+            m = _metrics(overall[TRUE], overall[FALSE], overall[NEGATIVE], all_pos, all_neg)
+            curve.append(
+                {
+                    "threshold": f"{threshold:.6g}",
+                    "triggers": overall[TRUE] + overall[FALSE],
+                    "true_triggers": overall[TRUE],
+                    **{key: f"{value:.6f}" for key, value in m.items()},
+                }
+            )
+        if at_operating is None:
+            at_operating = snapshot_operating()
+
+        skill_rows: list[dict[str, str | int]] = []
+        names = self.skills.names
+        for skill_id in sorted(range(n_skills), key=names.__getitem__):
+            if not pos_total[skill_id] and not neg_total[skill_id]:
+                continue  # only ever seen as a predicted skill
+            row: dict[str, str | int] = {
+                "skill": names[skill_id],
+                "positive_total": pos_total[skill_id],
+                "negative_total": neg_total[skill_id],
+                "f1_at_threshold": f"{at_operating[skill_id]:.6f}",
+            }
+            chosen = best[skill_id]
+            if chosen is None:
+                row.update({"best_threshold": "", "precision": "", "recall": "", "false_trigger_rate": "", "f1": ""})
+            else:
+                row["best_threshold"] = f"{chosen[0]:.6g}"
+                row.update({key: f"{value:.6f}" for key, value in chosen[2].items()})
+            skill_rows.append(row)
+        return curve, skill_rows
+
+
+def best_curve_row(curve: list[dict[str, str | int]]) -> dict[str, str | int] | None:
+    """The highest-F1 curve row (the highest threshold among ties)."""
+    best = None
+    for row in curve:
+        if best is None or float(row["f1"]) > float(best["f1"]):
+            best = row
+    return best